@@ -7,6 +7,7 @@ class AdvancedEnemySystem {
             splitter: {
                 name: '分裂虫',
                 sprite: 'enemy_splitter.png',
+                palette: 'fire',
                 health: 25,
                 speed: 2,
                 damage: 15,
@@ -23,6 +24,7 @@ class AdvancedEnemySystem {
             shielded: {
                 name: '护盾兵',
                 sprite: 'enemy_shielded.png',
+                palette: 'ice',
                 health: 40,
                 speed: 1.5,
                 damage: 20,
@@ -58,6 +60,7 @@ class AdvancedEnemySystem {
             swarm: {
                 name: '蜂群无人机',
                 sprite: 'enemy_swarm.png',
+                palette: 'toxic',
                 health: 8,
                 speed: 4,
                 damage: 8,
@@ -74,6 +77,7 @@ class AdvancedEnemySystem {
             regenerator: {
                 name: '再生体',
                 sprite: 'enemy_basic.png',
+                palette: 'cosmic',
                 health: 35,
                 speed: 1.8,
                 damage: 18,
@@ -90,6 +94,7 @@ class AdvancedEnemySystem {
             kamikaze: {
                 name: '自爆虫',
                 sprite: 'enemy_basic.png',
+                palette: 'fire',
                 health: 12,
                 speed: 5,
                 damage: 35,
@@ -106,6 +111,7 @@ class AdvancedEnemySystem {
             phase: {
                 name: '相位舰',
                 sprite: 'enemy_basic.png',
+                palette: 'neon',
                 health: 28,
                 speed: 2.2,
                 damage: 16,
@@ -122,6 +128,7 @@ class AdvancedEnemySystem {
             hunter: {
                 name: '追猎者',
                 sprite: 'enemy_basic.png',
+                palette: 'dark',
                 health: 22,
                 speed: 2.8,
                 damage: 14,
@@ -163,6 +170,19 @@ class AdvancedEnemySystem {
         // 敌人群组管理
         this.enemyGroups = new Map();
         this.nextGroupId = 1;
+        
+        // 预加载敌人精灵
+        this.loadSprites();
+    }
+    
+    // 加载敌人精灵（从精灵图集绘制）和各类型的换色皮肤
+    loadSprites() {
+        Object.values(this.advancedEnemyTypes).forEach(config => {
+            spriteAtlas.load(config.sprite);
+            if (config.palette) {
+                spriteAtlas.loadPalette(config.sprite, config.palette);
+            }
+        });
     }
     
     // 创建高级敌人
@@ -197,6 +217,7 @@ class AdvancedEnemySystem {
             color: config.color,
             glowColor: config.glowColor,
             sprite: config.sprite,
+            paletteSprite: spriteAtlas.paletteName(config.sprite, config.palette),
             
             // 状态
             active: true,
@@ -1035,10 +1056,9 @@ class AdvancedEnemySystem {
         ctx.rotate(enemy.rotation);
         ctx.scale(enemy.scale, enemy.scale);
         
-        // 发光效果
+        // 发光效果：着色光晕垫在主体下方
         if (enemy.glowColor) {
-            ctx.shadowColor = enemy.glowColor;
-            ctx.shadowBlur = enemy.size * 0.3;
+            glowSprites.draw(ctx, 'tight', enemy.glowColor, 0, 0, enemy.size / 2);
         }
         
         // 渲染敌人主体
@@ -1060,15 +1080,21 @@ class AdvancedEnemySystem {
     
     // 渲染敌人主体
     renderEnemyBody(ctx, enemy) {
-        // 基本形状渲染
+        // 换色皮肤或原精灵，均未加载时渲染基本形状
+        const half = enemy.size / 2;
+        const drawn = [enemy.paletteSprite, enemy.sprite].some(
+            spriteName => spriteName && spriteAtlas.draw(ctx, spriteName, -half, -half, enemy.size, enemy.size));
+        
         ctx.fillStyle = enemy.color;
         ctx.strokeStyle = enemy.glowColor || '#ffffff';
         ctx.lineWidth = 2;
         
-        ctx.beginPath();
-        ctx.arc(0, 0, enemy.size / 2, 0, Math.PI * 2);
-        ctx.fill();
-        ctx.stroke();
+        if (!drawn) {
+            ctx.beginPath();
+            ctx.arc(0, 0, half, 0, Math.PI * 2);
+            ctx.fill();
+            ctx.stroke();
+        }
         
         // 类型特定装饰
         switch (enemy.type) {
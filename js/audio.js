@@ -19,7 +19,7 @@ class AudioManager {
         this.generatedSounds = {};
         
         this.initAudioContext();
-        this.generateSoundEffects();
+        this.loadSoundEffects();
     }
     
     async initAudioContext() {
@@ -48,6 +48,32 @@ class AudioManager {
         }
     }
     
+    // 加载预合成音效（scripts/generate_audio.py 生成），只解码一次；不可用时退回实时合成
+    async loadSoundEffects() {
+        if (!this.audioContext) return;
+        
+        try {
+            const response = await fetch(assetUrl('assets/sounds/sounds.json'));
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            
+            const manifest = await response.json();
+            const entries = Object.entries(manifest.sounds).filter(([, entry]) => entry.kind === 'sfx');
+            const buffers = await Promise.all(entries.map(async ([, entry]) => {
+                const data = await fetch(assetUrl(`assets/sounds/${entry.file}`)).then(r => r.arrayBuffer());
+                return this.audioContext.decodeAudioData(data);
+            }));
+            
+            entries.forEach(([name], index) => {
+                this.generatedSounds[name] = buffers[index];
+            });
+        } catch (error) {
+            console.warn('预合成音效不可用，改为实时合成:', error);
+            this.generateSoundEffects();
+        }
+    }
+    
     // 生成各种音效
     generateSoundEffects() {
         if (!this.audioContext) return;
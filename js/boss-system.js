@@ -1434,9 +1434,8 @@ class EpicBossSystem {
         ctx.scale(boss.scale, boss.scale);
         ctx.globalAlpha = boss.alpha;
         
-        // 发光效果
-        ctx.shadowColor = boss.glowColor;
-        ctx.shadowBlur = boss.size * 0.5;
+        // 发光效果（shadowBlur = size * 0.5，即圆半径）
+        glowSprites.draw(ctx, 'tight', boss.glowColor, 0, 0, boss.size / 2);
         
         // 主体
         ctx.fillStyle = boss.color;
@@ -1496,9 +1495,8 @@ class EpicBossSystem {
             
             ctx.save();
             
-            // 弱点发光
-            ctx.shadowColor = '#ff0000';
-            ctx.shadowBlur = weakPoint.size;
+            // 弱点发光（shadowBlur = size，即 2 倍圆半径）
+            glowSprites.draw(ctx, 'wide', '#ff0000', worldX, worldY, weakPoint.size / 2);
             
             // 弱点主体
             ctx.fillStyle = weakPoint.vulnerable ? '#ff4444' : '#666666';
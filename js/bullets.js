@@ -102,9 +102,12 @@ class BulletManager {
             }
         };
         
-        // 预加载子弹精灵
-        this.sprites = {};
+        // 预加载子弹精灵（从精灵图集绘制）及其预烘焙的发光精灵
+        this.spriteNames = ['bullet_player.png', 'bullet_enemy.png', 'laser_beam.png'];
+        this.glowSprites = {};
+        this.rotationSheets = {};
         this.loadSprites();
+        this.loadRotationSheets();
         
         // 子弹池，用于性能优化
         this.bulletPool = [];
@@ -113,15 +116,33 @@ class BulletManager {
     
     // 加载子弹精灵
     loadSprites() {
-        const spriteNames = ['bullet_player.png', 'bullet_enemy.png', 'laser_beam.png'];
-        
-        spriteNames.forEach(spriteName => {
-            const img = new Image();
-            img.src = `assets/images/${spriteName}`;
-            this.sprites[spriteName] = img;
+        this.spriteNames.forEach(spriteName => {
+            spriteAtlas.load(spriteName);
+            
+            // 发光精灵（generate_assets.py 生成的 *_glow.png）已合成精灵本身，直接代替精灵绘制
+            const glow = new Image();
+            glow.src = assetUrl(`assets/images/${spriteName.replace(/\.png$/, '_glow.png')}`);
+            this.glowSprites[spriteName] = glow;
         });
     }
     
+    // 加载预旋转帧表（generate_assets.py 生成的 rotations.json），按角度取帧绘制，无需逐个 ctx.rotate
+    loadRotationSheets() {
+        fetch(assetUrl('assets/images/rotations.json'))
+            .then(response => response.ok ? response.json() : {})
+            .then(index => {
+                this.spriteNames.forEach(spriteName => {
+                    const info = index[spriteName];
+                    if (!info) return;
+                    
+                    const img = new Image();
+                    img.src = assetUrl(`assets/images/${info.sheet}`);
+                    this.rotationSheets[spriteName] = { image: img, frames: info.frames, columns: info.columns };
+                });
+            })
+            .catch(() => {});
+    }
+    
     // 初始化子弹对象池
     initializeBulletPool() {
         for (let i = 0; i < this.maxBullets; i++) {
@@ -200,7 +221,7 @@ class BulletManager {
         bullet.damage = config.damage;
         bullet.size = config.size;
         bullet.color = config.color;
-        bullet.sprite = this.sprites[config.sprite];
+        bullet.spriteName = config.sprite;
         bullet.active = true;
         bullet.life = bullet.maxLife;
         bullet.owner = owner;
@@ -213,6 +234,9 @@ class BulletManager {
         bullet.rotation = angle;
         bullet.width = config.size;
         bullet.height = config.size;
+        // 精灵绘制尺寸（2:1，与预旋转帧表的宽高比一致），碰撞检测据此把位置换算到掩码像素
+        bullet.drawWidth = config.size * 2;
+        bullet.drawHeight = config.size;
         
         // 设置碰撞层级
         if (bulletType.startsWith('player')) {
@@ -474,26 +498,32 @@ class BulletManager {
     
     // 渲染单个子弹
     renderBullet(ctx, bullet) {
-        ctx.save();
-        
         // 设置透明度（根据生命值）
         const alpha = Math.min(1, bullet.life / 1000);
+        
+        if (this.renderRotatedFrame(ctx, bullet, alpha)) return;
+        
+        ctx.save();
         ctx.globalAlpha = alpha;
         
         // 移动到子弹位置
         ctx.translate(bullet.x, bullet.y);
         ctx.rotate(bullet.rotation);
         
-        // 如果有精灵图，使用精灵图渲染
-        if (bullet.sprite && bullet.sprite.complete) {
-            const width = bullet.size * 2;
-            const height = bullet.size;
-            ctx.drawImage(bullet.sprite, -width / 2, -height / 2, width, height);
+        // 如果有精灵图，使用精灵图渲染；发光精灵已加载时绘制发光精灵（四周留白相同，按精灵的缩放比例居中）
+        const glow = this.glowSprites[bullet.spriteName];
+        const spriteSize = bullet.spriteName && spriteAtlas.size(bullet.spriteName);
+        if (spriteSize && glow && glow.complete && glow.naturalWidth > 0) {
+            const glowWidth = glow.naturalWidth * bullet.drawWidth / spriteSize.width;
+            const glowHeight = glow.naturalHeight * bullet.drawHeight / spriteSize.height;
+            ctx.drawImage(glow, -glowWidth / 2, -glowHeight / 2, glowWidth, glowHeight);
+        } else if (spriteSize) {
+            spriteAtlas.draw(ctx, bullet.spriteName, -bullet.drawWidth / 2, -bullet.drawHeight / 2,
+                             bullet.drawWidth, bullet.drawHeight);
         } else {
-            // 否则使用基本形状渲染
+            // 否则使用基本形状渲染，发光用着色光晕（shadowBlur = size，即短半轴的 2 倍）
+            glowSprites.draw(ctx, 'wide', bullet.color, 0, 0, bullet.size / 2);
             ctx.fillStyle = bullet.color;
-            ctx.shadowColor = bullet.color;
-            ctx.shadowBlur = bullet.size;
             
             ctx.beginPath();
             ctx.ellipse(0, 0, bullet.size, bullet.size / 2, 0, 0, Math.PI * 2);
@@ -503,6 +533,32 @@ class BulletManager {
         ctx.restore();
     }
     
+    // 用预旋转帧表绘制子弹，帧表未加载时返回 false
+    renderRotatedFrame(ctx, bullet, alpha) {
+        const sheet = this.rotationSheets[bullet.spriteName];
+        const spriteSize = spriteAtlas.size(bullet.spriteName);
+        if (!sheet || !sheet.image.complete || sheet.image.naturalWidth === 0 || !spriteSize) {
+            return false;
+        }
+        
+        const { image, frames, columns } = sheet;
+        const turn = bullet.rotation / (Math.PI * 2);
+        const frame = ((Math.round(turn * frames) % frames) + frames) % frames;
+        const cell = image.naturalWidth / columns;
+        
+        // 精灵高度对应 bullet.size，格子按同一比例缩放
+        const size = cell * bullet.size / spriteSize.height;
+        
+        const previousAlpha = ctx.globalAlpha;
+        ctx.globalAlpha = alpha;
+        // 发光近似为圆形光晕，与方向无关，不必随帧旋转
+        glowSprites.draw(ctx, 'wide', bullet.color, bullet.x, bullet.y, bullet.size / 2);
+        ctx.drawImage(image, (frame % columns) * cell, Math.floor(frame / columns) * cell, cell, cell,
+                      bullet.x - size / 2, bullet.y - size / 2, size, size);
+        ctx.globalAlpha = previousAlpha;
+        return true;
+    }
+    
     // 获取指定层级的子弹
     getBulletsByLayer(layer) {
         return this.bullets.filter(bullet => bullet.active && bullet.layer === layer);
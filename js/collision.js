@@ -22,6 +22,42 @@ class CollisionManager {
             totalObjects: 0,
             collisionsDetected: 0
         };
+        
+        // 生成器导出的精灵碰撞形状（collision.json），按精灵文件名索引
+        this.spriteShapes = {};
+        this.loadSpriteShapes();
+    }
+    
+    // 加载精灵碰撞形状：子圆用于粗测，1位掩码用于精测
+    loadSpriteShapes() {
+        fetch(assetUrl('assets/images/collision.json'))
+            .then(response => response.ok ? response.json() : { sprites: {} })
+            .then(data => {
+                Object.entries(data.sprites || {}).forEach(([name, shape]) => {
+                    const bytes = atob(shape.mask);
+                    const mask = new Uint8Array(bytes.length);
+                    for (let i = 0; i < bytes.length; i++) {
+                        mask[i] = bytes.charCodeAt(i);
+                    }
+                    
+                    this.spriteShapes[name] = {
+                        width: shape.width,
+                        height: shape.height,
+                        hull: shape.hull,
+                        circles: shape.circles,
+                        stride: Math.ceil(shape.width / 8),
+                        mask: mask
+                    };
+                });
+            })
+            .catch(() => {});
+    }
+    
+    // 获取对象精灵的碰撞形状
+    // 流星等变体池危险物绘制的是随机变体，轮廓与单一精灵的掩码不同，仍使用圆形检测
+    getSpriteShape(object) {
+        if (!object.spriteName || object.poolName) return undefined;
+        return this.spriteShapes[object.spriteName];
     }
     
     // 重置空间网格
@@ -154,6 +190,17 @@ class CollisionManager {
         
         this.stats.checksPerFrame++;
         
+        // 有精灵碰撞形状时按精灵轮廓检测
+        const shape1 = this.getSpriteShape(obj1);
+        const shape2 = this.getSpriteShape(obj2);
+        if (shape1 && shape2) {
+            return this.checkShapePairCollision(obj1, shape1, obj2, shape2);
+        } else if (shape1) {
+            return this.checkSpriteShapeCollision(obj1, shape1, obj2);
+        } else if (shape2) {
+            return this.checkSpriteShapeCollision(obj2, shape2, obj1);
+        }
+        
         // 首先进行快速边界框检测
         if (!this.checkRectangleCollision(obj1, obj2)) {
             return false;
@@ -174,6 +221,152 @@ class CollisionManager {
         }
     }
     
+    // 精灵的绘制变换：精灵按 drawWidth × drawHeight 绘制（子弹为 2:1），未指定时为 size × size；
+    // x、y 分别换算到掩码像素
+    getSpriteFrame(spriteObj, shape) {
+        const rotation = spriteObj.rotation || 0;
+        const scale = spriteObj.scale || 1;
+        return {
+            x: spriteObj.x,
+            y: spriteObj.y,
+            cos: Math.cos(rotation),
+            sin: Math.sin(rotation),
+            pixelsPerUnitX: shape.width / ((spriteObj.drawWidth || spriteObj.size) * scale),
+            pixelsPerUnitY: shape.height / ((spriteObj.drawHeight || spriteObj.size) * scale)
+        };
+    }
+    
+    // 世界坐标 → 精灵局部掩码像素坐标（相对精灵中心）
+    worldToSprite(frame, x, y) {
+        const dx = x - frame.x;
+        const dy = y - frame.y;
+        return [
+            (dx * frame.cos + dy * frame.sin) * frame.pixelsPerUnitX,
+            (-dx * frame.sin + dy * frame.cos) * frame.pixelsPerUnitY
+        ];
+    }
+    
+    // 精灵局部掩码像素坐标 → 世界坐标
+    spriteToWorld(frame, localX, localY) {
+        const ux = localX / frame.pixelsPerUnitX;
+        const uy = localY / frame.pixelsPerUnitY;
+        return [
+            frame.x + ux * frame.cos - uy * frame.sin,
+            frame.y + ux * frame.sin + uy * frame.cos
+        ];
+    }
+    
+    // 掩码在局部像素坐标处是否为实心
+    isMaskSolid(shape, localX, localY) {
+        const x = Math.floor(localX + shape.width / 2);
+        const y = Math.floor(localY + shape.height / 2);
+        if (x < 0 || y < 0 || x >= shape.width || y >= shape.height) return false;
+        return (shape.mask[y * shape.stride + (x >> 3)] & (0x80 >> (x & 7))) !== 0;
+    }
+    
+    // 子圆转换到世界坐标；非等比绘制时取较长半轴，保守
+    getWorldCircles(frame, shape) {
+        const unitsPerPixel = 1 / Math.min(frame.pixelsPerUnitX, frame.pixelsPerUnitY);
+        return shape.circles.map(([cx, cy, cr]) => {
+            const [wx, wy] = this.spriteToWorld(frame, cx, cy);
+            return [wx, wy, cr * unitsPerPixel];
+        });
+    }
+    
+    // 两个精灵之间的碰撞检测：子圆两两粗测，再在重叠区域内比较两张位掩码
+    checkShapePairCollision(objA, shapeA, objB, shapeB) {
+        let frameA = this.getSpriteFrame(objA, shapeA);
+        let frameB = this.getSpriteFrame(objB, shapeB);
+        
+        // 粗测：任意一对子圆相交
+        const circlesB = this.getWorldCircles(frameB, shapeB);
+        const near = this.getWorldCircles(frameA, shapeA).some(([ax, ay, ar]) =>
+            circlesB.some(([bx, by, br]) => {
+                const dx = ax - bx;
+                const dy = ay - by;
+                return dx * dx + dy * dy < (ar + br) * (ar + br);
+            })
+        );
+        if (!near) return false;
+        
+        // 精测遍历世界尺寸较小的精灵（通常是子弹）的像素，映射到另一张掩码上
+        if (shapeA.width / frameA.pixelsPerUnitX * shapeA.height / frameA.pixelsPerUnitY >
+            shapeB.width / frameB.pixelsPerUnitX * shapeB.height / frameB.pixelsPerUnitY) {
+            [shapeA, shapeB] = [shapeB, shapeA];
+            [frameA, frameB] = [frameB, frameA];
+        }
+        
+        // 重叠区域：B 的外接圆在 A 掩码像素坐标中的外接矩形，与 A 的掩码范围求交
+        const halfWidthB = shapeB.width / frameB.pixelsPerUnitX / 2;
+        const halfHeightB = shapeB.height / frameB.pixelsPerUnitY / 2;
+        const reachB = Math.sqrt(halfWidthB * halfWidthB + halfHeightB * halfHeightB);
+        const [centerX, centerY] = this.worldToSprite(frameA, frameB.x, frameB.y);
+        const px = centerX + shapeA.width / 2;
+        const py = centerY + shapeA.height / 2;
+        const x0 = Math.max(0, Math.floor(px - reachB * frameA.pixelsPerUnitX));
+        const x1 = Math.min(shapeA.width - 1, Math.floor(px + reachB * frameA.pixelsPerUnitX));
+        const y0 = Math.max(0, Math.floor(py - reachB * frameA.pixelsPerUnitY));
+        const y1 = Math.min(shapeA.height - 1, Math.floor(py + reachB * frameA.pixelsPerUnitY));
+        
+        for (let y = y0; y <= y1; y++) {
+            const row = y * shapeA.stride;
+            for (let x = x0; x <= x1; x++) {
+                if (!(shapeA.mask[row + (x >> 3)] & (0x80 >> (x & 7)))) continue;
+                // A 的实心像素中心映射到 B 的掩码
+                const [wx, wy] = this.spriteToWorld(frameA, x + 0.5 - shapeA.width / 2, y + 0.5 - shapeA.height / 2);
+                const [bx, by] = this.worldToSprite(frameB, wx, wy);
+                if (this.isMaskSolid(shapeB, bx, by)) {
+                    return true;
+                }
+            }
+        }
+        return false;
+    }
+    
+    // 精灵与圆形的碰撞检测：子圆粗测，位掩码精测
+    checkSpriteShapeCollision(spriteObj, shape, circleObj) {
+        const radius = circleObj.radius || circleObj.width / 2 || 10;
+        
+        // 把圆心转换到精灵局部像素坐标（相对精灵中心、未旋转）
+        const frame = this.getSpriteFrame(spriteObj, shape);
+        const [localX, localY] = this.worldToSprite(frame, circleObj.x, circleObj.y);
+        // 圆在掩码像素坐标中为椭圆
+        const radiusX = radius * frame.pixelsPerUnitX;
+        const radiusY = radius * frame.pixelsPerUnitY;
+        const localRadius = Math.max(radiusX, radiusY);
+        
+        // 粗测：子圆完整覆盖精灵的实心像素（椭圆取较长半轴，保守）
+        const nearCircle = shape.circles.some(([cx, cy, cr]) => {
+            const ox = localX - cx;
+            const oy = localY - cy;
+            return ox * ox + oy * oy < (cr + localRadius) * (cr + localRadius);
+        });
+        if (!nearCircle) return false;
+        
+        // 精测：椭圆覆盖的像素中是否有实心像素
+        const px = localX + shape.width / 2;
+        const py = localY + shape.height / 2;
+        const reachX = radiusX + 0.5;
+        const reachY = radiusY + 0.5;
+        const x0 = Math.max(0, Math.floor(px - reachX));
+        const x1 = Math.min(shape.width - 1, Math.floor(px + reachX));
+        const y0 = Math.max(0, Math.floor(py - reachY));
+        const y1 = Math.min(shape.height - 1, Math.floor(py + reachY));
+        
+        for (let y = y0; y <= y1; y++) {
+            const row = y * shape.stride;
+            const oy = (y + 0.5 - py) / reachY;
+            for (let x = x0; x <= x1; x++) {
+                if (!(shape.mask[row + (x >> 3)] & (0x80 >> (x & 7)))) continue;
+                const ox = (x + 0.5 - px) / reachX;
+                if (ox * ox + oy * oy <= 1) {
+                    return true;
+                }
+            }
+        }
+        return false;
+    }
+    
     // 检测点是否在对象内
     checkPointInObject(x, y, object) {
         const bounds = this.getObjectBounds(object);
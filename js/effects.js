@@ -27,20 +27,46 @@ class EffectsManager {
             decay: 0.9
         };
         
-        // 背景效果
+        // 背景效果：视差图层加载前使用程序生成的星星
         this.backgroundStars = [];
         this.initBackgroundStars();
+        
+        // 视差星空图层（generate_assets.py 生成的 parallax.json），由远及近叠加、按各自速度向下滚动
+        this.parallaxLayers = [];
+        this.parallaxScroll = 0;
+        this.parallaxSpeed = 0.06; // 速度为 1 的图层每毫秒滚动的像素
+        this.loadParallaxLayers();
     }
     
-    // 加载爆炸动画帧
+    // 加载爆炸动画帧（从精灵图集绘制）
     loadExplosionFrames() {
         for (let i = 0; i < 8; i++) {
-            const img = new Image();
-            img.src = `assets/images/explosion_${i}.png`;
-            this.explosionFrames.push(img);
+            const filename = `explosion_${i}.png`;
+            spriteAtlas.load(filename);
+            this.explosionFrames.push(filename);
         }
     }
     
+    // 加载视差星空图层
+    loadParallaxLayers() {
+        fetch(assetUrl('assets/images/parallax.json'))
+            .then(response => response.ok ? response.json() : { layers: [] })
+            .then(data => {
+                this.parallaxLayers = data.layers.map(layer => {
+                    const img = new Image();
+                    img.src = assetUrl(`assets/images/${layer.image}`);
+                    return { ...layer, sprite: img };
+                });
+            })
+            .catch(() => {});
+    }
+    
+    // 视差图层是否全部加载完成
+    parallaxReady() {
+        return this.parallaxLayers.length > 0 &&
+               this.parallaxLayers.every(layer => layer.sprite.complete && layer.sprite.naturalWidth > 0);
+    }
+    
     // 初始化背景星星
     initBackgroundStars() {
         for (let i = 0; i < 50; i++) {
@@ -416,6 +442,8 @@ class EffectsManager {
     
     // 更新背景星星
     updateBackgroundStars(deltaTime) {
+        this.parallaxScroll += this.parallaxSpeed * deltaTime;
+        
         for (const star of this.backgroundStars) {
             star.y += star.speed * deltaTime;
             
@@ -444,8 +472,28 @@ class EffectsManager {
         ctx.restore();
     }
     
+    // 渲染视差图层：图层可无缝平铺，按滚动距离错开后铺满画布
+    renderParallaxLayers(ctx) {
+        const width = ctx.canvas.width;
+        const height = ctx.canvas.height;
+        
+        for (const layer of this.parallaxLayers) {
+            const offset = (this.parallaxScroll * layer.speed) % layer.height;
+            for (let y = offset - layer.height; y < height; y += layer.height) {
+                for (let x = 0; x < width; x += layer.width) {
+                    ctx.drawImage(layer.sprite, x, y, layer.width, layer.height);
+                }
+            }
+        }
+    }
+    
     // 渲染背景星星
     renderBackgroundStars(ctx) {
+        if (this.parallaxReady()) {
+            this.renderParallaxLayers(ctx);
+            return;
+        }
+        
         ctx.save();
         
         for (const star of this.backgroundStars) {
@@ -470,8 +518,7 @@ class EffectsManager {
             ctx.globalAlpha = alpha;
             
             if (particle.glow) {
-                ctx.shadowColor = particle.color;
-                ctx.shadowBlur = particle.size * 2;
+                glowSprites.draw(ctx, 'wide', particle.color, particle.x, particle.y, particle.size * alpha);
             }
             
             ctx.fillStyle = particle.color;
@@ -489,14 +536,15 @@ class EffectsManager {
     renderExplosions(ctx) {
         for (const explosion of this.explosions) {
             if (explosion.frame < this.explosionFrames.length) {
-                const img = this.explosionFrames[explosion.frame];
+                const filename = this.explosionFrames[explosion.frame];
+                const size = spriteAtlas.size(filename);
                 
-                if (img.complete) {
+                if (size) {
                     ctx.save();
                     ctx.translate(explosion.x, explosion.y);
                     ctx.rotate(explosion.rotation);
                     ctx.scale(explosion.size, explosion.size);
-                    ctx.drawImage(img, -img.width / 2, -img.height / 2);
+                    spriteAtlas.draw(ctx, filename, -size.width / 2, -size.height / 2, size.width, size.height);
                     ctx.restore();
                 }
             }
@@ -586,5 +634,66 @@ class EffectsManager {
     }
 }
 
-// 创建全局特效管理器实例
+// 通用发光光晕：generate_assets.py 烘焙的白色光晕（glow_halo_*.png）按颜色着色后缓存，
+// 垫在程序绘制的圆形下方，代替逐帧 shadowBlur
+class GlowSprites {
+    constructor() {
+        // 光晕图中圆盘的半径（1x 像素），与生成器的 HALO_RADIUS 一致
+        this.haloRadius = 16;
+        // tight: shadowBlur = 半径；wide: shadowBlur = 2 × 半径
+        this.halos = {};
+        ['tight', 'wide'].forEach(kind => {
+            const img = new Image();
+            img.src = assetUrl(`assets/images/glow_halo_${kind}.png`);
+            this.halos[kind] = img;
+        });
+        
+        // 着色后的光晕画布，键为 "类型|颜色"
+        this.tinted = new Map();
+        this.maxTinted = 256;
+    }
+    
+    // 颜色键：hsl()/rgb() 中的数值取整到 5（随机色相的粒子共用少量缓存），透明度保持不变
+    colorKey(color) {
+        if (color.startsWith('#')) return color;
+        return color.replace(/\d+(\.\d+)?/g, n => Number(n) < 1 ? n : Math.round(Number(n) / 5) * 5);
+    }
+    
+    // 按颜色着色的光晕画布，光晕未加载时返回 null
+    getTinted(kind, color) {
+        const halo = this.halos[kind];
+        if (!halo || !halo.complete || halo.naturalWidth === 0) return null;
+        
+        const tintColor = this.colorKey(color);
+        const key = `${kind}|${tintColor}`;
+        let canvas = this.tinted.get(key);
+        if (!canvas) {
+            if (this.tinted.size >= this.maxTinted) {
+                this.tinted.clear();
+            }
+            canvas = document.createElement('canvas');
+            canvas.width = halo.naturalWidth;
+            canvas.height = halo.naturalHeight;
+            const tintCtx = canvas.getContext('2d');
+            tintCtx.drawImage(halo, 0, 0);
+            tintCtx.globalCompositeOperation = 'source-in';
+            tintCtx.fillStyle = tintColor;
+            tintCtx.fillRect(0, 0, canvas.width, canvas.height);
+            this.tinted.set(key, canvas);
+        }
+        return canvas;
+    }
+    
+    // 在 (x, y) 绘制半径为 radius 的圆形的发光，光晕未加载时不绘制
+    draw(ctx, kind, color, x, y, radius) {
+        const canvas = this.getTinted(kind, color);
+        if (!canvas || radius <= 0) return;
+        
+        const size = canvas.width * radius / this.haloRadius;
+        ctx.drawImage(canvas, x - size / 2, y - size / 2, size, size);
+    }
+}
+
+// 创建全局发光光晕与特效管理器实例
+const glowSprites = new GlowSprites();
 const effectsManager = new EffectsManager();
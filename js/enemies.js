@@ -51,6 +51,7 @@ class EnemyManager {
                 speed: 2.5,
                 size: 22,
                 sprite: 'enemy_fast.png',
+                palette: 'fire',
                 color: '#ff8844',
                 score: 20,
                 fireRate: 2500,
@@ -64,6 +65,7 @@ class EnemyManager {
                 speed: 1.5,
                 size: 60,
                 sprite: 'enemy_heavy.png',
+                palette: 'cosmic',
                 color: '#8844ff',
                 score: 100,
                 fireRate: 1000,
@@ -94,7 +96,6 @@ class EnemyManager {
         ];
         
         // 预加载敌人精灵
-        this.sprites = {};
         this.loadSprites();
         
         // 敌人AI状态
@@ -104,14 +105,15 @@ class EnemyManager {
         this.formations = [];
     }
     
-    // 加载敌人精灵
+    // 加载敌人精灵（从精灵图集绘制）和各类型的换色皮肤
     loadSprites() {
         const spriteNames = ['enemy_basic.png', 'enemy_fast.png', 'enemy_heavy.png'];
         
-        spriteNames.forEach(spriteName => {
-            const img = new Image();
-            img.src = `assets/images/${spriteName}`;
-            this.sprites[spriteName] = img;
+        spriteNames.forEach(spriteName => spriteAtlas.load(spriteName));
+        Object.values(this.enemyTypes).forEach(config => {
+            if (config.palette) {
+                spriteAtlas.loadPalette(config.sprite, config.palette);
+            }
         });
     }
     
@@ -134,7 +136,8 @@ class EnemyManager {
             maxHealth: enemyConfig.health,
             speed: enemyConfig.speed,
             size: enemyConfig.size,
-            sprite: this.sprites[enemyConfig.sprite],
+            spriteName: enemyConfig.sprite,
+            paletteSpriteName: spriteAtlas.paletteName(enemyConfig.sprite, enemyConfig.palette),
             color: enemyConfig.color,
             score: enemyConfig.score,
             damage: enemyConfig.damage,
@@ -774,10 +777,8 @@ class EnemyManager {
         ctx.rotate(enemy.rotation);
         ctx.scale(enemy.scale, enemy.scale);
         
-        // 渲染精灵或基本形状
-        if (enemy.sprite && enemy.sprite.complete) {
-            ctx.drawImage(enemy.sprite, -enemy.size / 2, -enemy.size / 2, enemy.size, enemy.size);
-        } else {
+        // 渲染换色皮肤、原精灵或基本形状
+        if (!this.drawSprite(ctx, enemy, enemy.paletteSpriteName) && !this.drawSprite(ctx, enemy, enemy.spriteName)) {
             // 基本形状渲染
             ctx.fillStyle = enemy.color;
             ctx.strokeStyle = '#ffffff';
@@ -797,6 +798,12 @@ class EnemyManager {
         ctx.restore();
     }
     
+    // 以敌人尺寸绘制精灵，精灵未加载时返回 false
+    drawSprite(ctx, enemy, spriteName) {
+        return Boolean(spriteName) && spriteAtlas.draw(ctx, spriteName, -enemy.size / 2, -enemy.size / 2,
+                                                       enemy.size, enemy.size);
+    }
+    
     // 渲染血条
     renderHealthBar(ctx, enemy) {
         ctx.save();
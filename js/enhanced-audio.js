@@ -23,6 +23,7 @@ class EnhancedAudioManager {
         
         // 音频缓存
         this.soundBuffers = new Map();
+        this.bakedManifest = null;  // 预合成音频清单（Promise）
         this.musicBuffers = new Map();
         this.voiceBuffers = new Map();
         
@@ -284,12 +285,47 @@ class EnhancedAudioManager {
         await Promise.all(loadPromises);
     }
     
+    // 加载预合成音频清单（scripts/generate_audio.py 生成的 assets/sounds/sounds.json）
+    loadBakedManifest() {
+        if (!this.bakedManifest) {
+            this.bakedManifest = fetch(assetUrl('assets/sounds/sounds.json'))
+                .then(response => response.ok ? response.json() : { sounds: {} })
+                .catch(() => ({ sounds: {} }));
+        }
+        return this.bakedManifest;
+    }
+    
+    // 解码预合成音频，清单中没有时返回 null
+    async loadBakedBuffer(name) {
+        const manifest = await this.loadBakedManifest();
+        const entry = manifest.sounds[name];
+        if (!entry) return null;
+        
+        try {
+            const response = await fetch(assetUrl(`assets/sounds/${entry.file}`));
+            if (!response.ok) return null;
+            return await this.audioContext.decodeAudioData(await response.arrayBuffer());
+        } catch (error) {
+            console.warn(`加载预合成音频失败 ${name}:`, error);
+            return null;
+        }
+    }
+    
     // 加载音频文件
     async loadSound(soundName, soundPath = null) {
         if (this.soundBuffers.has(soundName)) {
             return this.soundBuffers.get(soundName);
         }
         
+        // 优先使用预合成音效，避免实时合成
+        if (!soundPath) {
+            const baked = await this.loadBakedBuffer(soundName);
+            if (baked) {
+                this.soundBuffers.set(soundName, baked);
+                return baked;
+            }
+        }
+        
         const path = soundPath || this.soundPaths[soundName];
         if (!path) {
             throw new Error(`未找到音效路径: ${soundName}`);
@@ -466,11 +502,15 @@ class EnhancedAudioManager {
             // 加载音乐
             let buffer = this.musicBuffers.get(musicName);
             if (!buffer) {
+                // 优先使用预合成的可循环主题（如 Boss 主题）
+                buffer = await this.loadBakedBuffer(musicName);
                 const path = this.musicPaths[musicName];
-                if (path) {
+                if (!buffer && path) {
                     const response = await fetch(path);
                     const arrayBuffer = await response.arrayBuffer();
                     buffer = await this.audioContext.decodeAudioData(arrayBuffer);
+                }
+                if (buffer) {
                     this.musicBuffers.set(musicName, buffer);
                 }
             }
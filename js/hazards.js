@@ -7,6 +7,7 @@ class EnvironmentalHazardSystem {
             meteor: {
                 name: '流星',
                 sprite: 'hazard_meteor.png',
+                pool: 'meteor',
                 damage: 15,
                 health: 30,
                 speed: 3,
@@ -34,6 +35,7 @@ class EnvironmentalHazardSystem {
             energyfield: {
                 name: '能量场',
                 sprite: 'hazard_energyfield.png',
+                arcPool: 'lightning',
                 damage: 8,
                 health: 50,
                 speed: 2,
@@ -47,6 +49,7 @@ class EnvironmentalHazardSystem {
             asteroid: {
                 name: '小行星',
                 sprite: 'hazard_meteor.png',
+                pool: 'meteor',
                 damage: 25,
                 health: 80,
                 speed: 1.5,
@@ -108,8 +111,10 @@ class EnvironmentalHazardSystem {
         this.hazardParticles = [];
         
         // 预加载精灵
-        this.sprites = {};
+        this.glowSprites = {};
+        this.variantPools = {};
         this.loadSprites();
+        this.loadVariantPools();
         
         // 环境音效
         this.ambientSounds = {
@@ -126,13 +131,48 @@ class EnvironmentalHazardSystem {
     loadSprites() {
         Object.values(this.hazardTypes).forEach(hazard => {
             if (hazard.sprite) {
-                const img = new Image();
-                img.src = `assets/images/${hazard.sprite}`;
-                this.sprites[hazard.sprite] = img;
+                // 精灵从图集绘制；发光精灵不在图集中，单独加载
+                spriteAtlas.load(hazard.sprite);
+                
+                // 预烘焙的发光精灵（generate_assets.py 生成的 *_glow.png），代替逐帧 shadowBlur
+                if (!this.glowSprites[hazard.sprite]) {
+                    const glow = new Image();
+                    glow.src = assetUrl(`assets/images/${hazard.sprite.replace(/\.png$/, '_glow.png')}`);
+                    this.glowSprites[hazard.sprite] = glow;
+                }
             }
         });
     }
     
+    // 加载随机变体池（generate_assets.py 生成的 pools.json），每次生成随机选一个预渲染变体
+    loadVariantPools() {
+        fetch(assetUrl('assets/images/pools.json'))
+            .then(response => response.ok ? response.json() : {})
+            .then(index => {
+                Object.entries(index).forEach(([poolName, info]) => {
+                    const img = new Image();
+                    img.src = assetUrl(`assets/images/${info.sheet}`);
+                    this.variantPools[poolName] = { image: img, ...info };
+                });
+            })
+            .catch(() => {});
+    }
+    
+    // 绘制变体表中第 variant 个变体的第 frame 帧，变体表未加载时返回 false
+    drawPoolCell(ctx, poolName, variant, frame, x, y, width, height) {
+        const pool = this.variantPools[poolName];
+        if (!pool || !pool.image.complete || pool.image.naturalWidth === 0) {
+            return false;
+        }
+        
+        const index = (variant % pool.variants) * pool.frames + frame;
+        const cellWidth = pool.image.naturalWidth / pool.columns;
+        const cellHeight = cellWidth * pool.cell[1] / pool.cell[0];
+        ctx.drawImage(pool.image, (index % pool.columns) * cellWidth, Math.floor(index / pool.columns) * cellHeight,
+                      cellWidth, cellHeight, x, y, width, height);
+        return true;
+    }
+    
     // 创建危险
     createHazard(type, x = null, y = null, customConfig = {}) {
         if (!this.hazardTypes[type]) {
@@ -182,7 +222,11 @@ class EnvironmentalHazardSystem {
             rotation: Math.random() * Math.PI * 2,
             rotationSpeed: config.rotationSpeed || 0,
             active: true,
-            sprite: this.sprites[config.sprite],
+            glowSprite: this.glowSprites[config.sprite],
+            spriteName: config.sprite,
+            poolName: config.pool || null,
+            arcPoolName: config.arcPool || null,
+            poolVariant: Math.floor(Math.random() * 1024),
             
             // 特殊属性
             pullRadius: config.pullRadius || 0,
@@ -912,16 +956,35 @@ class EnvironmentalHazardSystem {
         ctx.rotate(hazard.rotation);
         ctx.scale(hazard.scale, hazard.scale);
         
-        // 发光效果
-        if (hazard.glowIntensity > 0) {
-            ctx.shadowColor = this.getHazardColor(hazard.type);
-            ctx.shadowBlur = hazard.size * hazard.glowIntensity;
+        // 发光效果：发光精灵已加载时直接绘制，否则垫一层着色光晕（shadowBlur = size * glowIntensity）
+        const spriteSize = hazard.spriteName && spriteAtlas.size(hazard.spriteName);
+        const bakedGlow = hazard.glowSprite && hazard.glowSprite.complete && hazard.glowSprite.naturalWidth > 0 &&
+                          spriteSize;
+        if (hazard.glowIntensity > 0 && !bakedGlow) {
+            ctx.globalAlpha = hazard.alpha * Math.min(1, hazard.glowIntensity / 0.5);
+            glowSprites.draw(ctx, 'tight', this.getHazardColor(hazard.type), 0, 0, hazard.size / 2);
+            ctx.globalAlpha = hazard.alpha;
         }
         
         // 渲染精灵或基本形状
-        if (hazard.sprite && hazard.sprite.complete) {
-            ctx.drawImage(hazard.sprite, -hazard.size / 2, -hazard.size / 2, 
-                         hazard.size, hazard.size);
+        if (spriteSize) {
+            if (bakedGlow && hazard.glowIntensity > 0) {
+                // 发光精灵按强度0.5烘焙、四周留白相同，按原精灵的缩放比例居中绘制，用透明度体现强度变化
+                const ratio = hazard.size / spriteSize.width;
+                const glowWidth = hazard.glowSprite.naturalWidth * ratio;
+                const glowHeight = hazard.glowSprite.naturalHeight * ratio;
+                ctx.globalAlpha = hazard.alpha * Math.min(1, hazard.glowIntensity / 0.5);
+                ctx.drawImage(hazard.glowSprite, -glowWidth / 2, -glowHeight / 2, glowWidth, glowHeight);
+                ctx.globalAlpha = hazard.alpha;
+            }
+            // 流星等随机形状的危险绘制本次生成选中的变体，变体表未加载时使用单一精灵
+            const pooled = hazard.poolName &&
+                           this.drawPoolCell(ctx, hazard.poolName, hazard.poolVariant, 0,
+                                             -hazard.size / 2, -hazard.size / 2, hazard.size, hazard.size);
+            if (!pooled) {
+                spriteAtlas.draw(ctx, hazard.spriteName, -hazard.size / 2, -hazard.size / 2,
+                                 hazard.size, hazard.size);
+            }
         } else {
             // 基本形状渲染
             ctx.fillStyle = this.getHazardColor(hazard.type);
@@ -955,6 +1018,12 @@ class EnvironmentalHazardSystem {
                 break;
                 
             case 'energyfield':
+                // 闪烁的闪电：每100ms换一个预渲染的闪电变体
+                if (hazard.arcPoolName) {
+                    this.drawPoolCell(ctx, hazard.arcPoolName, hazard.poolVariant + Math.floor(hazard.age / 100), 0,
+                                      -hazard.size / 2, -hazard.size / 2, hazard.size, hazard.size);
+                }
+                
                 // 电弧效果
                 ctx.strokeStyle = '#00ffff';
                 ctx.lineWidth = 1;
@@ -51,6 +51,10 @@ class GameManager {
         // 道具系统
         this.powerups = [];
         
+        // 分块背景星空：各分辨率的拼接清单，以及按画布尺寸拼好的离屏画布
+        this.backgroundManifests = [];
+        this.backgroundCanvas = null;
+        
         this.initialize();
     }
     
@@ -73,6 +77,9 @@ class GameManager {
             // 设置画布属性
             this.setupCanvas();
             
+            // 加载分块背景星空（不阻塞其余资源）
+            this.loadBackground();
+            
             // 加载游戏资源
             await this.loadGameAssets();
             
@@ -117,20 +124,14 @@ class GameManager {
         this.ctx.textBaseline = 'top';
     }
     
-    // 加载游戏资源
+    // 加载游戏资源：精灵来自纹理图集，等待图集与背景图加载完成
     async loadGameAssets() {
         const assets = [
-            'assets/images/player_ship.png',
-            'assets/images/enemy_basic.png',
-            'assets/images/enemy_fast.png',
-            'assets/images/enemy_heavy.png',
-            'assets/images/bullet_player.png',
-            'assets/images/bullet_enemy.png',
             'assets/images/background_stars.jpg'
         ];
         
         let loadedCount = 0;
-        const totalAssets = assets.length;
+        const totalAssets = assets.length + 1;
         
         const loadPromises = assets.map(src => {
             return new Promise((resolve, reject) => {
@@ -142,10 +143,15 @@ class GameManager {
                     resolve(img);
                 };
                 img.onerror = reject;
-                img.src = src;
+                img.src = assetUrl(src);
             });
         });
         
+        loadPromises.push(spriteAtlas.ready.then(() => {
+            loadedCount++;
+            uiManager.updateLoadingProgress(loadedCount / totalAssets);
+        }));
+        
         try {
             await Promise.all(loadPromises);
             console.log('所有游戏资源加载完成');
@@ -172,6 +178,7 @@ class GameManager {
         // 窗口调整大小
         window.addEventListener('resize', () => {
             this.setupCanvas();
+            this.composeBackground();
         });
         
         // 页面可见性变化
@@ -501,8 +508,73 @@ class GameManager {
         this.performance.drawCalls++;
     }
     
+    // 加载分块背景星空的清单（generate_assets.py 生成的 background_stars*.json）
+    loadBackground() {
+        const suffixes = ['', '_4k', '_8k'];
+        Promise.all(suffixes.map(suffix =>
+            fetch(assetUrl(`assets/images/background_stars${suffix}.json`))
+                .then(response => response.ok ? response.json() : null)
+                .catch(() => null)
+        )).then(manifests => {
+            this.backgroundManifests = manifests.filter(Boolean).sort((a, b) => a.width - b.width);
+            this.composeBackground();
+        });
+    }
+    
+    // 选择能覆盖画布像素尺寸的最小分辨率，把各分块拼接到画布大小的离屏画布上（等比覆盖、居中裁切）
+    composeBackground() {
+        if (!this.canvas || this.backgroundManifests.length === 0) return;
+        
+        const width = this.canvas.width;
+        const height = this.canvas.height;
+        const manifest = this.backgroundManifests.find(m => m.width >= width && m.height >= height) ||
+                         this.backgroundManifests[this.backgroundManifests.length - 1];
+        
+        const canvas = document.createElement('canvas');
+        canvas.width = width;
+        canvas.height = height;
+        const bgCtx = canvas.getContext('2d');
+        const scale = Math.max(width / manifest.width, height / manifest.height);
+        const offsetX = (width - manifest.width * scale) / 2;
+        const offsetY = (height - manifest.height * scale) / 2;
+        
+        let pending = 0;
+        manifest.tiles.forEach((row, rowIndex) => {
+            row.forEach((name, colIndex) => {
+                const img = new Image();
+                img.onload = () => {
+                    // 取整到像素边界，相邻分块之间不留缝
+                    const x0 = Math.floor(offsetX + colIndex * manifest.tile_size * scale);
+                    const y0 = Math.floor(offsetY + rowIndex * manifest.tile_size * scale);
+                    const x1 = Math.ceil(offsetX + (colIndex * manifest.tile_size + img.naturalWidth) * scale);
+                    const y1 = Math.ceil(offsetY + (rowIndex * manifest.tile_size + img.naturalHeight) * scale);
+                    bgCtx.drawImage(img, x0, y0, x1 - x0, y1 - y0);
+                    
+                    // 全部分块绘制完成且画布尺寸未变时启用
+                    if (--pending === 0 && this.canvas.width === width && this.canvas.height === height) {
+                        this.backgroundCanvas = canvas;
+                    }
+                };
+                // 任一分块加载失败时不启用，继续使用渐变背景
+                img.onerror = () => { pending = -1; };
+                pending++;
+                img.src = assetUrl(`assets/images/${name}`);
+            });
+        });
+    }
+    
     // 渲染背景
     renderBackground() {
+        // 拼接好的背景星空（画布像素尺寸，绕过 dpr 缩放直接绘制）
+        if (this.backgroundCanvas && this.backgroundCanvas.width === this.canvas.width &&
+            this.backgroundCanvas.height === this.canvas.height) {
+            this.ctx.save();
+            this.ctx.setTransform(1, 0, 0, 1, 0, 0);
+            this.ctx.drawImage(this.backgroundCanvas, 0, 0);
+            this.ctx.restore();
+            return;
+        }
+        
         // 绘制渐变背景
         const gradient = this.ctx.createLinearGradient(0, 0, 0, this.canvas.height);
         gradient.addColorStop(0, '#0a0a0a');
@@ -548,10 +620,8 @@ class GameManager {
             this.ctx.translate(powerup.x, powerup.y);
             this.ctx.rotate(powerup.rotation);
             
-            if (powerup.sprite && powerup.sprite.complete) {
-                this.ctx.drawImage(powerup.sprite, -powerup.size / 2, -powerup.size / 2, 
-                                 powerup.size, powerup.size);
-            } else {
+            if (!(powerup.sprite && spriteAtlas.draw(this.ctx, powerup.sprite, -powerup.size / 2, -powerup.size / 2,
+                                                     powerup.size, powerup.size))) {
                 this.ctx.fillStyle = powerup.color;
                 this.ctx.beginPath();
                 this.ctx.arc(0, 0, powerup.size / 2, 0, Math.PI * 2);
@@ -630,17 +700,17 @@ class GameManager {
     initializePowerupSystem() {
         this.powerupTypes = {
             health: {
-                sprite: 'assets/images/powerup_health.png',
+                sprite: 'powerup_health.png',
                 color: '#44ff44',
                 effect: (player) => player.heal(25)
             },
             weapon: {
-                sprite: 'assets/images/powerup_weapon.png',
+                sprite: 'powerup_weapon.png',
                 color: '#ffaa00',
                 effect: (player) => player.upgradeWeapon()
             },
             shield: {
-                sprite: 'assets/images/powerup_shield.png',
+                sprite: 'powerup_shield.png',
                 color: '#4444ff',
                 effect: (player) => {
                     player.shieldEnergy = player.maxShieldEnergy;
@@ -693,10 +763,10 @@ class GameManager {
             layer: collisionManager.collisionLayers.POWERUP
         };
         
-        // 加载精灵
+        // 精灵从图集绘制
         if (config.sprite) {
-            powerup.sprite = new Image();
-            powerup.sprite.src = config.sprite;
+            powerup.sprite = config.sprite;
+            spriteAtlas.load(config.sprite);
         }
         
         this.powerups.push(powerup);
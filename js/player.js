@@ -85,10 +85,10 @@ class Player {
         this.initializeTrail();
     }
     
-    // 加载玩家精灵
+    // 加载玩家精灵（从精灵图集绘制）
     loadSprite() {
-        this.sprite = new Image();
-        this.sprite.src = 'assets/images/player_ship.png';
+        this.sprite = 'player_ship.png';
+        spriteAtlas.load(this.sprite);
     }
     
     // 初始化轨迹效果
@@ -610,9 +610,8 @@ class Player {
         }
         
         // 渲染玩家精灵
-        if (this.sprite && this.sprite.complete) {
-            ctx.drawImage(this.sprite, -this.width / 2, -this.height / 2, this.width, this.height);
-        } else {
+        if (!(this.sprite && spriteAtlas.draw(ctx, this.sprite, -this.width / 2, -this.height / 2,
+                                              this.width, this.height))) {
             // 基本形状渲染
             ctx.fillStyle = '#64b5f6';
             ctx.strokeStyle = '#ffffff';
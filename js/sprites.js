@@ -0,0 +1,159 @@
+// 精灵加载模块 - sprites.js
+
+// 纹理图集：generate_assets.py 把 1x 精灵裁掉透明边后打包进 atlas_N.png，atlas.json 记录每个精灵的子区域。
+// 图集可用时精灵从图集子区域绘制，只需下载一两张图片；图集中没有的精灵（或图集不可用时全部精灵）单独加载。
+// 高分屏按 variants.json 单独加载不小于 devicePixelRatio 的最小比例的 @Nx 精灵（图集只有 1x）；
+// palettes.json 列出敌人与Boss的换色皮肤（如 enemy_basic_ice.png）。
+class SpriteAtlas {
+    constructor() {
+        // 精灵文件名 -> { image: 图集图片, frame: 子区域, offset: 裁剪偏移, sourceSize: 原始尺寸 }
+        this.frames = {};
+        // 单独加载的精灵 -> { image, scale: 图片相对 1x 的比例 }
+        this.images = {};
+        // 精灵文件名 -> { 比例: @Nx 文件名 }（variants.json）
+        this.variants = {};
+        // 精灵文件名 -> { 调色板: 换色文件名 }（palettes.json）
+        this.palettes = {};
+        // 选用的分辨率比例；为 1 时使用图集
+        this.scale = 1;
+        // 各模块登记需要的精灵
+        this.requested = new Set();
+        this.atlasLoaded = false;
+
+        this.ready = this.loadAtlas();
+    }
+
+    // 读取 JSON 清单，不存在或无法解析时返回 null
+    fetchManifest(filename) {
+        return fetch(assetUrl(`assets/images/${filename}`))
+            .then(response => response.ok ? response.json() : null)
+            .catch(() => null);
+    }
+
+    // 加载各清单和图集图片，完成后单独加载图集中没有的精灵
+    loadAtlas() {
+        return Promise.all(['atlas.json', 'variants.json', 'palettes.json'].map(name => this.fetchManifest(name)))
+            .then(([atlas, variants, palettes]) => {
+                if (palettes) {
+                    this.palettes = palettes.sprites;
+                }
+                if (variants) {
+                    this.variants = variants.sprites;
+                    this.scale = this.pickScale(variants.scales);
+                }
+                return this.scale === 1 && atlas && this.loadSheets(atlas);
+            })
+            .catch(() => {})
+            .then(() => {
+                this.atlasLoaded = true;
+                this.requested.forEach(filename => this.loadImage(filename));
+            });
+    }
+
+    // 加载全部图集图片后登记各精灵的子区域（任一图片加载失败时不使用图集）
+    loadSheets(atlas) {
+        const sheets = atlas.meta.sheets.map(sheet => new Promise((resolve, reject) => {
+            const img = new Image();
+            img.onload = () => resolve(img);
+            img.onerror = reject;
+            img.src = assetUrl(`assets/images/${sheet.image}`);
+        }));
+
+        return Promise.all(sheets).then(images => {
+            Object.entries(atlas.frames).forEach(([name, info]) => {
+                this.frames[`${name}.png`] = {
+                    image: images[info.sheet],
+                    frame: info.frame,
+                    offset: info.spriteSourceSize,
+                    sourceSize: info.sourceSize
+                };
+            });
+        });
+    }
+
+    // 登记需要的精灵；图集加载完成后才决定是否单独下载
+    load(filename) {
+        if (this.requested.has(filename)) return;
+        this.requested.add(filename);
+        if (this.atlasLoaded) {
+            this.loadImage(filename);
+        }
+    }
+
+    // 不小于 devicePixelRatio 的最小比例，没有时取最大比例
+    pickScale(scales) {
+        const dpr = window.devicePixelRatio || 1;
+        const sorted = [...scales].sort((a, b) => a - b);
+        return sorted.find(s => s >= dpr) || sorted[sorted.length - 1] || 1;
+    }
+
+    // 单独加载图集中没有的精灵（有当前比例的 @Nx 变体时加载变体）
+    loadImage(filename) {
+        if (this.frames[filename] || this.images[filename]) return;
+
+        const variants = this.variants[filename] || {};
+        const scale = variants[this.scale] ? this.scale : 1;
+        const img = new Image();
+        img.src = assetUrl(`assets/images/${scale === 1 ? filename : variants[scale]}`);
+        this.images[filename] = { image: img, scale: scale };
+    }
+
+    // 精灵的换色皮肤文件名，palettes.json 中没有时返回 null
+    paletteName(filename, palette) {
+        const variants = this.palettes[filename];
+        return (palette && variants && variants[palette]) || null;
+    }
+
+    // 登记精灵的换色皮肤（清单加载完成后才知道文件名）
+    loadPalette(filename, palette) {
+        this.ready.then(() => {
+            const name = this.paletteName(filename, palette);
+            if (name) {
+                this.load(name);
+            }
+        });
+    }
+
+    // 已加载完成的单独精灵
+    loadedImage(filename) {
+        const entry = this.images[filename];
+        return entry && entry.image.complete && entry.image.naturalWidth > 0 ? entry : null;
+    }
+
+    // 精灵的原始尺寸（1x 像素，含裁掉的透明边），未加载时返回 null
+    size(filename) {
+        const entry = this.frames[filename];
+        if (entry) {
+            return { width: entry.sourceSize.w, height: entry.sourceSize.h };
+        }
+
+        const loaded = this.loadedImage(filename);
+        if (loaded) {
+            return { width: loaded.image.naturalWidth / loaded.scale, height: loaded.image.naturalHeight / loaded.scale };
+        }
+        return null;
+    }
+
+    // 与 ctx.drawImage(精灵, dx, dy, dw, dh) 相同；图集精灵按裁剪偏移绘制子区域。未加载时返回 false
+    draw(ctx, filename, dx, dy, dw, dh) {
+        const entry = this.frames[filename];
+        if (entry) {
+            const scaleX = dw / entry.sourceSize.w;
+            const scaleY = dh / entry.sourceSize.h;
+            const { x, y, w, h } = entry.frame;
+            ctx.drawImage(entry.image, x, y, w, h,
+                          dx + entry.offset.x * scaleX, dy + entry.offset.y * scaleY, w * scaleX, h * scaleY);
+            return true;
+        }
+
+        const loaded = this.loadedImage(filename);
+        if (loaded) {
+            ctx.drawImage(loaded.image, dx, dy, dw, dh);
+            return true;
+        }
+        return false;
+    }
+}
+
+// 创建全局精灵图集实例
+const spriteAtlas = new SpriteAtlas();
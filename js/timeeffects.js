@@ -547,9 +547,10 @@ class TimeEffectsManager {
             ctx.translate(particle.x, particle.y);
             ctx.rotate(particle.rotation);
             
+            // 方块粒子的发光近似为圆形光晕（shadowBlur = size * 2）
+            glowSprites.draw(ctx, 'wide', particle.color, 0, 0, particle.size);
+            
             ctx.fillStyle = particle.color;
-            ctx.shadowColor = particle.color;
-            ctx.shadowBlur = particle.size * 2;
             
             ctx.beginPath();
             ctx.rect(-particle.size/2, -particle.size/2, particle.size, particle.size);
@@ -603,9 +604,9 @@ class TimeEffectsManager {
             
             ctx.save();
             ctx.globalAlpha = alpha;
+            glowSprites.draw(ctx, 'tight', particle.color, particle.x, particle.y, particle.size);
+            
             ctx.fillStyle = particle.color;
-            ctx.shadowColor = particle.color;
-            ctx.shadowBlur = particle.size;
             
             ctx.beginPath();
             ctx.arc(particle.x, particle.y, particle.size, 0, Math.PI * 2);
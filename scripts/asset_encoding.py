@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+资源编码优化与体积预算
+PNG 在最高 zlib 压缩与无损调色板之间取最小者，JPEG 使用优化的霍夫曼表与渐进式编码，
+像素与默认编码完全一致；另可为每张图输出 WebP（无损/有损取最小）与 AVIF 变体。
+体积报告按编码格式汇总全部输出，超出预算时由调用方判定构建失败。
+"""
+
+import re
+from io import BytesIO
+
+import numpy as np
+from PIL import Image, features
+
+# 编码参数变化时递增，使增量构建清单失效
+ENCODING_VERSION = 1
+
+# 可选的现代格式（按 Pillow 是否支持过滤）
+MODERN_FORMATS = ('webp', 'avif')
+IMAGE_EXTENSIONS = ('.png', '.jpg')
+
+WEBP_QUALITY = 90
+AVIF_QUALITY = 75
+
+
+def supported_formats():
+    """当前 Pillow 支持编码的现代格式"""
+    return tuple(fmt for fmt in MODERN_FORMATS if features.check(fmt))
+
+
+def format_name(filename, fmt):
+    """现代格式变体文件名: player_ship.webp"""
+    return f'{filename.rsplit(".", 1)[0]}.{fmt}'
+
+
+def save_to_bytes(img, fmt, **params):
+    buffer = BytesIO()
+    img.save(buffer, fmt, **params)
+    return buffer.getvalue()
+
+
+def lossless_palette(img):
+    """颜色（含 alpha）不超过256种时转换为等价的调色板图像，否则返回 None"""
+    rgba = np.ascontiguousarray(np.asarray(img.convert('RGBA')))
+    colors, indices = np.unique(rgba.view(np.uint32).ravel(), return_inverse=True)
+    if len(colors) > 256:
+        return None
+    entries = colors.view(np.uint8).reshape(-1, 4)
+    palette = Image.fromarray(indices.reshape(rgba.shape[:2]).astype(np.uint8), 'P')
+    palette.putpalette(entries[:, :3].tobytes())
+    palette.info['transparency'] = entries[:, 3].tobytes()
+    return palette
+
+
+def encode_png(img):
+    """最高压缩级别的 PNG，纯色精灵再尝试无损调色板，取较小者"""
+    candidates = [save_to_bytes(img, 'PNG', optimize=True)]
+    if img.mode in ('RGB', 'RGBA'):
+        palette = lossless_palette(img)
+        if palette is not None:
+            candidates.append(save_to_bytes(palette, 'PNG', optimize=True))
+    return min(candidates, key=len)
+
+
+def encode_jpeg(img):
+    """默认质量的 JPEG，优化霍夫曼表并使用渐进式编码（解码结果不变）"""
+    return save_to_bytes(img, 'JPEG', optimize=True, progressive=True)
+
+
+def encode_webp(img):
+    """无损与有损 WebP 取较小者；不透明的 RGB 图（JPEG 背景）本身已有损，只尝试有损编码"""
+    lossy = save_to_bytes(img, 'WEBP', quality=WEBP_QUALITY, method=4)
+    if img.mode == 'RGB':
+        return lossy
+    return min(save_to_bytes(img, 'WEBP', lossless=True, method=4), lossy, key=len)
+
+
+def encode_avif(img):
+    return save_to_bytes(img, 'AVIF', quality=AVIF_QUALITY, speed=8)
+
+
+ENCODERS = {'png': encode_png, 'jpg': encode_jpeg, 'webp': encode_webp, 'avif': encode_avif}
+
+
+def encode(img, filename):
+    """按扩展名选择编码器，未知格式使用 Pillow 默认参数"""
+    ext = filename.rsplit('.', 1)[-1].lower()
+    if ext in ENCODERS:
+        return ENCODERS[ext](img)
+    return save_to_bytes(img, Image.registered_extensions()['.' + ext])
+
+
+def parse_size(text):
+    """解析体积字符串: 512K、8M、1.5G 或字节数"""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*', text, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"无法解析的体积: {text}")
+    number, unit = match.groups()
+    return int(float(number) * 1024 ** ' KMG'.index(unit.upper() or ' '))
+
+
+def format_size(size):
+    if size < 1024:
+        return f'{size} B'
+    if size < 1024 ** 2:
+        return f'{size / 1024:.1f} KB'
+    return f'{size / 1024 ** 2:.1f} MB'
+
+
+def is_modern_variant(name):
+    return name.endswith(tuple('.' + fmt for fmt in MODERN_FORMATS))
+
+
+class SizeReport:
+    """按编码格式汇总输出体积并检查预算
+
+    原格式（PNG/JPEG）与 JSON 清单是客户端实际下载的内容，总预算针对它们；
+    WebP/AVIF 只报告各自替换原格式后的总量。单个文件预算对所有文件生效。
+    """
+
+    def __init__(self, sizes, formats=()):
+        self.sizes = sizes      # 文件名 -> 字节数
+        self.formats = tuple(formats)
+
+    def images(self):
+        return sorted(name for name in self.sizes if name.endswith(IMAGE_EXTENSIONS))
+
+    def total(self, fmt=None):
+        """客户端下载总量: fmt 为 None 时使用原格式，否则每张图换成对应的现代格式（没有时保留原格式）"""
+        total = sum(size for name, size in self.sizes.items()
+                    if not name.endswith(IMAGE_EXTENSIONS) and not is_modern_variant(name))
+        for name in self.images():
+            alternative = format_name(name, fmt) if fmt else None
+            total += self.sizes.get(alternative, self.sizes[name])
+        return total
+
+    def print(self, top=10):
+        """打印最大的 top 个资源（top 为 None 时全部）及各格式总量"""
+        rows = sorted(self.images(), key=lambda name: self.sizes[name], reverse=True)
+        shown = rows if top is None else rows[:top]
+        header = ''.join(f'{fmt:>12}' for fmt in self.formats)
+        print(f"  {'资源':<36}{'原格式':>12}{header}")
+        for name in shown:
+            columns = ''.join(f'{format_size(self.sizes[format_name(name, fmt)]):>12}'
+                              if format_name(name, fmt) in self.sizes else f'{"-":>12}' for fmt in self.formats)
+            print(f"  {name:<36}{format_size(self.sizes[name]):>12}{columns}")
+        if len(shown) < len(rows):
+            print(f"  ... 另有 {len(rows) - len(shown)} 个资源（--size-report 查看全部）")
+        totals = ''.join(f'{format_size(self.total(fmt)):>12}' for fmt in self.formats)
+        print(f"  {'总计（含 JSON）':<34}{format_size(self.total()):>12}{totals}")
+
+    def violations(self, budget=None, asset_budget=None):
+        """超出预算的描述列表，预算为 None 时不检查"""
+        problems = []
+        if budget is not None and self.total() > budget:
+            problems.append(f"总体积 {format_size(self.total())} 超出预算 {format_size(budget)}")
+        if asset_budget is not None:
+            for name, size in sorted(self.sizes.items()):
+                if size > asset_budget:
+                    problems.append(f"{name} 体积 {format_size(size)} 超出单个资源预算 {format_size(asset_budget)}")
+        return problems
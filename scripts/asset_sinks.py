@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+资源输出目标（Sink）
+生成器只负责产出编码后的字节，由 Sink 决定写到哪里：
+磁盘目录、内存字典，或直接流式写入 zip/tar 归档。
+"""
+
+import os
+import io
+import time
+import tarfile
+import zipfile
+
+
+class AssetSink:
+    """输出目标基类"""
+
+    # 是否支持增量构建（需要能在多次运行之间保留文件）
+    incremental = False
+
+    def write(self, name, data):
+        """写入一个资源文件"""
+        raise NotImplementedError
+
+    def read(self, name):
+        """读取已写入的资源文件"""
+        raise NotImplementedError
+
+    def exists(self, name):
+        """资源文件是否已存在"""
+        raise NotImplementedError
+
+    def close(self):
+        """结束写入"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class DiskSink(AssetSink):
+    """写入磁盘目录"""
+
+    incremental = True
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+
+    def path(self, name):
+        return os.path.join(self.output_dir, name)
+
+    def write(self, name, data):
+        # 先写临时文件再替换，读取方不会看到写了一半的文件
+        tmp_path = self.path(name) + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path(name))
+
+    def read(self, name):
+        with open(self.path(name), 'rb') as f:
+            return f.read()
+
+    def exists(self, name):
+        return os.path.exists(self.path(name))
+
+
+class MemorySink(AssetSink):
+    """保存在内存字典 {文件名: 字节} 中"""
+
+    def __init__(self):
+        self.files = {}
+
+    def write(self, name, data):
+        self.files[name] = bytes(data)
+
+    def read(self, name):
+        return self.files[name]
+
+    def exists(self, name):
+        return name in self.files
+
+
+class ZipSink(AssetSink):
+    """流式写入 zip 归档"""
+
+    def __init__(self, path, compression=zipfile.ZIP_DEFLATED):
+        self.zip = zipfile.ZipFile(path, 'w', compression=compression)
+
+    def write(self, name, data):
+        self.zip.writestr(name, data)
+
+    def read(self, name):
+        return self.zip.read(name)
+
+    def exists(self, name):
+        return name in self.zip.NameToInfo
+
+    def close(self):
+        self.zip.close()
+
+
+class TarSink(AssetSink):
+    """流式写入未压缩的 tar 归档（图片已是压缩格式，不再二次压缩）"""
+
+    def __init__(self, path):
+        self.fileobj = open(path, 'w+b')
+        self.tar = tarfile.open(fileobj=self.fileobj, mode='w')
+        self.members = {}
+
+    def write(self, name, data):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self.tar.addfile(info, io.BytesIO(data))
+        # 记录数据在归档中的位置，以便回读（数据按块大小补齐）
+        padded = -(-len(data) // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+        self.members[name] = (self.tar.offset - padded, len(data))
+
+    def read(self, name):
+        offset, size = self.members[name]
+        position = self.fileobj.tell()
+        try:
+            self.fileobj.seek(offset)
+            return self.fileobj.read(size)
+        finally:
+            self.fileobj.seek(position)
+
+    def exists(self, name):
+        return name in self.members
+
+    def close(self):
+        self.tar.close()
+        self.fileobj.close()
+
+
+def open_archive_sink(path):
+    """按扩展名创建归档 Sink（.zip 或 .tar）"""
+    if path.endswith('.zip'):
+        return ZipSink(path)
+    if path.endswith('.tar'):
+        return TarSink(path)
+    raise ValueError(f"不支持的归档格式: {path}（仅支持 .zip / .tar）")
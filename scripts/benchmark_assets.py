@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+资源生成器基准测试
+逐个测量 SuperGameAssetGenerator 各生成方法在 1x/2x/4x 尺寸下以及一次输出
+@1x/@2x/@4x 的多分辨率模式下的耗时、峰值内存和输出字节数，与 JSON 基线比较，
+超过阈值即判定为性能回退。生成器使用命令行的默认配置（预旋转帧、变体池与换色变体）。
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import statistics
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from generate_assets import (SuperGameAssetGenerator, DEFAULT_SEED, DEFAULT_SCALES, DEFAULT_ROTATIONS,
+                             DEFAULT_POOL_SIZE)
+from asset_sinks import MemorySink
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+BASELINE_VERSION = 2
+
+
+def peak_rss_bytes():
+    """当前进程的峰值常驻内存（字节）"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 以 KB 为单位，macOS 以字节为单位
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def new_generator(sink, scales, seed):
+    """与生成器命令行默认配置相同的生成器；scales 只有一个比例时按该比例渲染，否则为多分辨率模式"""
+    options = {'scale': scales[0]} if len(scales) == 1 else {'scales': tuple(scales)}
+    return SuperGameAssetGenerator(seed=seed, sink=sink, rotations=DEFAULT_ROTATIONS, pool_size=DEFAULT_POOL_SIZE,
+                                   palettes=tuple(SuperGameAssetGenerator.COLOR_PALETTES), **options)
+
+
+def scales_label(scales):
+    return '+'.join(str(s) for s in scales) + 'x'
+
+
+def measure_method(method_name, scales, repeats, seed):
+    """在独立进程中运行：重复执行一个生成方法并返回测量结果"""
+    times = []
+    output_bytes = 0
+    for _ in range(repeats):
+        sink = MemorySink()
+        generator = new_generator(sink, scales, seed)
+        start = time.perf_counter()
+        generator.run_task(method_name[len('create_'):], method_name)
+        times.append(time.perf_counter() - start)
+        output_bytes = sum(len(data) for data in sink.files.values())
+
+    return {
+        'times': times,
+        'median': statistics.median(times),
+        'min': min(times),
+        'peak_rss': peak_rss_bytes(),
+        'output_bytes': output_bytes,
+    }
+
+
+def run_benchmarks(methods, scales, repeats, seed=DEFAULT_SEED, multiscale=()):
+    """测量所有方法 × 比例，返回 {"方法@比例x": 结果}；multiscale 非空时再以多分辨率模式测量一次（"方法@1+2+4x"）
+
+    每项测量都在全新的进程中执行，峰值内存互不影响。
+    """
+    context = multiprocessing.get_context('spawn')
+    configs = [(scale,) for scale in scales] + ([tuple(multiscale)] if multiscale else [])
+    results = {}
+    for method_name in methods:
+        for config in configs:
+            key = f'{method_name}@{scales_label(config)}'
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(measure_method, method_name, config, repeats, seed).result()
+            results[key] = result
+            print(f"  {key:<40} {result['median'] * 1000:9.1f} ms "
+                  f"{result['peak_rss'] / 2**20:8.1f} MB {result['output_bytes'] / 1024:10.1f} KB")
+    return results
+
+
+def load_baseline(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('version') != BASELINE_VERSION:
+        raise ValueError(f"基线文件版本不匹配: {path}")
+    return baseline['results']
+
+
+def save_baseline(path, results):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': BASELINE_VERSION, 'results': results}, f, indent=2, sort_keys=True)
+
+
+def find_regressions(results, baseline, threshold, min_delta, rss_threshold=None):
+    """与基线比较，返回回退描述列表
+
+    耗时中位数超过基线 (1 + threshold) 倍且绝对增量超过 min_delta 秒才算回退，
+    避免毫秒级方法的计时抖动误报；rss_threshold 为 None 时不检查内存。
+    """
+    regressions = []
+    for key, result in sorted(results.items()):
+        base = baseline.get(key)
+        if base is None:
+            continue
+        limit = base['median'] * (1 + threshold)
+        if result['median'] > limit and result['median'] - base['median'] > min_delta:
+            regressions.append(f"{key}: 耗时 {base['median'] * 1000:.1f} ms -> {result['median'] * 1000:.1f} ms "
+                               f"(+{(result['median'] / base['median'] - 1) * 100:.0f}%)")
+        if rss_threshold is not None and result['peak_rss'] > base['peak_rss'] * (1 + rss_threshold):
+            regressions.append(f"{key}: 峰值内存 {base['peak_rss'] / 2**20:.1f} MB -> "
+                               f"{result['peak_rss'] / 2**20:.1f} MB")
+    return regressions
+
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    methods = [name for _, name in SuperGameAssetGenerator.GENERATION_STEPS]
+    parser = argparse.ArgumentParser(description="资源生成器基准测试")
+    parser.add_argument('-m', '--method', action='append', choices=methods, dest='methods',
+                        help="只测量指定的生成方法（可重复），默认全部")
+    parser.add_argument('-s', '--scales', default='1,2,4',
+                        help="渲染比例列表，逗号分隔 (默认: 1,2,4)")
+    parser.add_argument('--multiscale', default=','.join(str(s) for s in DEFAULT_SCALES),
+                        help="多分辨率模式一次输出的比例，逗号分隔，留空不测量 "
+                             f"(默认: {','.join(str(s) for s in DEFAULT_SCALES)})")
+    parser.add_argument('-r', '--repeats', type=int, default=3,
+                        help="每项重复次数 (默认: 3)")
+    parser.add_argument('-b', '--baseline', default=DEFAULT_BASELINE,
+                        help="基线 JSON 文件路径")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="把本次结果写为新的基线，而不是与基线比较")
+    parser.add_argument('-t', '--threshold', type=float, default=0.25,
+                        help="允许的耗时增幅比例 (默认: 0.25 即 25%%)")
+    parser.add_argument('--min-delta', type=float, default=0.005,
+                        help="判定回退所需的最小绝对耗时增量，秒 (默认: 0.005)")
+    parser.add_argument('--rss-threshold', type=float, default=None,
+                        help="允许的峰值内存增幅比例，默认不检查")
+    args = parser.parse_args(argv)
+    args.methods = args.methods or methods
+    args.scales = [int(s) for s in args.scales.split(',')]
+    args.multiscale = [int(s) for s in args.multiscale.split(',') if s]
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    print("=== 资源生成器基准测试 ===")
+    print(f"  {'方法@比例':<40} {'耗时中位数':>9} {'峰值内存':>8} {'输出大小':>10}")
+    results = run_benchmarks(args.methods, args.scales, args.repeats, multiscale=args.multiscale)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"✅ 基线已保存: {args.baseline}")
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        print(f"⚠️  基线文件不存在: {args.baseline}（使用 --save-baseline 创建）")
+        sys.exit(0)
+
+    try:
+        baseline = load_baseline(args.baseline)
+    except ValueError as e:
+        print(f"⚠️  {e}（使用 --save-baseline 重新创建）")
+        sys.exit(0)
+    regressions = find_regressions(results, baseline, args.threshold, args.min_delta, args.rss_threshold)
+    if regressions:
+        print("❌ 检测到性能回退:")
+        for line in regressions:
+            print(f"   - {line}")
+        sys.exit(1)
+    print("✅ 未检测到性能回退")
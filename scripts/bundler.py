@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+JS/CSS 打包
+按 index.html 中 <script src> 与 <link rel="stylesheet"> 的顺序把脚本和样式各自拼接成一个文件，
+可选压缩（去掉注释与多余空白），并生成 Source Map v3；输入文件或页面的修改时间变化后重新打包。
+打包模式下页面中的多个标签被替换为一个 bundle 标签，首屏只需两个文本请求。
+
+压缩保留全部换行，输出的每一行与源文件的同一行对应，Source Map 精确到行。
+"""
+
+import os
+import re
+import json
+import threading
+import posixpath
+
+from file_cache import content_digest
+
+BUNDLE_NAMES = {'js': 'js/__bundle__.js', 'css': 'css/__bundle__.css'}
+SOURCE_MAP_SUFFIX = '.map'
+
+SCRIPT_TAG = re.compile(r'<script\b[^>]*?\bsrc\s*=\s*["\']([^"\']+)["\'][^>]*>\s*</script>', re.IGNORECASE)
+LINK_TAG = re.compile(r'<link\b[^>]*>', re.IGNORECASE)
+STYLESHEET_REL = re.compile(r'\brel\s*=\s*["\']?stylesheet\b', re.IGNORECASE)
+HREF_ATTR = re.compile(r'\bhref\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+CSS_URL = re.compile(r'url\(\s*(["\']?)([^"\')]+)\1\s*\)')
+
+WORD = re.compile(r'[A-Za-z0-9_$\u0080-\uffff]+')
+SPACE = re.compile(r'[ \t\r\f\v\u00a0\ufeff]+')
+
+# 空白两侧可以去掉的符号；不含 + - / . 以免拼出 ++、--、// 或改变数字字面量
+JS_TIGHT = set('{}()[];,:=<>!&|?*%^~')
+CSS_TIGHT = set('{};,>')
+# 出现在这些符号或关键字之后的 / 是正则字面量的开始，否则是除号
+JS_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+JS_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void',
+                     'throw', 'instanceof', 'yield', 'await'}
+
+BASE64_DIGITS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+
+
+def is_local_url(url):
+    return not re.match(r'^([a-z][a-z0-9+.-]*:|//|#)', url, re.IGNORECASE)
+
+
+def url_file(url):
+    """页面中的引用去掉查询参数后的相对文件路径"""
+    return url.split('#', 1)[0].split('?', 1)[0].lstrip('/')
+
+
+def find_page_resources(html):
+    """页面中按顺序引用的本地脚本与样式表: {'js': [...], 'css': [...]}"""
+    scripts = [url_file(match.group(1)) for match in SCRIPT_TAG.finditer(html) if is_local_url(match.group(1))]
+    styles = []
+    for match in LINK_TAG.finditer(html):
+        tag = match.group(0)
+        href = HREF_ATTR.search(tag)
+        if STYLESHEET_REL.search(tag) and href and is_local_url(href.group(1)):
+            styles.append(url_file(href.group(1)))
+    return {'js': scripts, 'css': styles}
+
+
+def rewrite_page(html):
+    """把本地脚本和样式表标签替换为 bundle 标签（位于原第一个标签处）"""
+    inserted = set()
+
+    def replace(kind, tag):
+        if kind in inserted:
+            return ''
+        inserted.add(kind)
+        return tag
+
+    def replace_script(match):
+        if not is_local_url(match.group(1)):
+            return match.group(0)
+        return replace('js', f'<script src="{BUNDLE_NAMES["js"]}"></script>')
+
+    def replace_link(match):
+        tag = match.group(0)
+        href = HREF_ATTR.search(tag)
+        if not (STYLESHEET_REL.search(tag) and href and is_local_url(href.group(1))):
+            return tag
+        return replace('css', f'<link rel="stylesheet" href="{BUNDLE_NAMES["css"]}">')
+
+    return LINK_TAG.sub(replace_link, SCRIPT_TAG.sub(replace_script, html))
+
+
+def rebase_css_urls(text, source_dir, bundle_dir):
+    """样式表中的相对 url() 改为相对 bundle 所在目录"""
+    if source_dir == bundle_dir:
+        return text
+
+    def rebase(match):
+        quote, url = match.groups()
+        if not is_local_url(url) or url.startswith(('data:', '/')):
+            return match.group(0)
+        target = posixpath.normpath(posixpath.join(source_dir, url))
+        return f'url({quote}{posixpath.relpath(target, bundle_dir or ".")}{quote})'
+
+    return CSS_URL.sub(rebase, text)
+
+
+def scan_quoted(text, i, quote):
+    """从引号 text[i] 开始扫描到匹配的结束引号，返回结束位置之后的下标"""
+    n = len(text)
+    i += 1
+    while i < n:
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        i += 1
+        if c == quote:
+            break
+    return i
+
+
+def scan_regex(text, i):
+    """从 / 开始扫描正则字面量（含字符类与标志），返回结束位置之后的下标"""
+    n = len(text)
+    i += 1
+    in_class = False
+    while i < n:
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '\n':
+            break
+        i += 1
+        if c == '[':
+            in_class = True
+        elif c == ']':
+            in_class = False
+        elif c == '/' and not in_class:
+            break
+    match = WORD.match(text, i)
+    return match.end() if match else i
+
+
+def minify_source(text, js=True):
+    """去掉注释与多余空白，保留字符串、模板和正则字面量原样；换行全部保留"""
+    tight = JS_TIGHT if js else CSS_TIGHT
+    out = []
+    prev = ''           # 上一个输出的非空白字符
+    prev_word = ''      # 上一个输出的标识符（用于判断 / 是否为正则）
+    pending_space = False
+    line_start = True
+    i, n = 0, len(text)
+
+    def emit(token):
+        nonlocal prev, prev_word, pending_space, line_start
+        if pending_space and not line_start and prev not in tight and token[0] not in tight:
+            out.append(' ')
+        out.append(token)
+        pending_space = line_start = False
+        prev = token[-1]
+        prev_word = token if WORD.fullmatch(token) else ''
+
+    while i < n:
+        c = text[i]
+        if c == '\n':
+            out.append('\n')
+            pending_space = False
+            line_start = True
+            i += 1
+        elif SPACE.match(c):
+            i = SPACE.match(text, i).end()
+            pending_space = True
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            end = n if end < 0 else end + 2
+            newlines = text.count('\n', i, end)
+            if newlines:
+                # 含换行的块注释按换行处理（与 JS 自动分号插入的规则一致）
+                out.append('\n' * newlines)
+                line_start = True
+                pending_space = False
+            else:
+                pending_space = True
+            i = end
+        elif js and text.startswith('//', i):
+            end = text.find('\n', i)
+            i = n if end < 0 else end
+        elif c in '"\'' or (js and c == '`'):
+            end = scan_quoted(text, i, c)
+            emit(text[i:end])
+            i = end
+        elif js and c == '/' and (not prev or prev in JS_REGEX_PRECEDERS or prev_word in JS_REGEX_KEYWORDS):
+            end = scan_regex(text, i)
+            emit(text[i:end])
+            i = end
+        else:
+            match = WORD.match(text, i)
+            end = match.end() if match else i + 1
+            emit(text[i:end])
+            i = end
+    return ''.join(out)
+
+
+def vlq(value):
+    """Source Map 的 Base64 VLQ 编码"""
+    value = (-value << 1) | 1 if value < 0 else value << 1
+    digits = []
+    while True:
+        digit = value & 31
+        value >>= 5
+        digits.append(BASE64_DIGITS[digit | (32 if value else 0)])
+        if not value:
+            return ''.join(digits)
+
+
+def indent_of(line):
+    return len(line) - len(line.lstrip())
+
+
+class Bundler:
+    """按页面引用顺序打包脚本与样式，以页面和输入文件的 (修改时间, 大小) 为缓存签名
+
+    knows/get 与按需资源生成器的接口一致，名称为站点根目录下的相对路径。
+    """
+
+    def __init__(self, root='.', page='index.html', minify=False):
+        self.root = root
+        self.page = page
+        self.minify = minify
+        self.cache = {}     # 名称 -> (签名, 字节)
+        self.lock = threading.Lock()
+
+    def path(self, name):
+        return os.path.join(self.root, *name.split('/'))
+
+    def signature(self, names):
+        signature = []
+        for name in names:
+            st = os.stat(self.path(name))
+            signature.append((name, st.st_mtime_ns, st.st_size))
+        return tuple(signature)
+
+    def read(self, name):
+        with open(self.path(name), encoding='utf-8-sig') as f:
+            return f.read()
+
+    def resources(self):
+        return find_page_resources(self.read(self.page))
+
+    def knows(self, name):
+        bundles = set(BUNDLE_NAMES.values())
+        return name in (self.page, *bundles, *(bundle + SOURCE_MAP_SUFFIX for bundle in bundles))
+
+    def get(self, name):
+        kind = next((kind for kind, bundle in BUNDLE_NAMES.items() if name.startswith(bundle)), None)
+        inputs = [self.page] if kind is None else [self.page, *self.resources()[kind]]
+        signature = self.signature(inputs)
+        with self.lock:
+            cached = self.cache.get(name)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+
+        if kind is None:
+            files = {name: rewrite_page(self.read(self.page)).encode('utf-8')}
+        else:
+            code, source_map = self.build(kind, inputs[1:])
+            files = {BUNDLE_NAMES[kind]: code, BUNDLE_NAMES[kind] + SOURCE_MAP_SUFFIX: source_map}
+        with self.lock:
+            for file_name, data in files.items():
+                self.cache[file_name] = (signature, data)
+        return files[name]
+
+    def version(self, name):
+        return content_digest(self.get(name))
+
+    def build(self, kind, names):
+        """拼接 names 中的文件，返回 (bundle 字节, Source Map 字节)"""
+        bundle_name = BUNDLE_NAMES[kind]
+        bundle_dir = posixpath.dirname(bundle_name)
+        separator = ';' if kind == 'js' else ''
+        lines, mappings = [], []
+        previous = [0, 0, 0]    # 上一个映射段的 (源文件序号, 源行, 源列)，VLQ 记录差值
+
+        for index, name in enumerate(names):
+            source = self.read(name)
+            text = source
+            if kind == 'css':
+                text = rebase_css_urls(text, posixpath.dirname(name), bundle_dir)
+            if self.minify:
+                text = minify_source(text, js=(kind == 'js'))
+            source_lines = source.split('\n')
+            for row, line in enumerate(text.split('\n')):
+                lines.append(line)
+                if not line.strip() or row >= len(source_lines):
+                    mappings.append('')
+                    continue
+                segment = (index, row, indent_of(source_lines[row]))
+                mappings.append(vlq(indent_of(line)) + ''.join(vlq(value - last)
+                                                               for value, last in zip(segment, previous)))
+                previous = list(segment)
+            lines.append(separator)
+            mappings.append('')
+
+        map_name = posixpath.basename(bundle_name) + SOURCE_MAP_SUFFIX
+        if kind == 'js':
+            lines.append(f'//# sourceMappingURL={map_name}')
+        else:
+            lines.append(f'/*# sourceMappingURL={map_name} */')
+        source_map = {
+            'version': 3,
+            'file': posixpath.basename(bundle_name),
+            'sources': ['/' + name for name in names],
+            'names': [],
+            'mappings': ';'.join(mappings),
+        }
+        return '\n'.join(lines).encode('utf-8'), json.dumps(source_map).encode('utf-8')
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+HTTP 字节范围请求
+解析 Range 请求头，把 200/206 响应体表示为内存字节与文件区间组成的片段序列；
+文件区间通过 socket.sendfile 发送（Linux 上即 os.sendfile 零拷贝），不经过 Python 缓冲区。
+"""
+
+import uuid
+
+# 单个请求最多接受的范围数，超出时（合并后仍超出）忽略 Range 返回完整内容
+MAX_RANGES = 16
+
+
+def parse_range_header(header, size):
+    """解析 Range 请求头，返回闭区间 [(起点, 终点), ...]
+
+    返回 None 表示忽略该请求头（不是 bytes 单位、语法错误或范围过多）并发送完整内容，
+    返回空列表表示没有可满足的范围（416）。有重叠的范围按起点排序后合并。
+    """
+    if not header:
+        return None
+    unit, _, specs = header.partition('=')
+    if unit.strip().lower() != 'bytes':
+        return None
+
+    ranges = []
+    for spec in specs.split(','):
+        spec = spec.strip()
+        if not spec:
+            continue
+        first, dash, last = spec.partition('-')
+        first, last = first.strip(), last.strip()
+        if not dash or not (first or last) or not (first or '0').isdigit() or not (last or '0').isdigit():
+            return None
+        if not first:
+            # 后缀范围: 最后 N 个字节
+            length = int(last)
+            if length > 0 and size > 0:
+                ranges.append((max(0, size - length), size - 1))
+            continue
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        if start < size:
+            ranges.append((start, min(int(last), size - 1) if last else size - 1))
+
+    if len(ranges) > 1 and (len(ranges) > MAX_RANGES or has_overlap(ranges)):
+        ranges = merge_ranges(ranges)
+        if len(ranges) > MAX_RANGES:
+            return None
+    return ranges
+
+
+def has_overlap(ranges):
+    ordered = sorted(ranges)
+    return any(start <= previous_end for (_, previous_end), (start, _) in zip(ordered, ordered[1:]))
+
+
+def merge_ranges(ranges):
+    """合并重叠或相邻的范围"""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def content_range(start, end, size):
+    return f'bytes {start}-{end}/{size}'
+
+
+class ResponseBody:
+    """响应体: 片段为 bytes 或 (偏移, 长度)，后者取自 source（内存中的 bytes 或已打开的文件）"""
+
+    def __init__(self, source, segments):
+        self.source = source
+        self.segments = segments
+
+    @classmethod
+    def whole(cls, source, size):
+        return cls(source, [(0, size)])
+
+    @classmethod
+    def single_range(cls, source, start, end):
+        return cls(source, [(start, end - start + 1)])
+
+    @classmethod
+    def multipart(cls, source, ranges, size, content_type):
+        """multipart/byteranges 响应体，返回 (响应体, 分隔符)"""
+        boundary = uuid.uuid4().hex
+        segments = []
+        for start, end in ranges:
+            segments.append(f'--{boundary}\r\nContent-Type: {content_type}\r\n'
+                            f'Content-Range: {content_range(start, end, size)}\r\n\r\n'.encode('latin-1'))
+            segments.append((start, end - start + 1))
+            segments.append(b'\r\n')
+        segments.append(f'--{boundary}--\r\n'.encode('latin-1'))
+        return cls(source, segments), boundary
+
+    def __len__(self):
+        return sum(segment[1] if isinstance(segment, tuple) else len(segment) for segment in self.segments)
+
+    def write_to(self, sock, wfile):
+        """发送全部片段：文件区间用 sendfile，其余直接写出"""
+        for segment in self.segments:
+            if not isinstance(segment, tuple):
+                wfile.write(segment)
+            elif isinstance(self.source, bytes):
+                offset, count = segment
+                wfile.write(memoryview(self.source)[offset:offset + count])
+            else:
+                offset, count = segment
+                wfile.flush()
+                sock.sendfile(self.source, offset, count)
+
+    def close(self):
+        if not isinstance(self.source, bytes):
+            self.source.close()
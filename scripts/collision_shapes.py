@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+精灵碰撞形状
+从每个精灵的 alpha 通道计算紧凑的凸包、少量覆盖子圆和按位打包的 1 位掩码，
+写入 collision.json，客户端可以先用子圆粗测，再用掩码精确判定，无需在运行时读取像素。
+"""
+
+import json
+import base64
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+COLLISION_JSON_NAME = 'collision.json'
+COLLISION_VERSION = 1
+
+
+def alpha_mask(img, threshold):
+    """alpha 不低于阈值的像素为实心"""
+    return np.asarray(img.convert('RGBA').getchannel('A')) >= threshold
+
+
+def convex_hull(points):
+    """单调链算法求凸包，返回逆时针顶点（去掉共线点）"""
+    points = sorted(set(points))
+    if len(points) <= 2:
+        return points
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower, upper = [], []
+    for p in points:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    for p in reversed(points):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    return lower[:-1] + upper[:-1]
+
+
+def mask_hull(mask):
+    """实心像素的凸包，顶点取像素角点，完整包住每个实心像素"""
+    points = []
+    for y in np.flatnonzero(mask.any(axis=1)):
+        xs = np.flatnonzero(mask[y])
+        for x in (int(xs[0]), int(xs[-1]) + 1):
+            points.extend([(x, int(y)), (x, int(y) + 1)])
+    return convex_hull(points)
+
+
+def union_area(circles):
+    """在像素网格上估算若干圆并集的面积"""
+    left = int(np.floor(min(x - r for x, _, r in circles)))
+    right = int(np.ceil(max(x + r for x, _, r in circles)))
+    top = int(np.floor(min(y - r for _, y, r in circles)))
+    bottom = int(np.ceil(max(y + r for _, y, r in circles)))
+    ys, xs = np.mgrid[top:bottom, left:right] + 0.5
+    covered = np.zeros(xs.shape, dtype=bool)
+    for x, y, r in circles:
+        covered |= (xs - x) ** 2 + (ys - y) ** 2 <= r * r
+    return int(covered.sum())
+
+
+def fit_circles(mask, max_circles=4, iterations=8):
+    """用 k-means 把实心像素分成 1..max_circles 组，每组取能包住全部像素的圆
+
+    多一个圆要让覆盖面积（各圆并集）至少减少 15% 才采用；圆心、半径以像素坐标计，半径包含像素半对角线，
+    因此子圆一定覆盖全部实心像素，适合作为保守的粗测形状。
+    """
+    ys, xs = np.nonzero(mask)
+    if len(xs) == 0:
+        return []
+    points = np.column_stack([xs + 0.5, ys + 0.5])
+
+    best, best_area = None, None
+    for k in range(1, min(max_circles, len(points)) + 1):
+        # 最远点初始化，结果确定且无需随机数
+        centers = [points.mean(axis=0)]
+        for _ in range(1, k):
+            distance = np.min([np.hypot(*(points - c).T) for c in centers], axis=0)
+            centers.append(points[np.argmax(distance)])
+        centers = np.array(centers)
+
+        for _ in range(iterations):
+            labels = np.argmin([np.hypot(*(points - c).T) for c in centers], axis=0)
+            centers = np.array([points[labels == i].mean(axis=0) if np.any(labels == i) else centers[i]
+                                for i in range(k)])
+        labels = np.argmin([np.hypot(*(points - c).T) for c in centers], axis=0)
+
+        circles = []
+        for i in range(k):
+            members = points[labels == i]
+            if len(members):
+                radius = np.hypot(*(members - centers[i]).T).max() + np.sqrt(0.5)
+                circles.append((float(centers[i][0]), float(centers[i][1]), float(radius)))
+        area = union_area(circles)
+        if best_area is None or area < best_area * 0.85:
+            best, best_area = circles, area
+    return best
+
+
+def pack_mask(mask):
+    """按行打包为位串（高位在前，每行补齐到整字节）并做 base64 编码"""
+    return base64.b64encode(np.packbits(mask, axis=1).tobytes()).decode('ascii')
+
+
+class CollisionShapeBuilder:
+    def __init__(self, sink, threshold=128, max_circles=4):
+        # sink: 资源输出目标，需提供 read(name) / write(name, data)
+        self.sink = sink
+        self.threshold = threshold
+        self.max_circles = max_circles
+
+    def shape(self, img):
+        """单个精灵的碰撞形状，坐标相对精灵中心（1x 像素）"""
+        mask = alpha_mask(img, self.threshold)
+        height, width = mask.shape
+        cx, cy = width / 2, height / 2
+        return {
+            'width': width,
+            'height': height,
+            'hull': [[x - cx, y - cy] for x, y in mask_hull(mask)],
+            'circles': [[round(x - cx, 2), round(y - cy, 2), round(r, 2)]
+                        for x, y, r in fit_circles(mask, self.max_circles)],
+            'mask': pack_mask(mask),
+        }
+
+    def build(self, filenames):
+        """计算所有精灵的碰撞形状并写入 collision.json，返回写出的文件名"""
+        sprites = {}
+        for name in sorted(filenames):
+            with Image.open(BytesIO(self.sink.read(name))) as img:
+                sprites[name] = self.shape(img)
+
+        data = {'version': COLLISION_VERSION, 'threshold': self.threshold, 'sprites': sprites}
+        self.sink.write(COLLISION_JSON_NAME, json.dumps(data, separators=(',', ':')).encode('utf-8'))
+        return [COLLISION_JSON_NAME]
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+静态文件内存缓存
+按路径缓存文件内容与校验器（强 ETag、修改时间），总大小超过上限时淘汰最久未使用的文件；
+每次查询只做一次 stat，修改时间或大小变化即重新读取。
+"""
+
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+# 超过该大小的文件不缓存内容（只提供由 stat 得到的弱校验器），由调用方直接从磁盘发送
+DEFAULT_MAX_FILE_BYTES = 8 * 1024 * 1024
+
+
+def content_digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def content_etag(data):
+    """由内容哈希得到的强 ETag"""
+    return '"' + content_digest(data) + '"'
+
+
+class CachedFile:
+    """缓存的文件: data 为 None 表示文件过大、未缓存内容"""
+
+    def __init__(self, path, data, size, mtime_ns, etag):
+        self.path = path
+        self.data = data
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.etag = etag
+
+    @property
+    def mtime(self):
+        return self.mtime_ns / 1e9
+
+
+class FileCache:
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES, max_file_bytes=DEFAULT_MAX_FILE_BYTES):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = min(max_file_bytes, max_bytes)
+        self.entries = OrderedDict()    # 路径 -> CachedFile，按最近使用排序
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, path):
+        """返回路径对应的 CachedFile；文件不存在或无法读取时抛出 OSError"""
+        st = os.stat(path)
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                self.entries.move_to_end(path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        if st.st_size > self.max_file_bytes:
+            # 弱校验器: 内容未读入，只能由大小和修改时间区分版本
+            return CachedFile(path, None, st.st_size, st.st_mtime_ns, f'W/"{st.st_size:x}-{st.st_mtime_ns:x}"')
+
+        with open(path, 'rb') as f:
+            # 以打开后的 fstat 为准，避免 stat 与读取之间文件被替换
+            st = os.fstat(f.fileno())
+            data = f.read()
+        entry = CachedFile(path, data, len(data), st.st_mtime_ns, content_etag(data))
+        self.put(entry)
+        return entry
+
+    def put(self, entry):
+        with self.lock:
+            old = self.entries.pop(entry.path, None)
+            if old is not None:
+                self.total_bytes -= old.size
+            self.entries[entry.path] = entry
+            self.total_bytes += entry.size
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.total_bytes -= evicted.size
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.entries), 'bytes': self.total_bytes,
+                    'hits': self.hits, 'misses': self.misses}
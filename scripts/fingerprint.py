@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+资源指纹
+把资源地址改写为带版本摘要的形式（js/main.3f1e849334.js），摘要变化即地址变化，
+因此带指纹的地址可以用 Cache-Control: immutable 缓存一年，重复访问时未变化的文件不再发出任何请求。
+页面中的 <script src>、<link href> 与 <img src> 直接改写；脚本动态拼出的资源地址通过
+window.ASSET_MANIFEST（原路径 -> 带指纹路径）由 assetUrl() 查询。清单包含全部按需资源，
+体积是页面本身的数倍，因此作为单独的带指纹脚本 asset-manifest.js 提供（同样 immutable 缓存），
+页面只注入引用它的 <script> 标签，重新验证页面时不必重复传输清单。
+"""
+
+import re
+import json
+import threading
+import posixpath
+
+from file_cache import content_digest
+
+FINGERPRINT_LENGTH = 10
+FINGERPRINTED_NAME = re.compile(r'^(.+)\.([0-9a-f]{%d})(\.[A-Za-z0-9]+)$' % FINGERPRINT_LENGTH)
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+MANIFEST_GLOBAL = 'ASSET_MANIFEST'
+MANIFEST_SCRIPT_NAME = 'asset-manifest.js'
+
+RESOURCE_TAG = re.compile(r'<(?:script|link|img)\b[^>]*>', re.IGNORECASE)
+RESOURCE_ATTR = re.compile(r'(\b(?:src|href)\s*=\s*)(["\'])([^"\']+)\2', re.IGNORECASE)
+HEAD_TAG = re.compile(r'<head\b[^>]*>', re.IGNORECASE)
+
+
+def fingerprint_name(name, version):
+    base, ext = posixpath.splitext(name)
+    return f'{base}.{version[:FINGERPRINT_LENGTH]}{ext}'
+
+
+def split_fingerprint(name):
+    """带指纹的名称拆分为 (原名称, 指纹)，不是指纹格式时返回 None"""
+    match = FINGERPRINTED_NAME.match(name)
+    if match is None:
+        return None
+    base, fingerprint, ext = match.groups()
+    return base + ext, fingerprint
+
+
+class Fingerprinter:
+    def __init__(self, version_of, list_assets):
+        self.version_of = version_of    # 站点相对路径 -> 版本摘要（十六进制），未知或无法确定时为 None
+        self.list_assets = list_assets  # () -> 脚本可能动态请求的资源路径
+        self.page_cache = None          # (原页面字节, 清单, 改写后的页面字节)
+        self.script_cache = None        # (清单, 清单脚本字节)
+        self.lock = threading.Lock()
+
+    def url(self, name):
+        """带指纹的地址，没有版本时返回原名称"""
+        version = self.version_of(name)
+        return fingerprint_name(name, version) if version else name
+
+    def resolve(self, name):
+        """指纹与当前版本一致时返回原名称，否则返回 None（按普通路径处理）"""
+        parts = split_fingerprint(name)
+        if parts is None:
+            return None
+        original, fingerprint = parts
+        version = self.version_of(original)
+        if version and version[:FINGERPRINT_LENGTH] == fingerprint:
+            return original
+        return None
+
+    def manifest(self):
+        manifest = {}
+        for name in sorted(self.list_assets()):
+            url = self.url(name)
+            if url != name:
+                manifest[name] = url
+        return manifest
+
+    def knows(self, name):
+        return name == MANIFEST_SCRIPT_NAME
+
+    def get(self, name):
+        """清单脚本字节；清单不变时返回同一个字节对象"""
+        if not self.knows(name):
+            return None
+        return self.manifest_script(self.manifest())
+
+    def version(self, name):
+        data = self.get(name)
+        return content_digest(data) if data is not None else None
+
+    def manifest_script(self, manifest):
+        with self.lock:
+            if self.script_cache is not None and self.script_cache[0] == manifest:
+                return self.script_cache[1]
+        script = f'window.{MANIFEST_GLOBAL} = {json.dumps(manifest, separators=(",", ":"))};\n'.encode('utf-8')
+        with self.lock:
+            self.script_cache = (manifest, script)
+        return script
+
+    def rewrite_page(self, html):
+        """改写页面中的本地资源地址并在 <head> 开头插入清单脚本标签；输入与清单不变时返回同一个字节对象"""
+        manifest = self.manifest()
+        with self.lock:
+            if self.page_cache is not None and self.page_cache[0] is html and self.page_cache[1] == manifest:
+                return self.page_cache[2]
+
+        def rewrite_attr(match):
+            prefix, quote, url = match.groups()
+            if re.match(r'^([a-z][a-z0-9+.-]*:|//|#)', url, re.IGNORECASE):
+                return match.group(0)
+            name = url.split('#', 1)[0].split('?', 1)[0].lstrip('/')
+            return f'{prefix}{quote}{manifest.get(name) or self.url(name)}{quote}'
+
+        text = RESOURCE_TAG.sub(lambda tag: RESOURCE_ATTR.sub(rewrite_attr, tag.group(0)), html.decode('utf-8'))
+        script_url = fingerprint_name(MANIFEST_SCRIPT_NAME, content_digest(self.manifest_script(manifest)))
+        script = f'<script src="/{script_url}"></script>'
+        head = HEAD_TAG.search(text)
+        position = head.end() if head else 0
+        page = (text[:position] + script + text[position:]).encode('utf-8')
+        with self.lock:
+            self.page_cache = (html, manifest, page)
+        return page
@@ -4,38 +4,435 @@
 生成丰富炫酷的游戏图像资源，让游戏更加有趣好玩！
 """
 
-import os
+import re
+import sys
+import json
 import math
+import zlib
 import random
+import hashlib
+import inspect
+import argparse
+import importlib
+import functools
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from PIL import Image, ImageDraw, ImageFilter, ImageEnhance, ImageFont
 import numpy as np
-from io import BytesIO
+from texture_atlas import TextureAtlasPacker, ATLAS_JSON_NAME
+from collision_shapes import CollisionShapeBuilder, COLLISION_JSON_NAME
+from asset_encoding import (encode, format_name, supported_formats, is_modern_variant, parse_size, SizeReport,
+                            ENCODING_VERSION, IMAGE_EXTENSIONS)
+from asset_sinks import DiskSink, MemorySink, open_archive_sink
+from vector_render import Canvas
+from scaled_draw import ScaledDraw
+from multiscale import MultiScaleImage, MultiScaleDraw, MultiScaleCanvas, variant_name
+from starfield import StarfieldRenderer
+
+DEFAULT_SEED = 20240101
+
+# 增量构建清单文件名（位于输出目录中）
+MANIFEST_NAME = '.manifest.json'
+MANIFEST_VERSION = 1
+
+# 多分辨率精灵: 默认输出比例与变体清单文件名
+DEFAULT_SCALES = (1, 2, 4)
+VARIANTS_JSON_NAME = 'variants.json'
+# 预烘焙发光精灵清单文件名
+GLOWS_JSON_NAME = 'glows.json'
+# 预旋转帧: 默认帧数、可选帧数与角度索引文件名
+DEFAULT_ROTATIONS = 32
+ROTATION_CHOICES = (0, 16, 32, 64)
+ROTATIONS_JSON_NAME = 'rotations.json'
+# 随机变体池: 默认每种随机资源的变体数与索引文件名
+DEFAULT_POOL_SIZE = 16
+POOLS_JSON_NAME = 'pools.json'
+# 调色板换色变体清单文件名
+PALETTES_JSON_NAME = 'palettes.json'
+# 生成方法所依赖的渲染、编码与打包模块，源码计入任务缓存键
+RENDER_MODULES = ('vector_render', 'scaled_draw', 'multiscale', 'starfield', 'asset_encoding',
+                  'texture_atlas', 'collision_shapes')
+
+
+@functools.lru_cache(maxsize=None)
+def render_modules_digest():
+    """RENDER_MODULES 源码的哈希（每个进程只计算一次）"""
+    digest = hashlib.sha256()
+    for name in RENDER_MODULES:
+        digest.update(inspect.getsource(importlib.import_module(name)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def function_source(func):
+    """函数源码（inspect.getsource 每次都要重新定位代码块，多个任务共用的辅助方法只读取一次）"""
+    return inspect.getsource(func)
+
+
+class AssetGenerationError(Exception):
+    """资源生成失败，消息中包含出错的资源名"""
+
 
 class SuperGameAssetGenerator:
-    def __init__(self, output_dir="../assets/images"):
+    # 生成步骤: (说明, 方法名)，顺序即串行生成顺序
+    GENERATION_STEPS = [
+        ("创建玩家飞船", "create_player_ship"),
+        ("创建基础敌人", "create_enemy_ships"),
+        ("创建高级敌人", "create_advanced_enemies"),
+        ("创建子弹系统", "create_bullets"),
+        ("创建高级武器", "create_advanced_weapons"),
+        ("创建爆炸效果", "create_explosions"),
+        ("创建背景星空", "create_background_stars"),
+        ("创建UI元素", "create_ui_elements"),
+        ("创建UI装饰", "create_ui_decorations"),
+        ("创建道具", "create_power_ups"),
+        ("创建收集品", "create_collectibles"),
+        ("创建粒子效果", "create_particle_effects"),
+        ("创建环境危险", "create_environmental_hazards"),
+        ("创建连击效果", "create_combo_effects"),
+        ("创建随机变体池", "create_variant_pools"),
+        ("创建发光光晕", "create_glow_halos"),
+    ]
+    
+    # 经验宝石颜色与尺寸
+    XP_GEM_COLORS = ['#ff0000', '#00ff00', '#0000ff', '#ffff00', '#ff00ff']
+    XP_GEM_SIZES = [15, 20, 25, 30, 35]
+    # 爆炸动画帧数 / 连击背景等级数
+    EXPLOSION_FRAMES = 8
+    COMBO_LEVELS = 10
+    
+    # 背景星空: (文件名后缀, 宽, 高, 相对1080p的缩放)
+    BACKGROUND_VARIANTS = [
+        ('', 1920, 1080, 1),
+        ('_4k', 3840, 2160, 2),
+        ('_8k', 7680, 4320, 4),
+    ]
+    # 背景星空按此边长（输出像素）分块渲染，每块单独编码为 JPEG，客户端按清单拼接
+    BACKGROUND_TILE_SIZE = 1024
+    # 视差星空图层（由远及近）: (宽, 高, 每百万像素星星数, 亮度范围, 星星尺寸, 滚动速度)
+    PARALLAX_LAYERS = [
+        (1024, 1024, 400, (60, 150), (1,), 0.2),
+        (1024, 1024, 150, (120, 220), (1, 1, 2), 0.5),
+        (1024, 1024, 40, (180, 255), (2, 2, 3), 1.0),
+    ]
+    # 整体作为一个任务的步骤所输出的文件（按需生成时据此查找对应任务）
+    STEP_OUTPUTS = {
+        'create_player_ship': ['player_ship.png'],
+        'create_enemy_ships': ['enemy_basic.png', 'enemy_heavy.png', 'enemy_fast.png'],
+        'create_advanced_enemies': ['enemy_splitter.png', 'enemy_shielded.png', 'enemy_stealth.png',
+                                    'enemy_swarm.png', 'boss_fortress.png', 'boss_organic.png'],
+        'create_bullets': ['bullet_player.png', 'bullet_enemy.png', 'laser_beam.png'],
+        'create_advanced_weapons': ['weapon_plasma.png', 'bullet_shotgun.png', 'weapon_missile.png',
+                                    'weapon_wave.png'],
+        'create_ui_elements': ['button_start.png', 'button_pause.png', 'icon_health.png'],
+        'create_ui_decorations': ['ui_border.png', 'ui_radar.png'],
+        'create_power_ups': ['powerup_health.png', 'powerup_weapon.png', 'powerup_shield.png'],
+        'create_particle_effects': [f'particle_star_{i}.png' for i in range(5)]
+                                   + [f'engine_flame_{i}.png' for i in range(4)],
+        'create_environmental_hazards': ['hazard_meteor.png', 'hazard_blackhole.png', 'hazard_energyfield.png'],
+        'create_glow_halos': ['glow_halo_tight.png', 'glow_halo_wide.png'],
+    }
+    # 预烘焙发光变体: 精灵 -> (shadowBlur 与精灵边长之比, 发光颜色)
+    # 与 JS 中 ctx.shadowBlur 的设置一致: 子弹 blur = size，危险物 blur = size * glowIntensity（取均值0.5）；
+    # 颜色取各精灵主要使用者的 shadowColor。Boss 在 JS 中按程序绘制，使用下面的通用光晕
+    GLOW_SPRITES = {
+        'bullet_player.png': (1.0, '#64b5f6'),
+        'bullet_enemy.png': (1.0, '#ff4444'),
+        'laser_beam.png': (1.0, '#00ffff'),
+        'hazard_meteor.png': (0.5, '#ff4500'),
+        'hazard_blackhole.png': (0.5, '#8a2be2'),
+        'hazard_energyfield.png': (0.5, '#00ffff'),
+        'weapon_wave.png': (0.5, '#ffff00'),
+    }
+    # 通用发光光晕: 文件名 -> shadowBlur 与圆半径之比
+    # 白色圆盘按比例模糊，JS 按颜色着色后垫在粒子、Boss 等程序绘制的圆形下方，代替实时 shadowBlur
+    HALO_SPRITES = {
+        'glow_halo_tight.png': 1.0,
+        'glow_halo_wide.png': 2.0,
+    }
+    # 光晕图中圆盘的半径（1x 像素），JS 绘制时按 目标半径 / HALO_RADIUS 缩放
+    HALO_RADIUS = 16
+    # 预旋转帧表的方向性精灵: 精灵 -> 绘制框宽高比（None 为原始比例）
+    # 子弹在 bullets.js 中按 size*2 × size 绘制，旋转前先拉伸成相同比例
+    ROTATION_SPRITES = {
+        'bullet_player.png': 2.0,
+        'bullet_enemy.png': 2.0,
+        'laser_beam.png': 2.0,
+        'weapon_missile.png': None,
+        'enemy_fast.png': None,
+        'enemy_swarm.png': None,
+    }
+    ROTATION_COLUMNS = 8
+    # 随机变体池: 池名 -> (格子宽, 格子高, 每个变体的帧数)，与对应单个精灵的尺寸一致
+    VARIANT_POOLS = {
+        'meteor': (35, 35, 1),
+        'lightning': (60, 60, 1),
+        'engine_flame': (20, 30, 4),
+    }
+    POOL_COLUMNS = 8
+    # 颜色调色板
+    COLOR_PALETTES = {
+        'neon': ['#ff0080', '#00ff80', '#8000ff', '#ff8000', '#0080ff'],
+        'fire': ['#ff4500', '#ff6347', '#ffd700', '#ff1493', '#ff69b4'],
+        'ice': ['#00ffff', '#87ceeb', '#4169e1', '#9370db', '#00bfff'],
+        'toxic': ['#32cd32', '#7fff00', '#adff2f', '#9aff9a', '#00ff7f'],
+        'dark': ['#8b0000', '#2f4f4f', '#483d8b', '#2e2e2e', '#696969'],
+        'cosmic': ['#4b0082', '#8a2be2', '#9400d3', '#9932cc', '#ba55d3'],
+        'energy': ['#ffff00', '#ffd700', '#fff8dc', '#fffacd', '#f0e68c']
+    }
+    # 按调色板换色输出皮肤变体的精灵（全部敌人与Boss）
+    PALETTE_SPRITES = tuple(STEP_OUTPUTS['create_enemy_ships'] + STEP_OUTPUTS['create_advanced_enemies'])
+    # 需要导出碰撞形状的精灵（舰船、弹药、危险物与可拾取物）
+    COLLISION_PREFIXES = ('player_', 'enemy_', 'boss_', 'bullet_', 'laser_', 'weapon_', 'hazard_',
+                          'powerup_', 'gem_', 'coin')
+    # 只输出单一分辨率的生成方法（背景已有按分辨率区分的版本）
+    SINGLE_SCALE_METHODS = ('create_starfield_background', 'create_parallax_layers')
+    # 不打包进纹理图集的资源（需要平铺重复的图层）
+    ATLAS_EXCLUDE_PREFIXES = ('parallax_', 'pool_')
+    
+    def __init__(self, output_dir="../assets/images", seed=DEFAULT_SEED, sink=None, scale=1, scales=(1,),
+                 rotations=0, pool_size=0, palettes=(), formats=()):
         self.output_dir = output_dir
-        os.makedirs(output_dir, exist_ok=True)
+        # 渲染比例: 所有方法按 1x 像素坐标作图，按 scale 倍分辨率光栅化
+        self.scale = scale
+        # 多分辨率输出: 几何只计算一次，同时光栅化出每个比例的精灵变体
+        self.scales = tuple(scales)
+        if scale != 1 and self.scales != (1,):
+            raise ValueError("scale 与 scales 不能同时使用")
+        # 方向性精灵的预旋转帧数，0 表示不生成
+        if rotations not in ROTATION_CHOICES:
+            raise ValueError(f"预旋转帧数必须是 {ROTATION_CHOICES} 之一")
+        self.rotations = rotations
+        # 每个随机变体池的变体数，0 表示不生成
+        self.pool_size = pool_size
+        # 输出换色皮肤变体的调色板名
+        unknown = set(palettes) - set(self.COLOR_PALETTES)
+        if unknown:
+            raise ValueError(f"未知的调色板: {', '.join(sorted(unknown))}")
+        self.palettes = tuple(palettes)
+        # 除原格式外额外输出的现代图像格式（webp / avif）
+        unsupported = set(formats) - set(supported_formats())
+        if unsupported:
+            raise ValueError(f"当前 Pillow 不支持编码: {', '.join(sorted(unsupported))}")
+        self.formats = tuple(formats)
+        # 输出目标，默认写入 output_dir 目录
+        self.sink = sink if sink is not None else DiskSink(output_dir)
+        
+        # 随机数生成器 - 每个生成任务都会按任务名重新播种，保证并行与串行输出一致
+        self.seed = seed
+        self.rng = random.Random(seed)
+        
+        # 当前任务写出的文件名，用于记录到增量构建清单
+        self.written_files = []
         
         # 颜色调色板
-        self.color_palettes = {
-            'neon': ['#ff0080', '#00ff80', '#8000ff', '#ff8000', '#0080ff'],
-            'fire': ['#ff4500', '#ff6347', '#ffd700', '#ff1493', '#ff69b4'],
-            'ice': ['#00ffff', '#87ceeb', '#4169e1', '#9370db', '#00bfff'],
-            'toxic': ['#32cd32', '#7fff00', '#adff2f', '#9aff9a', '#00ff7f'],
-            'dark': ['#8b0000', '#2f4f4f', '#483d8b', '#2e2e2e', '#696969'],
-            'cosmic': ['#4b0082', '#8a2be2', '#9400d3', '#9932cc', '#ba55d3'],
-            'energy': ['#ffff00', '#ffd700', '#fff8dc', '#fffacd', '#f0e68c']
-        }
+        self.color_palettes = self.COLOR_PALETTES
         
         # 预计算常用数学值
         self.pi2 = math.pi * 2
         self.pi_half = math.pi / 2
         
+    @property
+    def multiscale(self):
+        return self.scales != (1,)
+    
+    def new_image(self, mode, size, color=0):
+        """按渲染比例创建图像，size 以 1x 像素计"""
+        if self.multiscale:
+            return MultiScaleImage.new(mode, size, color, self.scales)
+        width, height = size
+        return Image.new(mode, (round(width * self.scale), round(height * self.scale)), color)
+    
+    def new_draw(self, img):
+        """创建按渲染比例映射坐标的绘图对象"""
+        if isinstance(img, MultiScaleImage):
+            return MultiScaleDraw(img)
+        return ScaledDraw(img, self.scale)
+    
+    def new_canvas(self, width, height):
+        """创建按渲染比例光栅化的矢量画布"""
+        if self.multiscale:
+            return MultiScaleCanvas(width, height, self.scales)
+        return Canvas(width, height, scale=self.scale)
+    
+    def alpha_composite(self, dest, src):
+        """alpha 合成两张图像，返回新图像"""
+        if isinstance(dest, MultiScaleImage):
+            return dest.alpha_composite(src)
+        return Image.alpha_composite(dest, src)
+    
+    def paste(self, dest, src, box):
+        """把 src 原样贴到 dest 上，box 以 1x 像素计"""
+        if isinstance(dest, MultiScaleImage):
+            dest.paste(src, box)
+        else:
+            dest.paste(src, (round(box[0] * self.scale), round(box[1] * self.scale)))
+    
+    @staticmethod
+    def glow_name(filename):
+        """发光变体文件名: name_glow.png"""
+        base, ext = filename.rsplit('.', 1)
+        return f'{base}_glow.{ext}'
+    
+    @classmethod
+    def glow_geometry(cls, filename, size):
+        """按 1x 精灵尺寸计算发光的模糊半径与四周留白（像素）
+        
+        Canvas 的 shadowBlur 对应标准差为 blur/2 的高斯模糊，留白取 3 倍标准差。
+        """
+        ratio, _ = cls.GLOW_SPRITES[filename]
+        blur = ratio * min(size)
+        return blur, math.ceil(blur / 2 * 3)
+    
+    def bake_glow(self, img, filename):
+        """预烘焙发光: 精灵 alpha 高斯模糊后着色垫在精灵下方，效果等同绘制时设置 shadowBlur"""
+        if isinstance(img, MultiScaleImage):
+            return MultiScaleImage({s: self.bake_glow_image(variant, filename, s)
+                                    for s, variant in img.images.items()})
+        return self.bake_glow_image(img, filename, self.scale)
+    
+    def bake_glow_image(self, img, filename, scale):
+        _, color = self.GLOW_SPRITES[filename]
+        blur, padding = self.glow_geometry(filename, (img.width / scale, img.height / scale))
+        pad = round(padding * scale)
+        size = (img.width + pad * 2, img.height + pad * 2)
+        
+        alpha = Image.new('L', size, 0)
+        alpha.paste(img.getchannel('A'), (pad, pad))
+        glow = Image.new('RGBA', size, color)
+        glow.putalpha(alpha.filter(ImageFilter.GaussianBlur(blur / 2 * scale)))
+        
+        sprite = Image.new('RGBA', size, (0, 0, 0, 0))
+        sprite.paste(img, (pad, pad))
+        return Image.alpha_composite(glow, sprite)
+    
+    @classmethod
+    def build_glow_manifest(cls):
+        """发光精灵清单: 以原精灵文件名为键，记录发光文件名、模糊比例和颜色
+        
+        发光图四周的留白相同，客户端按原精灵的缩放比例居中绘制即可。
+        """
+        glows = {}
+        for filename, (ratio, color) in sorted(cls.GLOW_SPRITES.items()):
+            glows[filename] = {'glow': cls.glow_name(filename), 'blur_ratio': ratio, 'color': color}
+        return glows
+    
+    def rotation_name(self, filename):
+        """预旋转帧表文件名: name_rot32.png"""
+        base, ext = filename.rsplit('.', 1)
+        return f'{base}_rot{self.rotations}.{ext}'
+    
+    def rotation_sheet(self, img, filename):
+        """把精灵旋转成 self.rotations 帧并按 ROTATION_COLUMNS 列排成帧表
+        
+        第 i 帧是顺时针旋转 i * 360 / N 度（与 ctx.rotate 的方向一致）。
+        每帧是边长不小于对角线的正方形格子，精灵居中；多分辨率图像只在最高
+        比例下旋转一次，再缩小得到其余比例，小比例的帧也有超采样的边缘。
+        """
+        if isinstance(img, MultiScaleImage):
+            top = max(img.images)
+            sheet = self.rotation_sheet_image(img.images[top], filename, top)
+            return MultiScaleImage({s: sheet if s == top else sheet.resize(
+                (sheet.width * s // top, sheet.height * s // top), Image.LANCZOS) for s in img.images})
+        return self.rotation_sheet_image(img, filename, self.scale)
+    
+    def rotation_sheet_image(self, img, filename, scale):
+        aspect = self.ROTATION_SPRITES[filename]
+        if aspect is not None:
+            img = img.resize((round(img.height * aspect), img.height), Image.LANCZOS)
+        # 以 1x 像素计的格子边长，保证各比例的帧表对齐
+        cell_1x = math.ceil(math.hypot(img.width, img.height) / scale)
+        cell = round(cell_1x * scale)
+        
+        # 预乘 alpha 后再旋转插值，避免透明边缘出现暗边
+        centered = Image.new('RGBa', (cell, cell), (0, 0, 0, 0))
+        centered.paste(img.convert('RGBa'), ((cell - img.width) // 2, (cell - img.height) // 2))
+        
+        columns = self.ROTATION_COLUMNS
+        rows = math.ceil(self.rotations / columns)
+        sheet = Image.new('RGBa', (cell * columns, cell * rows), (0, 0, 0, 0))
+        for i in range(self.rotations):
+            frame = centered.rotate(-360 * i / self.rotations, resample=Image.BICUBIC)
+            sheet.paste(frame, ((i % columns) * cell, (i // columns) * cell))
+        return sheet.convert('RGBA')
+    
+    def build_rotation_index(self):
+        """角度索引: 帧号 = round(角度 / 2π * frames) mod frames，第 i 帧位于 (i % columns, i // columns) 格"""
+        return {filename: {'sheet': self.rotation_name(filename), 'frames': self.rotations,
+                           'columns': self.ROTATION_COLUMNS, 'aspect': aspect}
+                for filename, aspect in sorted(self.ROTATION_SPRITES.items())}
+    
+    @staticmethod
+    def palette_name(filename, palette):
+        """换色变体文件名: enemy_basic_ice.png"""
+        base, ext = filename.rsplit('.', 1)
+        return f'{base}_{palette}.{ext}'
+    
+    @classmethod
+    def is_palette_variant(cls, name):
+        """是否为换色变体（与原精灵的 alpha 完全相同）"""
+        base, _, palette = name.rsplit('.', 1)[0].rpartition('_')
+        return palette in cls.COLOR_PALETTES and f'{base}.png' in cls.PALETTE_SPRITES
+    
+    @classmethod
+    def palette_lut(cls, palette):
+        """调色板查找表 (256, 3): 调色板颜色按亮度从暗到亮均匀排布在 0..255 上，中间线性插值"""
+        colors = sorted((ImageDraw.ImageColor.getrgb(c) for c in cls.COLOR_PALETTES[palette]),
+                        key=lambda c: c[0] * 299 + c[1] * 587 + c[2] * 114)
+        stops = np.linspace(0, 255, len(colors))
+        levels = np.arange(256)
+        return np.stack([np.interp(levels, stops, [c[i] for c in colors]) for i in range(3)],
+                        axis=-1).round().astype(np.uint8)
+    
+    def recolor(self, img, palette):
+        """按调色板换色: 每个像素的亮度经查找表映射为调色板颜色，alpha 保持不变"""
+        if isinstance(img, MultiScaleImage):
+            return MultiScaleImage({s: self.recolor(variant, palette) for s, variant in img.images.items()})
+        rgba = np.empty((img.height, img.width, 4), dtype=np.uint8)
+        rgba[..., :3] = self.palette_lut(palette)[np.asarray(img.convert('L'))]
+        rgba[..., 3] = np.asarray(img.getchannel('A'))
+        return Image.fromarray(rgba, 'RGBA')
+    
+    def build_palette_manifest(self):
+        """换色变体清单: 以原精灵文件名为键，列出各调色板的变体文件"""
+        return {'palettes': {palette: self.COLOR_PALETTES[palette] for palette in self.palettes},
+                'sprites': {filename: {palette: self.palette_name(filename, palette) for palette in self.palettes}
+                            for filename in sorted(self.PALETTE_SPRITES)}}
+    
+    def save_image(self, img, filename):
+        """保存精灵: 多分辨率图像按比例写出各个变体，需要发光的精灵同时写出发光变体"""
+        if isinstance(img, MultiScaleImage):
+            for s, variant in img.images.items():
+                self.encode_image(variant, variant_name(filename, s))
+        else:
+            self.encode_image(img, filename)
+        if filename in self.GLOW_SPRITES:
+            self.save_image(self.bake_glow(img, filename), self.glow_name(filename))
+        if self.rotations and filename in self.ROTATION_SPRITES:
+            self.save_image(self.rotation_sheet(img, filename), self.rotation_name(filename))
+        if filename in self.PALETTE_SPRITES:
+            for palette in self.palettes:
+                self.save_image(self.recolor(img, palette), self.palette_name(filename, palette))
+    
+    def encode_image(self, img, filename):
+        """按扩展名以最优参数编码图像并写入输出目标，同时写出各现代格式的变体"""
+        self.save_bytes(encode(img, filename), filename)
+        for fmt in self.formats:
+            self.save_bytes(encode(img, format_name(filename, fmt)), format_name(filename, fmt))
+    
+    def save_json(self, data, filename):
+        """编码 JSON 数据并写入输出目标"""
+        self.save_bytes(json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8'), filename)
+    
+    def save_bytes(self, data, filename):
+        """写入输出目标并记录文件名"""
+        self.sink.write(filename, data)
+        self.written_files.append(filename)
+        
     def create_player_ship(self):
         """创建玩家飞船"""
         size = 60
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         # 主体 - 三角形
         points = [(size//2, 5), (10, size-10), (size//2, size-20), (size-10, size-10)]
@@ -55,14 +452,14 @@ class SuperGameAssetGenerator:
         draw.rectangle([5, size//2-2, 10, size//2+2], fill=(150, 150, 150, 255))
         draw.rectangle([size-10, size//2-2, size-5, size//2+2], fill=(150, 150, 150, 255))
         
-        img.save(os.path.join(self.output_dir, 'player_ship.png'))
+        self.save_image(img, 'player_ship.png')
         
     def create_enemy_ships(self):
         """创建多种敌人飞船"""
         # 敌人类型1：基础敌舰
         size = 40
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         # 红色三角形敌舰
         points = [(size//2, size-5), (5, 10), (size//2, 20), (size-5, 10)]
@@ -71,12 +468,12 @@ class SuperGameAssetGenerator:
         # 引擎
         draw.ellipse([size//2-3, 8, size//2+3, 14], fill=(255, 150, 0, 255))
         
-        img.save(os.path.join(self.output_dir, 'enemy_basic.png'))
+        self.save_image(img, 'enemy_basic.png')
         
         # 敌人类型2：重型敌舰
         size = 55
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         # 主体
         draw.ellipse([10, 10, size-10, size-10], fill=(150, 0, 150, 255), outline=(100, 0, 100, 255))
@@ -88,12 +485,12 @@ class SuperGameAssetGenerator:
         # 装甲板
         draw.arc([15, 15, size-15, size-15], 0, 180, fill=(100, 0, 100, 255), width=3)
         
-        img.save(os.path.join(self.output_dir, 'enemy_heavy.png'))
+        self.save_image(img, 'enemy_heavy.png')
         
         # 敌人类型3：快速敌舰
         size = 35
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         # 菱形
         points = [(size//2, 5), (size-5, size//2), (size//2, size-5), (5, size//2)]
@@ -102,113 +499,117 @@ class SuperGameAssetGenerator:
         # 中心
         draw.ellipse([size//2-5, size//2-5, size//2+5, size//2+5], fill=(255, 150, 0, 255))
         
-        img.save(os.path.join(self.output_dir, 'enemy_fast.png'))
+        self.save_image(img, 'enemy_fast.png')
         
     def create_bullets(self):
         """创建子弹"""
         # 玩家子弹
         size = 20
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         # 蓝色能量弹
         draw.ellipse([5, 2, 15, 18], fill=(0, 200, 255, 255))
         draw.ellipse([7, 4, 13, 16], fill=(100, 220, 255, 200))
         
-        img.save(os.path.join(self.output_dir, 'bullet_player.png'))
+        self.save_image(img, 'bullet_player.png')
         
         # 敌人子弹
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         # 红色能量弹
         draw.ellipse([5, 2, 15, 18], fill=(255, 50, 50, 255))
         draw.ellipse([7, 4, 13, 16], fill=(255, 150, 150, 200))
         
-        img.save(os.path.join(self.output_dir, 'bullet_enemy.png'))
+        self.save_image(img, 'bullet_enemy.png')
         
         # 激光束
-        img = Image.new('RGBA', (8, 40), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (8, 40), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         draw.rectangle([2, 0, 6, 40], fill=(255, 255, 255, 255))
         draw.rectangle([3, 0, 5, 40], fill=(0, 255, 255, 255))
         
-        img.save(os.path.join(self.output_dir, 'laser_beam.png'))
+        self.save_image(img, 'laser_beam.png')
         
     def create_explosions(self):
         """创建爆炸效果帧"""
-        for frame in range(8):
-            size = 60
-            img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-            
-            # 爆炸的不同阶段
-            radius = int(5 + frame * 4)
-            alpha = int(255 - frame * 30)
-            
-            # 外圈
-            color_outer = (255, 100, 0, alpha)
-            draw.ellipse([size//2-radius, size//2-radius, 
-                         size//2+radius, size//2+radius], fill=color_outer)
-            
-            # 中圈
-            radius_mid = int(radius * 0.7)
-            color_mid = (255, 200, 0, alpha)
-            draw.ellipse([size//2-radius_mid, size//2-radius_mid, 
-                         size//2+radius_mid, size//2+radius_mid], fill=color_mid)
-            
-            # 内圈
-            radius_inner = int(radius * 0.4)
-            color_inner = (255, 255, 200, alpha)
-            draw.ellipse([size//2-radius_inner, size//2-radius_inner, 
-                         size//2+radius_inner, size//2+radius_inner], fill=color_inner)
-            
-            img.save(os.path.join(self.output_dir, f'explosion_{frame}.png'))
-            
-    def create_background_stars(self):
-        """创建背景星空"""
-        width, height = 1920, 1080
-        img = Image.new('RGB', (width, height), (5, 5, 20))
-        draw = ImageDraw.Draw(img)
-        
-        # 添加星星
-        for _ in range(200):
-            x = random.randint(0, width)
-            y = random.randint(0, height)
-            brightness = random.randint(100, 255)
-            size = random.choice([1, 1, 1, 2, 2, 3])
-            
-            color = (brightness, brightness, brightness)
-            if size == 1:
-                draw.point((x, y), fill=color)
-            else:
-                draw.ellipse([x-size//2, y-size//2, x+size//2, y+size//2], fill=color)
+        for frame in range(self.EXPLOSION_FRAMES):
+            self.create_explosion_frame(frame)
+    
+    def create_explosion_frame(self, frame):
+        """创建单帧爆炸效果"""
+        size = 60
+        canvas = self.new_canvas(size, size)
+        center = size // 2
         
-        # 添加遥远的星云
-        for _ in range(10):
-            x = random.randint(0, width)
-            y = random.randint(0, height)
-            radius = random.randint(20, 80)
-            
-            # 创建渐变效果
-            for r in range(radius, 0, -5):
-                alpha = int(30 * (radius - r) / radius)
-                color = (random.randint(50, 150), random.randint(20, 100), 
-                        random.randint(100, 200), alpha)
-                
-                # 由于PIL不直接支持alpha混合，我们简化处理
-                base_color = (color[0]//4, color[1]//4, color[2]//4)
-                draw.ellipse([x-r, y-r, x+r, y+r], fill=base_color)
-        
-        img.save(os.path.join(self.output_dir, 'background_stars.jpg'))
+        # 爆炸的不同阶段
+        radius = int(5 + frame * 4)
+        alpha = int(255 - frame * 30)
+        
+        # 外圈柔光
+        canvas.glow(center, center, radius, (255, 100, 0, alpha // 2), spread=radius * 0.3)
+        
+        # 内圈 -> 中圈 -> 外圈 的径向渐变火球
+        canvas.gradient_disc(center, center, radius, [
+            (0.0, (255, 255, 200, alpha)),
+            (0.4, (255, 255, 200, alpha)),
+            (0.7, (255, 200, 0, alpha)),
+            (1.0, (255, 100, 0, alpha)),
+        ])
+        
+        self.save_image(canvas.to_image(), f'explosion_{frame}.png')
+        
+    def create_background_stars(self):
+        """创建背景星空（各分辨率）和视差星空图层"""
+        for suffix, width, height, scale in self.BACKGROUND_VARIANTS:
+            self.create_starfield_background(suffix, width, height, scale)
+        self.create_parallax_layers()
+    
+    def background_tiles(self, suffix, width, height):
+        """背景星空的分块文件名，按行排列: [[background_stars_4k_0_0.jpg, ...], ...]"""
+        tile = self.BACKGROUND_TILE_SIZE
+        columns = -(-round(width * self.scale) // tile)
+        rows = -(-round(height * self.scale) // tile)
+        return [[f'background_stars{suffix}_{col}_{row}.jpg' for col in range(columns)] for row in range(rows)]
+    
+    def create_starfield_background(self, suffix, width, height, scale):
+        """分块渲染指定分辨率的背景星空（星云加法混合，可无缝平铺）
+        
+        每个区块渲染后立即编码写出，不拼接整张图，峰值内存只与分块大小有关；
+        background_stars{suffix}.json 记录整图尺寸和分块文件名，客户端据此拼接。
+        """
+        renderer = StarfieldRenderer(round(width * self.scale), round(height * self.scale),
+                                     seed=self.rng.getrandbits(32), chunk_size=self.BACKGROUND_TILE_SIZE,
+                                     scale=scale * self.scale)
+        tiles = self.background_tiles(suffix, width, height)
+        for col, row, tile in renderer.tiles():
+            self.save_image(tile, tiles[row][col])
+        self.save_json({'width': renderer.width, 'height': renderer.height,
+                        'tile_size': self.BACKGROUND_TILE_SIZE, 'tiles': tiles},
+                       f'background_stars{suffix}.json')
+    
+    def create_parallax_layers(self):
+        """创建透明的可平铺视差星空图层，并写出图层清单供客户端滚动使用"""
+        layers = []
+        for i, (width, height, density, brightness, star_sizes, speed) in enumerate(self.PARALLAX_LAYERS):
+            renderer = StarfieldRenderer(round(width * self.scale), round(height * self.scale),
+                                         seed=self.rng.getrandbits(32), scale=self.scale,
+                                         star_density=density, brightness=brightness,
+                                         star_sizes=star_sizes, transparent=True)
+            filename = f'parallax_layer_{i}.png'
+            self.save_image(renderer.render(), filename)
+            layers.append({'image': filename, 'width': width, 'height': height, 'speed': speed})
+        
+        self.save_json({'layers': layers}, 'parallax.json')
         
     def create_ui_elements(self):
         """创建UI元素"""
         # 开始按钮
         width, height = 200, 60
-        img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (width, height), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         # 按钮背景
         draw.rounded_rectangle([0, 0, width-1, height-1], radius=15, 
@@ -218,12 +619,12 @@ class SuperGameAssetGenerator:
         draw.rounded_rectangle([5, 5, width-6, height//2], radius=10, 
                               fill=(100, 180, 255, 100))
         
-        img.save(os.path.join(self.output_dir, 'button_start.png'))
+        self.save_image(img, 'button_start.png')
         
         # 暂停按钮
         size = 40
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         draw.ellipse([0, 0, size-1, size-1], fill=(100, 100, 100, 200), 
                     outline=(200, 200, 200, 255), width=2)
@@ -232,31 +633,29 @@ class SuperGameAssetGenerator:
         draw.rectangle([12, 10, 16, 30], fill=(255, 255, 255, 255))
         draw.rectangle([24, 10, 28, 30], fill=(255, 255, 255, 255))
         
-        img.save(os.path.join(self.output_dir, 'button_pause.png'))
+        self.save_image(img, 'button_pause.png')
         
         # 生命值图标
         size = 30
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
-        # 心形
-        heart_points = []
-        for i in range(360):
-            t = math.radians(i)
-            x = 16 * (math.sin(t)**3)
-            y = -13 * math.cos(t) + 5 * math.cos(2*t) + 2 * math.cos(3*t) + math.cos(4*t)
-            heart_points.append((x + size//2, y + size//2))
+        # 心形 - 一次性计算整条参数曲线
+        t = np.radians(np.arange(360))
+        xs = 16 * np.sin(t) ** 3 + size // 2
+        ys = -13 * np.cos(t) + 5 * np.cos(2*t) + 2 * np.cos(3*t) + np.cos(4*t) + size // 2
+        heart_points = list(zip(xs.tolist(), ys.tolist()))
         
         draw.polygon(heart_points, fill=(255, 50, 50, 255))
         
-        img.save(os.path.join(self.output_dir, 'icon_health.png'))
+        self.save_image(img, 'icon_health.png')
         
     def create_power_ups(self):
         """创建道具"""
         # 生命恢复道具
         size = 30
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         # 绿色十字
         draw.rectangle([size//2-3, 5, size//2+3, size-5], fill=(0, 255, 0, 255))
@@ -265,11 +664,11 @@ class SuperGameAssetGenerator:
         # 光晕效果
         draw.ellipse([3, 3, size-3, size-3], outline=(100, 255, 100, 150), width=2)
         
-        img.save(os.path.join(self.output_dir, 'powerup_health.png'))
+        self.save_image(img, 'powerup_health.png')
         
         # 武器升级道具
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         # 橙色闪电
         lightning_points = [(15, 5), (10, 12), (18, 12), (12, 20), (20, 20), (8, 25)]
@@ -278,11 +677,11 @@ class SuperGameAssetGenerator:
         # 光晕
         draw.ellipse([3, 3, size-3, size-3], outline=(255, 255, 100, 150), width=2)
         
-        img.save(os.path.join(self.output_dir, 'powerup_weapon.png'))
+        self.save_image(img, 'powerup_weapon.png')
         
         # 护盾道具
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         # 蓝色盾牌
         shield_points = [(15, 5), (25, 10), (25, 20), (15, 25), (5, 20), (5, 10)]
@@ -291,15 +690,15 @@ class SuperGameAssetGenerator:
         # 内部细节
         draw.ellipse([10, 10, 20, 20], outline=(100, 200, 255, 255), width=2)
         
-        img.save(os.path.join(self.output_dir, 'powerup_shield.png'))
+        self.save_image(img, 'powerup_shield.png')
     
     def create_particle_effects(self):
         """创建粒子效果"""
         # 星尘粒子
         for i in range(5):
             size = 8
-            img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
+            img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+            draw = self.new_draw(img)
             
             alpha = 255 - i * 40
             color = (255, 255, 255, alpha)
@@ -309,37 +708,64 @@ class SuperGameAssetGenerator:
             else:
                 draw.ellipse([3, 3, 5, 5], fill=color)
             
-            img.save(os.path.join(self.output_dir, f'particle_star_{i}.png'))
+            self.save_image(img, f'particle_star_{i}.png')
         
-        # 引擎尾焰
+        # 引擎尾焰（随机化尾焰形状）
         for frame in range(4):
-            width, height = 20, 30
-            img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-            
-            # 随机化尾焰形状
-            flame_height = height - frame * 3
-            flame_points = [
-                (width//2, 0),
-                (width//2 + random.randint(-3, 3), flame_height//3),
-                (width//2 + random.randint(-5, 5), flame_height*2//3),
-                (width//2 + random.randint(-2, 2), flame_height)
-            ]
-            
-            # 外焰
-            outer_points = [(p[0]-3, p[1]) for p in flame_points] + [(p[0]+3, p[1]) for p in reversed(flame_points)]
-            draw.polygon(outer_points, fill=(255, 100, 0, 200))
-            
-            # 内焰
-            inner_points = [(p[0]-1, p[1]) for p in flame_points] + [(p[0]+1, p[1]) for p in reversed(flame_points)]
-            draw.polygon(inner_points, fill=(255, 200, 0, 255))
-            
-            img.save(os.path.join(self.output_dir, f'engine_flame_{frame}.png'))
+            offsets = [self.rng.randint(-3, 3), self.rng.randint(-5, 5), self.rng.randint(-2, 2)]
+            self.save_image(self.render_engine_flame(frame, offsets), f'engine_flame_{frame}.png')
+    
+    def create_glow_halos(self):
+        """创建通用发光光晕（白色，JS 按颜色着色）"""
+        for filename, ratio in self.HALO_SPRITES.items():
+            if self.multiscale:
+                halo = MultiScaleImage({s: self.render_glow_halo(ratio, s) for s in self.scales})
+            else:
+                halo = self.render_glow_halo(ratio, self.scale)
+            self.save_image(halo, filename)
+    
+    def render_glow_halo(self, ratio, scale):
+        """半径 HALO_RADIUS 的圆盘按 shadowBlur = ratio * 半径 模糊，四周留白 3 倍标准差"""
+        radius = self.HALO_RADIUS
+        blur = ratio * radius
+        half = radius + math.ceil(blur / 2 * 3)
+        size = round(half * 2 * scale)
+        
+        alpha = Image.new('L', (size, size), 0)
+        ImageDraw.Draw(alpha).ellipse([(half - radius) * scale, (half - radius) * scale,
+                                       (half + radius) * scale, (half + radius) * scale], fill=255)
+        halo = Image.new('RGBA', (size, size), (255, 255, 255, 0))
+        halo.putalpha(alpha.filter(ImageFilter.GaussianBlur(blur / 2 * scale)))
+        return halo
+    
+    def render_engine_flame(self, frame, offsets):
+        """按给定的三个控制点横向偏移绘制一帧引擎尾焰"""
+        width, height = 20, 30
+        img = self.new_image('RGBA', (width, height), (0, 0, 0, 0))
+        draw = self.new_draw(img)
+        
+        flame_height = height - frame * 3
+        flame_points = [
+            (width//2, 0),
+            (width//2 + offsets[0], flame_height//3),
+            (width//2 + offsets[1], flame_height*2//3),
+            (width//2 + offsets[2], flame_height)
+        ]
+        
+        # 外焰
+        outer_points = [(p[0]-3, p[1]) for p in flame_points] + [(p[0]+3, p[1]) for p in reversed(flame_points)]
+        draw.polygon(outer_points, fill=(255, 100, 0, 200))
+        
+        # 内焰
+        inner_points = [(p[0]-1, p[1]) for p in flame_points] + [(p[0]+1, p[1]) for p in reversed(flame_points)]
+        draw.polygon(inner_points, fill=(255, 200, 0, 255))
+        
+        return img
 
     def create_hex_pattern(self, size, color1, color2):
         """创建六边形纹理"""
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         center = size // 2
         radius = center - 5
@@ -369,9 +795,7 @@ class SuperGameAssetGenerator:
     
     def create_energy_orb(self, size, colors):
         """创建能量球效果"""
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
+        canvas = self.new_canvas(size, size)
         center = size // 2
         
         # 多层光环
@@ -379,38 +803,45 @@ class SuperGameAssetGenerator:
             radius = center - i * 5
             if radius > 0:
                 alpha = 255 - i * 40
-                color_with_alpha = (*ImageDraw.ImageColor.getrgb(color), alpha)
-                draw.ellipse([center-radius, center-radius, center+radius, center+radius], 
-                           fill=color_with_alpha)
+                canvas.disc(center, center, radius, (*ImageDraw.ImageColor.getrgb(color), alpha))
         
-        return img
+        return canvas.to_image()
     
     def create_lightning_bolt(self, width, height, color):
         """创建闪电效果"""
-        img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
         # 生成随机闪电路径
         points = [(width//4, 0)]
         y = 0
         x = width // 4
         
         while y < height:
-            y += random.randint(10, 20)
-            x += random.randint(-15, 15)
+            y += self.rng.randint(10, 20)
+            x += self.rng.randint(-15, 15)
             x = max(5, min(width-5, x))
             points.append((x, y))
         
+        # 随机分支: (起点序号, 终点)
+        branches = []
+        for i in range(1, len(points)-1, 2):
+            if self.rng.random() < 0.6:
+                branch_x = points[i][0] + self.rng.randint(-20, 20)
+                branch_y = points[i][1] + self.rng.randint(-10, 10)
+                branches.append((i, (branch_x, branch_y)))
+        
+        return self.render_lightning(width, height, color, points, branches)
+    
+    def render_lightning(self, width, height, color, points, branches):
+        """按给定的主路径和分支绘制闪电"""
+        img = self.new_image('RGBA', (width, height), (0, 0, 0, 0))
+        draw = self.new_draw(img)
+        
         # 绘制主闪电
         for i in range(len(points)-1):
             draw.line([points[i], points[i+1]], fill=color, width=3)
         
         # 添加分支
-        for i in range(1, len(points)-1, 2):
-            if random.random() < 0.6:
-                branch_x = points[i][0] + random.randint(-20, 20)
-                branch_y = points[i][1] + random.randint(-10, 10)
-                draw.line([points[i], (branch_x, branch_y)], fill=color, width=2)
+        for i, end in branches:
+            draw.line([points[i], end], fill=color, width=2)
         
         return img
     
@@ -418,8 +849,8 @@ class SuperGameAssetGenerator:
         """创建高级敌人类型"""
         # 分裂敌人
         size = 45
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         center = size // 2
         # 主体 - 晶体形状
@@ -436,12 +867,12 @@ class SuperGameAssetGenerator:
         # 中心核心
         draw.ellipse([center-8, center-8, center+8, center+8], fill='#ffff00')
         
-        img.save(os.path.join(self.output_dir, 'enemy_splitter.png'))
+        self.save_image(img, 'enemy_splitter.png')
         
         # 护盾敌人
         size = 50
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         center = size // 2
         # 主体
@@ -455,12 +886,12 @@ class SuperGameAssetGenerator:
             draw.ellipse([center-radius, center-radius, center+radius, center+radius], 
                         outline=shield_color, width=2)
         
-        img.save(os.path.join(self.output_dir, 'enemy_shielded.png'))
+        self.save_image(img, 'enemy_shielded.png')
         
         # 隐形敌人（半透明）
         size = 40
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         # 轮廓形状
         points = [(size//2, 5), (5, size-5), (size//2, size-15), (size-5, size-5)]
@@ -470,19 +901,19 @@ class SuperGameAssetGenerator:
         for y in range(5, size-5, 3):
             draw.line([(5, y), (size-5, y)], fill=(0, 255, 255, 100), width=1)
         
-        img.save(os.path.join(self.output_dir, 'enemy_stealth.png'))
+        self.save_image(img, 'enemy_stealth.png')
         
         # 蜂群敌人（小型）
         size = 25
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         center = size // 2
         # 六边形身体
         hex_img = self.create_hex_pattern(size, '#32cd32', '#7fff00')
         img.paste(hex_img, (0, 0), hex_img)
         
-        img.save(os.path.join(self.output_dir, 'enemy_swarm.png'))
+        self.save_image(img, 'enemy_swarm.png')
         
         # Boss敌人 - 多形态
         self.create_boss_enemies()
@@ -491,8 +922,8 @@ class SuperGameAssetGenerator:
         """创建Boss敌人"""
         # Boss 1: 机械要塞
         size = 120
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         center = size // 2
         
@@ -514,12 +945,12 @@ class SuperGameAssetGenerator:
         draw.ellipse([center-15, size-25, center+15, size-10], 
                     fill='#ff4500', outline='#ffd700', width=2)
         
-        img.save(os.path.join(self.output_dir, 'boss_fortress.png'))
+        self.save_image(img, 'boss_fortress.png')
         
         # Boss 2: 有机体
         size = 100
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         center = size // 2
         
@@ -549,35 +980,35 @@ class SuperGameAssetGenerator:
         draw.ellipse([center-12, center-12, center+12, center+12], fill='#ff0000')
         draw.ellipse([center-6, center-6, center+6, center+6], fill='#000000')
         
-        img.save(os.path.join(self.output_dir, 'boss_organic.png'))
+        self.save_image(img, 'boss_organic.png')
     
     def create_advanced_weapons(self):
         """创建高级武器效果"""
         # 等离子炮
         width, height = 30, 8
-        img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (width, height), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         # 能量核心
         draw.ellipse([0, 2, 8, 6], fill='#00ffff')
         draw.rectangle([8, 3, width-5, 5], fill='#87ceeb')
         draw.ellipse([width-8, 1, width, 7], fill='#4169e1')
         
-        img.save(os.path.join(self.output_dir, 'weapon_plasma.png'))
+        self.save_image(img, 'weapon_plasma.png')
         
         # 散弹枪弹丸
         size = 6
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         draw.ellipse([0, 0, size, size], fill='#ffd700', outline='#ff8c00')
         
-        img.save(os.path.join(self.output_dir, 'bullet_shotgun.png'))
+        self.save_image(img, 'bullet_shotgun.png')
         
         # 导弹
         width, height = 20, 40
-        img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (width, height), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         # 弹头
         draw.ellipse([5, 0, 15, 10], fill='#ff4500')
@@ -587,51 +1018,31 @@ class SuperGameAssetGenerator:
         draw.polygon([(2, 25), (6, 30), (6, 35), (2, 40)], fill='#8b0000')
         draw.polygon([(14, 30), (18, 25), (18, 40), (14, 35)], fill='#8b0000')
         
-        img.save(os.path.join(self.output_dir, 'weapon_missile.png'))
+        self.save_image(img, 'weapon_missile.png')
         
         # 能量波
         width, height = 60, 20
-        img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (width, height), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         # 波形效果
         for x in range(0, width, 2):
             wave_height = int(5 * math.sin(x * 0.3) + 10)
             draw.line([(x, wave_height-5), (x, wave_height+5)], fill='#ffff00', width=2)
         
-        img.save(os.path.join(self.output_dir, 'weapon_wave.png'))
+        self.save_image(img, 'weapon_wave.png')
     
     def create_environmental_hazards(self):
         """创建环境危险"""
-        # 流星
+        # 流星: 不规则岩石形状与表面细节
         size = 35
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        # 不规则岩石形状
-        meteor_points = []
-        center = size // 2
-        for i in range(8):
-            angle = i * self.pi2 / 8
-            radius = center - 5 + random.randint(-3, 3)
-            x = center + radius * math.cos(angle)
-            y = center + radius * math.sin(angle)
-            meteor_points.append((x, y))
-        
-        draw.polygon(meteor_points, fill='#8b4513', outline='#a0522d', width=2)
-        
-        # 表面细节
-        for _ in range(5):
-            x, y = random.randint(8, size-8), random.randint(8, size-8)
-            draw.ellipse([x-2, y-2, x+2, y+2], fill='#654321')
-        
-        img.save(os.path.join(self.output_dir, 'hazard_meteor.png'))
+        radius_offsets = [self.rng.randint(-3, 3) for _ in range(8)]
+        craters = [(self.rng.randint(8, size-8), self.rng.randint(8, size-8)) for _ in range(5)]
+        self.save_image(self.render_meteor(size, radius_offsets, craters), 'hazard_meteor.png')
         
         # 黑洞
         size = 80
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
+        canvas = self.new_canvas(size, size)
         center = size // 2
         
         # 吸积盘
@@ -639,71 +1050,97 @@ class SuperGameAssetGenerator:
             radius = center - i * 3
             alpha = 255 - i * 25
             color = (128, 0, 128, alpha) if i % 2 == 0 else (75, 0, 130, alpha)
-            draw.ellipse([center-radius, center-radius, center+radius, center+radius], 
-                        outline=color, width=2)
+            canvas.ring(center, center, radius, color, width=2)
         
         # 事件视界
-        draw.ellipse([center-8, center-8, center+8, center+8], fill='#000000')
+        canvas.disc(center, center, 8, '#000000')
         
-        img.save(os.path.join(self.output_dir, 'hazard_blackhole.png'))
+        self.save_image(canvas.to_image(), 'hazard_blackhole.png')
         
         # 能量场
         size = 60
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         center = size // 2
         
         # 电弧效果
         lightning = self.create_lightning_bolt(size, size, '#00ffff')
-        img = Image.alpha_composite(img, lightning)
+        img = self.alpha_composite(img, lightning)
         
         # 外围能量环
         draw.ellipse([5, 5, size-5, size-5], outline='#87ceeb', width=2)
         
-        img.save(os.path.join(self.output_dir, 'hazard_energyfield.png'))
+        self.save_image(img, 'hazard_energyfield.png')
+    
+    def render_meteor(self, size, radius_offsets, craters):
+        """按给定的8个顶点半径偏移和陨坑位置绘制流星"""
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
+        
+        # 不规则岩石形状
+        meteor_points = []
+        center = size // 2
+        for i, offset in enumerate(radius_offsets):
+            angle = i * self.pi2 / 8
+            radius = center - 5 + offset
+            x = center + radius * math.cos(angle)
+            y = center + radius * math.sin(angle)
+            meteor_points.append((x, y))
+        
+        draw.polygon(meteor_points, fill='#8b4513', outline='#a0522d', width=2)
+        
+        # 表面细节
+        for x, y in craters:
+            draw.ellipse([x-2, y-2, x+2, y+2], fill='#654321')
+        
+        return img
     
     def create_collectibles(self):
         """创建收集品"""
         # 经验宝石
-        colors = ['#ff0000', '#00ff00', '#0000ff', '#ffff00', '#ff00ff']
-        sizes = [15, 20, 25, 30, 35]
+        for i, (color, size) in enumerate(zip(self.XP_GEM_COLORS, self.XP_GEM_SIZES)):
+            self.create_xp_gem(i, color, size)
         
-        for i, (color, size) in enumerate(zip(colors, sizes)):
-            img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-            
-            center = size // 2
-            
-            # 宝石主体
-            gem_points = []
-            for j in range(6):
-                angle = j * self.pi2 / 6
-                radius = center - 3
-                x = center + radius * math.cos(angle)
-                y = center + radius * math.sin(angle)
-                gem_points.append((x, y))
-            
-            draw.polygon(gem_points, fill=color, outline='#ffffff', width=1)
-            
-            # 内部反光
-            inner_points = []
-            for j in range(6):
-                angle = j * self.pi2 / 6
-                radius = (center - 3) * 0.6
-                x = center + radius * math.cos(angle)
-                y = center + radius * math.sin(angle)
-                inner_points.append((x, y))
-            
-            lighter_color = tuple(min(255, c + 50) for c in ImageDraw.ImageColor.getrgb(color))
-            draw.polygon(inner_points, fill=lighter_color)
-            
-            img.save(os.path.join(self.output_dir, f'gem_xp_{i+1}.png'))
+        self.create_coin()
+    
+    def create_xp_gem(self, i, color, size):
+        """创建单个经验宝石"""
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
-        # 金币
+        center = size // 2
+        
+        # 宝石主体
+        gem_points = []
+        for j in range(6):
+            angle = j * self.pi2 / 6
+            radius = center - 3
+            x = center + radius * math.cos(angle)
+            y = center + radius * math.sin(angle)
+            gem_points.append((x, y))
+        
+        draw.polygon(gem_points, fill=color, outline='#ffffff', width=1)
+        
+        # 内部反光
+        inner_points = []
+        for j in range(6):
+            angle = j * self.pi2 / 6
+            radius = (center - 3) * 0.6
+            x = center + radius * math.cos(angle)
+            y = center + radius * math.sin(angle)
+            inner_points.append((x, y))
+        
+        lighter_color = tuple(min(255, c + 50) for c in ImageDraw.ImageColor.getrgb(color))
+        draw.polygon(inner_points, fill=lighter_color)
+        
+        self.save_image(img, f'gem_xp_{i+1}.png')
+    
+    def create_coin(self):
+        """创建金币"""
         size = 20
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         center = size // 2
         draw.ellipse([2, 2, size-2, size-2], fill='#ffd700', outline='#ffb347', width=2)
@@ -712,14 +1149,14 @@ class SuperGameAssetGenerator:
         # $ 符号
         draw.text((center-3, center-4), '$', fill='#ff8c00', font=None)
         
-        img.save(os.path.join(self.output_dir, 'coin.png'))
+        self.save_image(img, 'coin.png')
     
     def create_ui_decorations(self):
         """创建UI装饰元素"""
         # 边框装饰
         width, height = 200, 20
-        img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (width, height), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         # 科技感边框
         draw.rectangle([0, 0, width-1, height-1], outline='#00ffff', width=2)
@@ -730,12 +1167,12 @@ class SuperGameAssetGenerator:
             color = (0, 255, 255, alpha)
             draw.line([(i, 2), (i, height-2)], fill=color)
         
-        img.save(os.path.join(self.output_dir, 'ui_border.png'))
+        self.save_image(img, 'ui_border.png')
         
         # 雷达图标
         size = 40
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        img = self.new_image('RGBA', (size, size), (0, 0, 0, 0))
+        draw = self.new_draw(img)
         
         center = size // 2
         
@@ -749,78 +1186,517 @@ class SuperGameAssetGenerator:
         draw.line([(center, center), (center + center-5, center)], fill='#00ff00', width=2)
         draw.line([(center, center), (center, 5)], fill='#00ff00', width=2)
         
-        img.save(os.path.join(self.output_dir, 'ui_radar.png'))
+        self.save_image(img, 'ui_radar.png')
     
     def create_combo_effects(self):
         """创建连击效果"""
         # 连击数字背景
-        for combo in range(1, 11):
-            size = 40 + combo * 5
-            img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-            
-            center = size // 2
-            
-            # 发光环
-            color_intensity = min(255, 100 + combo * 15)
-            glow_color = (255, color_intensity, 0, 150)
-            
-            for i in range(5):
-                radius = center - i * 3
-                alpha = 150 - i * 30
-                draw.ellipse([center-radius, center-radius, center+radius, center+radius], 
-                           outline=(*glow_color[:3], alpha), width=2)
-            
-            img.save(os.path.join(self.output_dir, f'combo_bg_{combo}.png'))
+        for combo in range(1, self.COMBO_LEVELS + 1):
+            self.create_combo_bg(combo)
     
-    def generate_all_assets(self):
-        """生成所有增强版资源"""
-        print("=== 正在生成超级增强版游戏资源 ===")
-        
-        print("- 创建玩家飞船...")
-        self.create_player_ship()
-        
-        print("- 创建基础敌人...")
-        self.create_enemy_ships()
-        
-        print("- 创建高级敌人...")
-        self.create_advanced_enemies()
-        
-        print("- 创建子弹系统...")
-        self.create_bullets()
-        
-        print("- 创建高级武器...")
-        self.create_advanced_weapons()
-        
-        print("- 创建爆炸效果...")
-        self.create_explosions()
-        
-        print("- 创建背景星空...")
-        self.create_background_stars()
-        
-        print("- 创建UI元素...")
-        self.create_ui_elements()
-        
-        print("- 创建UI装饰...")
-        self.create_ui_decorations()
-        
-        print("- 创建道具...")
-        self.create_power_ups()
-        
-        print("- 创建收集品...")
-        self.create_collectibles()
+    def create_combo_bg(self, combo):
+        """创建单个连击数字背景"""
+        size = 40 + combo * 5
+        canvas = self.new_canvas(size, size)
+        center = size // 2
         
-        print("- 创建粒子效果...")
-        self.create_particle_effects()
+        # 发光环
+        color_intensity = min(255, 100 + combo * 15)
+        glow_color = (255, color_intensity, 0, 150)
         
-        print("- 创建环境危险...")
-        self.create_environmental_hazards()
+        for i in range(5):
+            radius = center - i * 3
+            alpha = 150 - i * 30
+            canvas.ring(center, center, radius, (*glow_color[:3], alpha), width=2)
         
-        print("- 创建连击效果...")
-        self.create_combo_effects()
+        self.save_image(canvas.to_image(), f'combo_bg_{combo}.png')
+    
+    @staticmethod
+    def pool_name(name):
+        """变体表文件名: pool_meteor.png"""
+        return f'pool_{name}.png'
+    
+    @classmethod
+    def pool_columns(cls, name):
+        """变体表列数: 不超过 POOL_COLUMNS 且为帧数的整数倍，同一变体的各帧位于同一行"""
+        frames = cls.VARIANT_POOLS[name][2]
+        return max(1, cls.POOL_COLUMNS // frames) * frames
+    
+    def create_variant_pools(self):
+        """创建全部随机变体池"""
+        for name in self.VARIANT_POOLS:
+            self.create_variant_pool(name)
+    
+    def create_variant_pool(self, name):
+        """一次生成某种随机资源的 pool_size 个变体并排成一张变体表
+        
+        所有变体的随机参数由 NumPy 按 (变体, 参数) 批量抽取，再用与单个精灵相同的
+        render_* 方法逐格绘制。第 v 个变体的第 f 帧是第 i = v * frames + f 格，
+        位于 (i % columns, i // columns)。
+        """
+        width, height, frames = self.VARIANT_POOLS[name]
+        rng = np.random.default_rng(self.rng.getrandbits(64))
+        count = self.pool_size
+        
+        if name == 'meteor':
+            cells = self.meteor_pool(rng, count, width)
+        elif name == 'lightning':
+            cells = self.lightning_pool(rng, count, width, height)
+        elif name == 'engine_flame':
+            cells = self.engine_flame_pool(rng, count, frames)
+        else:
+            raise ValueError(f"未知的变体池: {name}")
+        
+        columns = self.pool_columns(name)
+        rows = math.ceil(len(cells) / columns)
+        sheet = self.new_image('RGBA', (width * columns, height * rows), (0, 0, 0, 0))
+        for i, cell in enumerate(cells):
+            self.paste(sheet, cell, ((i % columns) * width, (i // columns) * height))
+        self.save_image(sheet, self.pool_name(name))
+    
+    def meteor_pool(self, rng, count, size):
+        """流星变体: 与 hazard_meteor.png 相同的半径偏移与陨坑分布"""
+        radius_offsets = rng.integers(-3, 4, (count, 8)).tolist()
+        craters = rng.integers(8, size - 7, (count, 5, 2)).tolist()
+        return [self.render_meteor(size, offsets, holes) for offsets, holes in zip(radius_offsets, craters)]
+    
+    def lightning_pool(self, rng, count, width, height):
+        """闪电变体: 所有变体的随机游走按步同时推进
+        
+        每步至少下降10像素，ceil(height / 10) 步后所有路径都已到达底部；
+        每条路径截取到第一次 y >= height 的点，与 create_lightning_bolt 的循环一致。
+        """
+        steps = math.ceil(height / 10)
+        ys = np.cumsum(rng.integers(10, 21, (count, steps)), axis=1)
+        dx = rng.integers(-15, 16, (count, steps))
+        xs = np.empty_like(dx)
+        x = np.full(count, width // 4)
+        for step in range(steps):
+            x = np.clip(x + dx[:, step], 5, width - 5)
+            xs[:, step] = x
+        lengths = np.argmax(ys >= height, axis=1) + 1
+        
+        # 分支与主路径点一一对应（下标含起点），只取奇数点
+        has_branch = rng.random((count, steps + 1)) < 0.6
+        branch_dx = rng.integers(-20, 21, (count, steps + 1))
+        branch_dy = rng.integers(-10, 11, (count, steps + 1))
+        
+        cells = []
+        for v in range(count):
+            n = int(lengths[v])
+            points = [(width//4, 0)] + list(zip(xs[v, :n].tolist(), ys[v, :n].tolist()))
+            branches = [(i, (points[i][0] + int(branch_dx[v, i]), points[i][1] + int(branch_dy[v, i])))
+                        for i in range(1, len(points)-1, 2) if has_branch[v, i]]
+            cells.append(self.render_lightning(width, height, '#00ffff', points, branches))
+        return cells
+    
+    def engine_flame_pool(self, rng, count, frames):
+        """尾焰变体: 每个变体是完整的 frames 帧序列"""
+        offsets = rng.integers([-3, -5, -2], [4, 6, 3], (count, frames, 3)).tolist()
+        return [self.render_engine_flame(frame, offsets[v][frame])
+                for v in range(count) for frame in range(frames)]
+    
+    def build_pool_index(self):
+        """变体池索引: 第 v 个变体的第 f 帧位于第 (v * frames + f) 格，按 columns 列排布"""
+        return {name: {'sheet': self.pool_name(name), 'variants': self.pool_size, 'frames': frames,
+                       'columns': self.pool_columns(name), 'cell': [width, height]}
+                for name, (width, height, frames) in sorted(self.VARIANT_POOLS.items())}
+    
+    def build_tasks(self):
+        """构建相互独立的生成任务列表: (步骤说明, 任务名, 方法名, 参数, 输出文件名列表)
+        
+        逐帧循环（爆炸帧、连击背景、经验宝石）拆分为单帧任务，随机变体池每个池一个任务，便于并行。
+        """
+        tasks = []
+        for description, method_name in self.GENERATION_STEPS:
+            if method_name == 'create_explosions':
+                for frame in range(self.EXPLOSION_FRAMES):
+                    tasks.append((description, f'explosion_{frame}', 'create_explosion_frame', (frame,),
+                                  [f'explosion_{frame}.png']))
+            elif method_name == 'create_combo_effects':
+                for combo in range(1, self.COMBO_LEVELS + 1):
+                    tasks.append((description, f'combo_bg_{combo}', 'create_combo_bg', (combo,),
+                                  [f'combo_bg_{combo}.png']))
+            elif method_name == 'create_background_stars':
+                for suffix, width, height, scale in self.BACKGROUND_VARIANTS:
+                    tiles = [name for row in self.background_tiles(suffix, width, height) for name in row]
+                    tasks.append((description, f'background_stars{suffix}', 'create_starfield_background',
+                                  (suffix, width, height, scale), tiles + [f'background_stars{suffix}.json']))
+                tasks.append((description, 'parallax_layers', 'create_parallax_layers', (),
+                              [f'parallax_layer_{i}.png' for i in range(len(self.PARALLAX_LAYERS))]
+                              + ['parallax.json']))
+            elif method_name == 'create_collectibles':
+                for i, (color, size) in enumerate(zip(self.XP_GEM_COLORS, self.XP_GEM_SIZES)):
+                    tasks.append((description, f'gem_xp_{i+1}', 'create_xp_gem', (i, color, size),
+                                  [f'gem_xp_{i+1}.png']))
+                tasks.append((description, 'coin', 'create_coin', (), ['coin.png']))
+            elif method_name == 'create_variant_pools':
+                if self.pool_size:
+                    for name in self.VARIANT_POOLS:
+                        tasks.append((description, f'pool_{name}', 'create_variant_pool', (name,),
+                                      [self.pool_name(name)]))
+            else:
+                tasks.append((description, method_name[len('create_'):], method_name, (),
+                              list(self.STEP_OUTPUTS[method_name])))
+        
+        # 需要发光的精灵同时输出发光变体
+        tasks = [(description, task_name, method_name, args,
+                  outputs + [self.glow_name(name) for name in outputs if name in self.GLOW_SPRITES])
+                 for description, task_name, method_name, args, outputs in tasks]
+        
+        # 方向性精灵同时输出预旋转帧表
+        if self.rotations:
+            tasks = [(description, task_name, method_name, args,
+                      outputs + [self.rotation_name(name) for name in outputs if name in self.ROTATION_SPRITES])
+                     for description, task_name, method_name, args, outputs in tasks]
+        
+        # 敌人精灵同时输出各调色板的换色变体
+        tasks = [(description, task_name, method_name, args,
+                  outputs + [self.palette_name(name, palette) for name in outputs if name in self.PALETTE_SPRITES
+                             for palette in self.palettes])
+                 for description, task_name, method_name, args, outputs in tasks]
+        
+        # 多分辨率输出时，精灵任务的每个输出都有各比例的变体
+        tasks = [(description, task_name, method_name, args,
+                  outputs if method_name in self.SINGLE_SCALE_METHODS
+                  else [variant_name(name, s) for name in outputs for s in self.scales])
+                 for description, task_name, method_name, args, outputs in tasks]
+        
+        # 每张图像同时输出各现代格式的变体
+        return [(description, task_name, method_name, args,
+                 outputs + [format_name(name, fmt) for name in outputs if name.endswith(IMAGE_EXTENSIONS)
+                            for fmt in self.formats])
+                for description, task_name, method_name, args, outputs in tasks]
+    
+    def task_seed(self, task_name):
+        """按任务名派生的随机种子"""
+        return zlib.crc32(f'{self.seed}:{task_name}'.encode('utf-8'))
+    
+    def task_rng(self, task_name):
+        """为单个任务创建独立播种的随机数生成器"""
+        return random.Random(self.task_seed(task_name))
+    
+    def method_source(self, method_name, _seen=None):
+        """获取方法源码，连同其通过 self.xxx() 调用的其他方法"""
+        seen = set() if _seen is None else _seen
+        if method_name in seen:
+            return ''
+        seen.add(method_name)
+        source = function_source(getattr(type(self), method_name))
+        parts = [source]
+        for callee in sorted(set(re.findall(r'self\.(\w+)\(', source))):
+            if inspect.isfunction(getattr(type(self), callee, None)):
+                parts.append(self.method_source(callee, seen))
+        return ''.join(parts)
+    
+    @classmethod
+    def constants_digest(cls):
+        """类常量表（精灵尺寸、旋转、变体池、调色板等）的哈希"""
+        constants = {name: getattr(cls, name) for name in dir(cls) if name.isupper()}
+        return hashlib.sha256(repr(sorted(constants.items())).encode('utf-8')).hexdigest()
+    
+    def task_key(self, task_name, method_name, args=()):
+        """任务缓存键: 生成方法源码、渲染模块源码、类常量、参数与随机种子的哈希
+        
+        同时用作按需生成资源的指纹版本，任何影响输出字节的改动都必须改变它。
+        """
+        payload = json.dumps({
+            'source': hashlib.sha256(self.method_source(method_name).encode('utf-8')).hexdigest(),
+            'modules': render_modules_digest(),
+            'constants': self.constants_digest(),
+            'args': repr(args),
+            'seed': self.task_seed(task_name),
+            'scale': self.scale,
+            'scales': self.scales,
+            'glow': {name: self.GLOW_SPRITES[name] for name in self.STEP_OUTPUTS.get(method_name, [])
+                     if name in self.GLOW_SPRITES},
+            'rotations': self.rotations,
+            'pool_size': self.pool_size,
+            'encoding': ENCODING_VERSION,
+            'formats': self.formats,
+            'palettes': {palette: self.COLOR_PALETTES[palette] for palette in self.palettes
+                         if any(name in self.PALETTE_SPRITES for name in self.STEP_OUTPUTS.get(method_name, []))},
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def load_manifest(self):
+        """读取增量构建清单，不存在或格式不符时返回空清单"""
+        try:
+            manifest = json.loads(self.sink.read(MANIFEST_NAME).decode('utf-8'))
+        except (OSError, KeyError, ValueError):
+            return {}
+        if manifest.get('version') != MANIFEST_VERSION:
+            return {}
+        return manifest.get('tasks', {})
+    
+    def save_manifest(self, entries):
+        """写入增量构建清单"""
+        data = json.dumps({'version': MANIFEST_VERSION, 'tasks': entries}, indent=2, sort_keys=True)
+        self.sink.write(MANIFEST_NAME, data.encode('utf-8'))
+    
+    def is_fresh(self, entry, key):
+        """清单记录的键未变且输出文件都存在时，资源无需重新生成"""
+        if not entry or entry.get('key') != key:
+            return False
+        return all(self.sink.exists(name) for name in entry.get('outputs', []))
+    
+    def run_task(self, task_name, method_name, args=(), outputs=None):
+        """执行单个生成任务，返回写出的文件名列表
+        
+        失败或实际输出与声明的 outputs 不一致时抛出带资源名的 AssetGenerationError。
+        """
+        self.rng = self.task_rng(task_name)
+        self.written_files = []
+        try:
+            getattr(self, method_name)(*args)
+        except Exception as e:
+            raise AssetGenerationError(f"资源 {task_name} 生成失败 ({method_name}): {e}") from e
+        if outputs is not None and sorted(self.written_files) != sorted(outputs):
+            raise AssetGenerationError(
+                f"资源 {task_name} 的输出 {self.written_files} 与声明的 {list(outputs)} 不一致")
+        return list(self.written_files)
+    
+    @classmethod
+    def is_atlas_sprite(cls, name):
+        """是否打包进纹理图集: 1x 的 PNG 精灵，不含可平铺图层、变体表、发光变体和换色变体
+        （后两者由 JS 作为单独的图片绘制）"""
+        return (name.endswith('.png') and '@' not in name and not name.startswith(cls.ATLAS_EXCLUDE_PREFIXES)
+                and not re.search(r'_rot\d+\.png$', name) and not name.endswith('_glow.png')
+                and not cls.is_palette_variant(name))
+    
+    def build_atlas(self, entries):
+        """把所有生成的PNG精灵打包成纹理图集"""
+        sprites = [name for entry in entries.values() for name in entry['outputs']
+                   if self.is_atlas_sprite(name)]
+        return TextureAtlasPacker(self.sink).pack(sprites)
+    
+    @classmethod
+    def is_collision_sprite(cls, name):
+        """是否导出碰撞形状: 可碰撞的 1x 精灵（图集精灵已不含发光变体和换色变体，形状与原精灵相同）"""
+        return cls.is_atlas_sprite(name) and name.startswith(cls.COLLISION_PREFIXES)
+    
+    def build_collision_shapes(self, entries):
+        """从精灵 alpha 通道计算凸包、子圆和位掩码"""
+        sprites = [name for entry in entries.values() for name in entry['outputs']
+                   if self.is_collision_sprite(name)]
+        return CollisionShapeBuilder(self.sink).build(sprites)
+    
+    @staticmethod
+    def build_variant_manifest(names, scales):
+        """多分辨率变体清单: 以 1x 文件名为键列出各比例的文件
+        
+        客户端按 devicePixelRatio 选择不小于它的最小比例，没有时取最大比例。
+        """
+        names = set(names)
+        sprites = {}
+        for name in sorted(names):
+            if '@' in name or is_modern_variant(name):
+                continue
+            variants = {str(s): variant_name(name, s) for s in scales if variant_name(name, s) in names}
+            if len(variants) > 1:
+                sprites[name] = variants
+        return {'scales': list(scales), 'sprites': sprites}
+    
+    def output_sizes(self, entries):
+        """全部输出文件（任务输出、图集页与各 JSON 清单）的字节数"""
+        names = {name for entry in entries.values() for name in entry['outputs']}
+        names.update(name for name in (ATLAS_JSON_NAME, COLLISION_JSON_NAME, VARIANTS_JSON_NAME, GLOWS_JSON_NAME,
+                                       ROTATIONS_JSON_NAME, POOLS_JSON_NAME, PALETTES_JSON_NAME)
+                     if self.sink.exists(name))
+        if ATLAS_JSON_NAME in names:
+            atlas = json.loads(self.sink.read(ATLAS_JSON_NAME).decode('utf-8'))
+            names.update(sheet['image'] for sheet in atlas['meta']['sheets'])
+        return {name: len(self.sink.read(name)) for name in sorted(names)}
+    
+    def generate_all_assets(self, jobs=1, force=False, atlas=True, budget=None, asset_budget=None,
+                            size_report=False):
+        """生成所有增强版资源
+        
+        jobs > 1 时使用进程池并行生成，输出与串行生成完全一致。
+        根据输出目录中的清单跳过缓存键未变化的资源；force=True 时全部重新生成。
+        atlas=True 时在有资源更新后重新打包纹理图集。
+        不支持增量构建的输出目标（内存、归档）总是完整生成，也不写清单。
+        最后打印体积报告（size_report=True 时列出全部资源），总体积超过 budget 或
+        单个文件超过 asset_budget（字节）时抛出 AssetGenerationError。
+        """
+        print("=== 正在生成超级增强版游戏资源 ===")
         
-        print("=== 所有超级游戏资源生成完成！共生成了 100+ 个资源文件！ ===")
+        incremental = self.sink.incremental
+        manifest = self.load_manifest() if incremental and not force else {}
+        entries = {}
+        stale = []
+        for description, task_name, method_name, args, outputs in self.build_tasks():
+            key = self.task_key(task_name, method_name, args)
+            if self.is_fresh(manifest.get(task_name), key):
+                entries[task_name] = manifest[task_name]
+            else:
+                stale.append((description, task_name, method_name, args, outputs, key))
+        
+        skipped = len(entries)
+        if skipped:
+            print(f"- 跳过 {skipped} 个未变化的资源任务")
+        
+        try:
+            if jobs <= 1:
+                current_step = None
+                for description, task_name, method_name, args, outputs, key in stale:
+                    if description != current_step:
+                        print(f"- {description}...")
+                        current_step = description
+                    outputs = self.run_task(task_name, method_name, args, outputs)
+                    entries[task_name] = {'key': key, 'outputs': outputs}
+            elif stale:
+                print(f"- 使用 {jobs} 个进程并行生成 {len(stale)} 个任务...")
+                with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                         initargs=(self.seed, self.scale, self.scales, self.rotations,
+                                                   self.pool_size, self.palettes, self.formats)) as executor:
+                    futures = {executor.submit(_run_worker_task, task_name, method_name, args, outputs): (task_name, key)
+                               for _, task_name, method_name, args, outputs, key in stale}
+                    try:
+                        for future in as_completed(futures):
+                            task_name, key = futures[future]
+                            # 工作进程只返回编码后的字节，统一由主进程写入输出目标
+                            outputs = []
+                            for name, data in future.result():
+                                self.sink.write(name, data)
+                                outputs.append(name)
+                            entries[task_name] = {'key': key, 'outputs': outputs}
+                    except BaseException:
+                        for pending in futures:
+                            pending.cancel()
+                        raise
+        finally:
+            # 失败时也记录已完成的任务，下次只需重做剩余部分
+            if incremental:
+                self.save_manifest(entries)
+        
+        if atlas and (stale or not self.sink.exists(ATLAS_JSON_NAME)):
+            print("- 打包纹理图集...")
+            written = self.build_atlas(entries)
+            print(f"  图集文件: {', '.join(written)}")
+        
+        if stale or not self.sink.exists(COLLISION_JSON_NAME):
+            print("- 计算碰撞形状...")
+            self.build_collision_shapes(entries)
+        
+        if self.multiscale and (stale or not self.sink.exists(VARIANTS_JSON_NAME)):
+            print(f"- 写出多分辨率变体清单 ({'/'.join(f'@{s}x' for s in self.scales)})...")
+            names = [name for entry in entries.values() for name in entry['outputs']]
+            variants = self.build_variant_manifest(names, self.scales)
+            self.sink.write(VARIANTS_JSON_NAME, json.dumps(variants, indent=2).encode('utf-8'))
+        
+        if stale or not self.sink.exists(GLOWS_JSON_NAME):
+            glows = self.build_glow_manifest()
+            self.sink.write(GLOWS_JSON_NAME, json.dumps(glows, indent=2).encode('utf-8'))
+        
+        if self.rotations and (stale or not self.sink.exists(ROTATIONS_JSON_NAME)):
+            index = self.build_rotation_index()
+            self.sink.write(ROTATIONS_JSON_NAME, json.dumps(index, indent=2).encode('utf-8'))
+        
+        if self.pool_size and (stale or not self.sink.exists(POOLS_JSON_NAME)):
+            pools = self.build_pool_index()
+            self.sink.write(POOLS_JSON_NAME, json.dumps(pools, indent=2).encode('utf-8'))
+        
+        if self.palettes and (stale or not self.sink.exists(PALETTES_JSON_NAME)):
+            palettes = self.build_palette_manifest()
+            self.sink.write(PALETTES_JSON_NAME, json.dumps(palettes, indent=2).encode('utf-8'))
+        
+        print("- 资源体积报告:")
+        report = SizeReport(self.output_sizes(entries), self.formats)
+        report.print(top=None if size_report else 10)
+        
+        print(f"=== 所有超级游戏资源生成完成！重新生成 {len(stale)} 个任务，跳过 {skipped} 个 ===")
+        
+        problems = report.violations(budget, asset_budget)
+        if problems:
+            raise AssetGenerationError("资源体积超出预算:\n" + '\n'.join(f"   - {line}" for line in problems))
+
+
+# 进程池工作进程内的生成器实例
+_worker_generator = None
+
+
+def _init_worker(seed, scale, scales, rotations, pool_size, palettes, formats):
+    """进程池初始化: 每个工作进程创建一个输出到内存的生成器"""
+    global _worker_generator
+    _worker_generator = SuperGameAssetGenerator(seed=seed, sink=MemorySink(), scale=scale, scales=scales,
+                                                rotations=rotations, pool_size=pool_size, palettes=palettes,
+                                                formats=formats)
+
+
+def _run_worker_task(task_name, method_name, args, outputs):
+    """在工作进程中执行单个生成任务，返回 [(文件名, 字节), ...]"""
+    outputs = _worker_generator.run_task(task_name, method_name, args, outputs)
+    files = _worker_generator.sink.files
+    return [(name, files.pop(name)) for name in outputs]
+
+
+def generate_assets_to_memory(seed=DEFAULT_SEED, jobs=1, atlas=True, scales=DEFAULT_SCALES,
+                              rotations=DEFAULT_ROTATIONS, pool_size=DEFAULT_POOL_SIZE,
+                              palettes=tuple(SuperGameAssetGenerator.COLOR_PALETTES), formats=()):
+    """在内存中生成全部资源，返回 {文件名: 字节}"""
+    sink = MemorySink()
+    generator = SuperGameAssetGenerator(seed=seed, sink=sink, scales=scales, rotations=rotations,
+                                        pool_size=pool_size, palettes=palettes, formats=formats)
+    generator.generate_all_assets(jobs=jobs, atlas=atlas)
+    return sink.files
+
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="超级太空射击游戏资源生成器")
+    parser.add_argument('-o', '--output', default="../assets/images",
+                        help="资源输出目录 (默认: ../assets/images)")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="并行生成的进程数 (默认: 1, 即串行)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help=f"随机种子 (默认: {DEFAULT_SEED})")
+    parser.add_argument('-f', '--force', action='store_true',
+                        help="忽略增量构建清单，重新生成所有资源")
+    parser.add_argument('--no-atlas', dest='atlas', action='store_false',
+                        help="不打包纹理图集")
+    parser.add_argument('--archive', metavar='PATH',
+                        help="直接写入 .zip/.tar 归档而不是输出目录")
+    parser.add_argument('--scales', default=','.join(str(s) for s in DEFAULT_SCALES),
+                        help="精灵输出比例，逗号分隔 (默认: 1,2,4)")
+    parser.add_argument('--rotations', type=int, default=DEFAULT_ROTATIONS, choices=ROTATION_CHOICES,
+                        help=f"方向性精灵的预旋转帧数，0 不生成 (默认: {DEFAULT_ROTATIONS})")
+    parser.add_argument('--pool-size', type=int, default=DEFAULT_POOL_SIZE,
+                        help=f"流星、闪电、尾焰等随机资源的变体数，0 不生成变体池 (默认: {DEFAULT_POOL_SIZE})")
+    parser.add_argument('--palettes', default=','.join(SuperGameAssetGenerator.COLOR_PALETTES),
+                        help="为敌人精灵输出换色变体的调色板，逗号分隔，留空不生成 (默认: 全部)")
+    parser.add_argument('--formats', default=','.join(supported_formats()),
+                        help="额外输出的现代图像格式，逗号分隔，留空不输出 "
+                             f"(默认: 当前 Pillow 支持的 {','.join(supported_formats()) or '无'})")
+    parser.add_argument('--budget', type=parse_size, metavar='SIZE',
+                        help="原格式资源总体积上限，如 8M；超出时构建失败")
+    parser.add_argument('--asset-budget', type=parse_size, metavar='SIZE',
+                        help="单个输出文件的体积上限，如 512K；超出时构建失败")
+    parser.add_argument('--size-report', action='store_true',
+                        help="体积报告列出全部资源（默认只列出最大的10个）")
+    args = parser.parse_args(argv)
+    args.scales = tuple(int(s) for s in args.scales.split(','))
+    args.palettes = tuple(p for p in args.palettes.split(',') if p)
+    unknown = [p for p in args.palettes if p not in SuperGameAssetGenerator.COLOR_PALETTES]
+    if unknown:
+        parser.error(f"未知的调色板: {', '.join(unknown)}（可选: {', '.join(SuperGameAssetGenerator.COLOR_PALETTES)}）")
+    args.formats = tuple(f for f in args.formats.split(',') if f)
+    unsupported = [f for f in args.formats if f not in supported_formats()]
+    if unsupported:
+        parser.error(f"当前 Pillow 不支持编码: {', '.join(unsupported)}")
+    return args
+
 
 if __name__ == "__main__":
-    generator = SuperGameAssetGenerator()
-    generator.generate_all_assets()
+    args = parse_args()
+    sink = open_archive_sink(args.archive) if args.archive else DiskSink(args.output)
+    generator = SuperGameAssetGenerator(args.output, seed=args.seed, sink=sink, scales=args.scales,
+                                        rotations=args.rotations, pool_size=args.pool_size, palettes=args.palettes,
+                                        formats=args.formats)
+    try:
+        with sink:
+            generator.generate_all_assets(jobs=args.jobs, force=args.force, atlas=args.atlas, budget=args.budget,
+                                          asset_budget=args.asset_budget, size_report=args.size_report)
+    except AssetGenerationError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
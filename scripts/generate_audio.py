@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+离线音效合成器
+用 NumPy 按 js/audio.js 与 js/enhanced-audio.js 中相同的公式预先合成全部音效，
+再合成4首可无缝循环的Boss主题音乐，输出16位 WAV 和 sounds.json 清单。
+客户端启动时只需解码一次，播放时不再搭建任何合成图。
+"""
+
+import io
+import sys
+import json
+import wave
+import zlib
+import argparse
+
+import numpy as np
+
+from asset_sinks import DiskSink, open_archive_sink
+from generate_assets import DEFAULT_SEED
+
+DEFAULT_SAMPLE_RATE = 44100
+SOUNDS_JSON_NAME = 'sounds.json'
+SOUNDS_VERSION = 1
+
+
+class SuperGameAudioGenerator:
+    # 音效: (名称, 文件名, 合成方法, 参数)，名称与 AudioManager.generatedSounds 的键一致
+    SOUND_EFFECTS = [
+        ('playerShoot', 'player_shoot.wav', 'synth_laser', (0.1, 800, 400)),
+        ('enemyShoot', 'enemy_shoot.wav', 'synth_laser', (0.08, 600, 300)),
+        ('explosion', 'explosion.wav', 'synth_explosion', (0.5,)),
+        ('enemyDeath', 'enemy_death.wav', 'synth_explosion', (0.3,)),
+        ('powerup', 'powerup.wav', 'synth_powerup', (0.3,)),
+        ('heal', 'heal.wav', 'synth_heal', (0.4,)),
+        ('shield', 'shield.wav', 'synth_shield', (0.3,)),
+        ('buttonClick', 'button_click.wav', 'synth_tone', (0.2, 1000, 20, 0.5)),
+        ('buttonHover', 'button_hover.wav', 'synth_tone', (0.1, 800, 15, 0.3)),
+        ('warning', 'warning.wav', 'synth_warning', (0.4,)),
+        ('bossAlert', 'boss_alert.wav', 'synth_boss_alert', (0.6,)),
+        ('engine', 'engine.wav', 'synth_engine', (0.2,)),
+        # EnhancedAudioManager 的合成备选音效（synthesizer.frequencies 中 audio.js 没有的部分）
+        ('laser', 'laser.wav', 'synth_chord', (0.5, (800, 1200, 400))),
+        ('hit', 'hit.wav', 'synth_chord', (0.5, (200, 400, 150))),
+    ]
+
+    # Boss主题: (名称, 文件名, 每分钟拍数, 根音频率, 低音音型（半音，每八分音符一个，None 为休止）, 音色)
+    BOSS_THEMES = [
+        ('boss_theme_1', 'boss_mechanical.wav', 132, 55.0,
+         [0, 0, 12, 0, 3, 0, 12, 5, 0, 0, 12, 0, 7, 6, 5, 3], 'square'),
+        ('boss_theme_2', 'boss_organic.wav', 96, 73.42,
+         [0, None, 3, None, 5, 3, None, 0, 0, None, 3, None, 7, 5, 3, None], 'sine'),
+        ('boss_theme_3', 'boss_crystal.wav', 120, 164.81,
+         [0, 7, 12, 7, 3, 10, 15, 10, 0, 7, 12, 7, 5, 12, 17, 12], 'bell'),
+        ('boss_theme_4', 'boss_shadow.wav', 84, 65.41,
+         [0, None, None, 1, 0, None, 6, None, 0, None, None, 1, 0, None, 3, 1], 'saw'),
+    ]
+    THEME_BARS = 4
+
+    def __init__(self, output_dir="../assets/sounds", seed=DEFAULT_SEED, sink=None,
+                 sample_rate=DEFAULT_SAMPLE_RATE):
+        self.output_dir = output_dir
+        self.sink = sink if sink is not None else DiskSink(output_dir)
+        self.seed = seed
+        self.sample_rate = sample_rate
+
+    def noise(self, name, count):
+        """按名称播种的白噪声 [-1, 1)，与 Math.random() * 2 - 1 对应"""
+        rng = np.random.default_rng([self.seed, zlib.crc32(name.encode('utf-8'))])
+        return rng.random(count) * 2 - 1
+
+    def timeline(self, duration):
+        """与 JS 中 frameCount = sampleRate * duration 相同长度的时间轴"""
+        return np.arange(int(self.sample_rate * duration)) / self.sample_rate
+
+    def synth_laser(self, name, duration, start_freq, end_freq):
+        t = self.timeline(duration)
+        frequency = start_freq + (end_freq - start_freq) * (t / duration)
+        return np.sin(2 * np.pi * frequency * t) * np.exp(-t * 8) * 0.5
+
+    def synth_explosion(self, name, duration):
+        t = self.timeline(duration)
+        sample = (np.sin(2 * np.pi * 80 * t) * 0.4 + np.sin(2 * np.pi * 40 * t) * 0.3
+                  + self.noise(name, len(t)) * 0.3)
+        return sample * np.exp(-t * 4) * 0.8
+
+    def synth_powerup(self, name, duration):
+        t = self.timeline(duration)
+        frequencies = [440, 554, 659]  # A, C#, E 和弦
+        sample = sum(np.sin(2 * np.pi * f * t) for f in frequencies) / len(frequencies)
+        return sample * np.exp(-t * 3) * 0.3
+
+    def synth_heal(self, name, duration):
+        t = self.timeline(duration)
+        frequency = 500 + np.sin(t * 20) * 100
+        return np.sin(2 * np.pi * frequency * t) * np.sin(t * np.pi / duration) * 0.4
+
+    def synth_shield(self, name, duration):
+        t = self.timeline(duration)
+        frequency = 300 + t * 200
+        sample = np.sin(2 * np.pi * frequency * t) + np.sin(2 * np.pi * frequency * 1.5 * t) * 0.5
+        return sample * np.sin(t * np.pi / duration) * 0.3
+
+    def synth_tone(self, name, duration, frequency, decay, volume):
+        t = self.timeline(duration)
+        return np.sin(2 * np.pi * frequency * t) * np.exp(-t * decay) * volume
+
+    def synth_warning(self, name, duration):
+        t = self.timeline(duration)
+        frequency = 400 + np.sin(t * 20) * 100
+        return np.sin(2 * np.pi * frequency * t) * 0.6
+
+    def synth_boss_alert(self, name, duration):
+        t = self.timeline(duration)
+        frequency = 200 + np.sin(t * 10) * 50
+        return np.sin(2 * np.pi * frequency * t) * np.sin(t * 15) * 0.8
+
+    def synth_engine(self, name, duration):
+        t = self.timeline(duration)
+        sample = (np.sin(2 * np.pi * 60 * t) * 0.4 + np.sin(2 * np.pi * 120 * t) * 0.2
+                  + self.noise(name, len(t)) * 0.1)
+        return sample * 0.3
+
+    def synth_chord(self, name, duration, frequencies):
+        """EnhancedAudioManager.generateSyntheticSound: 各分音按序号加快衰减"""
+        t = self.timeline(duration)
+        return sum(np.sin(2 * np.pi * f * t) * np.exp(-t * (i + 1) * 3) * 0.3
+                   for i, f in enumerate(frequencies))
+
+    def oscillator(self, frequency, t, timbre):
+        """加法合成的带限波形，泛音不超过奈奎斯特频率"""
+        nyquist = self.sample_rate / 2
+        if timbre == 'sine':
+            partials = [(1, 1.0)]
+        elif timbre == 'square':
+            partials = [(n, 1 / n) for n in range(1, 16, 2)]
+        elif timbre == 'saw':
+            partials = [(n, 1 / n) for n in range(1, 12)]
+        elif timbre == 'bell':
+            partials = [(1, 1.0), (2.76, 0.5), (5.4, 0.25), (8.93, 0.12)]
+        else:
+            raise ValueError(f"未知音色: {timbre}")
+        return sum(np.sin(2 * np.pi * frequency * ratio * t) * amplitude
+                   for ratio, amplitude in partials if frequency * ratio < nyquist)
+
+    def synth_boss_theme(self, name, bpm, root, pattern, timbre):
+        """低音音型 + 底鼓 + 持续和声垫，总长为整数小节，可无缝循环"""
+        beat = 60 / bpm
+        step = beat / 2
+        loop_length = int(round(self.THEME_BARS * 4 * beat * self.sample_rate))
+        t_loop = np.arange(loop_length) / self.sample_rate
+        duration = loop_length / self.sample_rate
+        out = np.zeros(loop_length)
+
+        # 低音: 音型按八分音符排布，每个音在自己的格子内衰减到零
+        note_length = int(step * self.sample_rate)
+        t_note = np.arange(note_length) / self.sample_rate
+        envelope = np.minimum(t_note / 0.005, 1) * np.exp(-t_note * 6) * (1 - t_note / step)
+        steps = int(round(duration / step))
+        for i in range(steps):
+            semitone = pattern[i % len(pattern)]
+            if semitone is None:
+                continue
+            start = int(i * step * self.sample_rate)
+            frequency = root * 2 ** (semitone / 12)
+            note = self.oscillator(frequency, t_note, timbre) * envelope
+            end = min(start + note_length, loop_length)
+            out[start:end] += note[:end - start] * 0.35
+
+        # 底鼓: 每拍一次、频率从 120Hz 滑到 40Hz 的正弦
+        kick_length = int(min(0.25, beat) * self.sample_rate)
+        t_kick = np.arange(kick_length) / self.sample_rate
+        kick_freq = 40 + 80 * np.exp(-t_kick * 30)
+        kick = np.sin(2 * np.pi * np.cumsum(kick_freq) / self.sample_rate) * np.exp(-t_kick * 12)
+        for i in range(int(round(duration / beat))):
+            start = int(i * beat * self.sample_rate)
+            end = min(start + kick_length, loop_length)
+            out[start:end] += kick[:end - start] * 0.5
+
+        # 和声垫: 根音与五度，频率取整到循环内整数个周期，首尾相位一致
+        for ratio, amplitude in [(2, 0.08), (3, 0.05)]:
+            frequency = round(root * ratio * duration) / duration
+            out += np.sin(2 * np.pi * frequency * t_loop) * amplitude
+        out *= 0.85 + 0.15 * np.sin(2 * np.pi * t_loop / duration)
+
+        return out / max(np.abs(out).max(), 1e-9) * 0.8
+
+    def encode_wav(self, samples):
+        """编码为16位 PCM 单声道 WAV"""
+        pcm = (np.clip(samples, -1, 1) * 32767).astype('<i2')
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(pcm.tobytes())
+        return buffer.getvalue()
+
+    def generate_all_sounds(self, verbose=True):
+        """合成全部音效和Boss主题，写出 WAV 与 sounds.json 清单
+
+        verbose=False 时不打印进度（服务器按需合成时不应写到标准输出）。
+        """
+        log = print if verbose else (lambda *args: None)
+        log("=== 开始合成游戏音效 ===")
+        manifest = {}
+
+        jobs = [(name, filename, 'sfx', False, method, args)
+                for name, filename, method, args in self.SOUND_EFFECTS]
+        jobs += [(name, filename, 'music', True, 'synth_boss_theme', (bpm, root, pattern, timbre))
+                 for name, filename, bpm, root, pattern, timbre in self.BOSS_THEMES]
+
+        for name, filename, kind, loop, method, args in jobs:
+            log(f"- {name} -> {filename}")
+            samples = getattr(self, method)(name, *args)
+            self.sink.write(filename, self.encode_wav(samples))
+            manifest[name] = {
+                'file': filename,
+                'kind': kind,
+                'duration': round(len(samples) / self.sample_rate, 4),
+                'loop': loop,
+            }
+
+        data = {'version': SOUNDS_VERSION, 'sample_rate': self.sample_rate, 'sounds': manifest}
+        self.sink.write(SOUNDS_JSON_NAME, json.dumps(data, indent=2).encode('utf-8'))
+        log(f"=== 音效合成完成！共 {len(manifest)} 个 ===")
+        return manifest
+
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="离线合成游戏音效")
+    parser.add_argument('-o', '--output', default="../assets/sounds",
+                        help="输出目录 (默认: ../assets/sounds)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help=f"噪声随机种子 (默认: {DEFAULT_SEED})")
+    parser.add_argument('--sample-rate', type=int, default=DEFAULT_SAMPLE_RATE,
+                        help=f"采样率 (默认: {DEFAULT_SAMPLE_RATE})")
+    parser.add_argument('--archive', metavar='PATH',
+                        help="直接写入 .zip/.tar 归档而不是输出目录")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sink = open_archive_sink(args.archive) if args.archive else DiskSink(args.output)
+    generator = SuperGameAudioGenerator(args.output, seed=args.seed, sink=sink, sample_rate=args.sample_rate)
+    try:
+        with sink:
+            generator.generate_all_sounds()
+    except OSError as e:
+        print(f"❌ 音效合成失败: {e}")
+        sys.exit(1)
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+按需资源生成
+开发服务器收到 /assets/images/<name> 请求时才在进程内调用对应的生成方法，
+结果缓存在内存中；同一资源的并发请求合并为一次生成。
+/assets/sounds/ 下的音效在首次请求时一次性合成。
+"""
+
+import json
+import threading
+from concurrent.futures import Future
+
+from generate_assets import (SuperGameAssetGenerator, DEFAULT_SEED, DEFAULT_SCALES, DEFAULT_ROTATIONS,
+                             DEFAULT_POOL_SIZE, VARIANTS_JSON_NAME, GLOWS_JSON_NAME, ROTATIONS_JSON_NAME,
+                             POOLS_JSON_NAME, PALETTES_JSON_NAME)
+from asset_sinks import MemorySink
+from texture_atlas import TextureAtlasPacker, ATLAS_JSON_NAME
+from collision_shapes import CollisionShapeBuilder, COLLISION_JSON_NAME
+from generate_audio import SuperGameAudioGenerator, SOUNDS_JSON_NAME
+from file_cache import content_digest
+
+# 图集和碰撞形状不属于任何单个任务，依赖全部 1x 基础精灵
+ATLAS_TASK = 'atlas'
+COLLISION_TASK = 'collision'
+# 基础精灵: 只按 1x 生成、不带预旋转帧、变体池和换色变体，与完整任务输出的 1x 精灵逐字节相同
+BASE_SPRITES_TASK = 'base_sprites'
+
+
+class LazyAssetGenerator:
+    def __init__(self, seed=DEFAULT_SEED, scales=DEFAULT_SCALES, rotations=DEFAULT_ROTATIONS,
+                 pool_size=DEFAULT_POOL_SIZE, palettes=tuple(SuperGameAssetGenerator.COLOR_PALETTES)):
+        self.seed = seed
+        self.scales = tuple(scales)
+        self.rotations = rotations
+        self.pool_size = pool_size
+        self.palettes = tuple(palettes)
+        self.cache = {}     # 文件名 -> 字节
+        self.base_files = None  # 基础精灵文件名 -> 字节（图集与碰撞形状的输入）
+        self.pending = {}   # 任务名 -> 正在进行的生成 Future
+        self.versions = {}  # 文件名 / 任务名 -> 版本（用于资源指纹）
+        self.lock = threading.Lock()
+
+        # 文件名 -> (任务名, 方法名, 参数, 输出文件名列表)
+        self.index = {}
+        self.tasks = {}
+        generator = self.key_generator = self.new_generator(MemorySink())
+        for _, task_name, method_name, args, outputs in generator.build_tasks():
+            self.tasks[task_name] = (method_name, args, outputs)
+            for name in outputs:
+                self.index[name] = task_name
+        
+        # 变体、发光、旋转帧、变体池和换色清单只依赖文件名与配置，可以立即得到
+        glows = SuperGameAssetGenerator.build_glow_manifest()
+        self.cache[GLOWS_JSON_NAME] = json.dumps(glows, indent=2).encode('utf-8')
+        if self.rotations:
+            index = generator.build_rotation_index()
+            self.cache[ROTATIONS_JSON_NAME] = json.dumps(index, indent=2).encode('utf-8')
+        if self.pool_size:
+            pools = generator.build_pool_index()
+            self.cache[POOLS_JSON_NAME] = json.dumps(pools, indent=2).encode('utf-8')
+        if self.palettes:
+            palettes = generator.build_palette_manifest()
+            self.cache[PALETTES_JSON_NAME] = json.dumps(palettes, indent=2).encode('utf-8')
+        if len(self.scales) > 1:
+            variants = SuperGameAssetGenerator.build_variant_manifest(self.index, self.scales)
+            self.cache[VARIANTS_JSON_NAME] = json.dumps(variants, indent=2).encode('utf-8')
+
+    def new_generator(self, sink):
+        return SuperGameAssetGenerator(seed=self.seed, sink=sink, scales=self.scales, rotations=self.rotations,
+                                       pool_size=self.pool_size, palettes=self.palettes)
+    
+    def knows(self, name):
+        """该文件是否可以按需生成"""
+        return name in self.index or name in self.cache or self.derived_task(name) is not None
+
+    def names(self):
+        """可以按需生成的文件名（图集图片在打包后才知道，不包含在内）"""
+        with self.lock:
+            return set(self.index) | set(self.cache)
+
+    def version(self, name):
+        """资源版本：任务输出为生成任务键（与增量构建清单相同，输入不变时输出逐字节相同），
+        已在内存中的清单和图集为内容哈希；尚未生成的派生文件返回 None
+        """
+        with self.lock:
+            version = self.versions.get(name)
+            if version is not None:
+                return version
+            if name in self.index:
+                # 同一任务的全部输出共用任务键
+                task_name = self.index[name]
+                version = self.versions.get(task_name)
+                if version is None:
+                    method_name, args, _ = self.tasks[task_name]
+                    version = self.versions[task_name] = self.key_generator.task_key(task_name, method_name, args)
+            elif name in self.cache:
+                version = content_digest(self.cache[name])
+            else:
+                return None
+            self.versions[name] = version
+            return version
+
+    @staticmethod
+    def is_atlas_file(name):
+        return name == ATLAS_JSON_NAME or (name.startswith('atlas_') and name.endswith('.png'))
+
+    def derived_task(self, name):
+        """由全部精灵派生的文件对应的任务，其余文件返回 None
+
+        图集页的数量在打包后才知道，只认 atlas.json；打包得到的图集页随后位于缓存中。
+        """
+        if name == ATLAS_JSON_NAME:
+            return ATLAS_TASK
+        if name == COLLISION_JSON_NAME:
+            return COLLISION_TASK
+        return None
+
+    def get(self, name):
+        """返回资源字节，必要时生成；未知文件返回 None"""
+        if not self.knows(name):
+            return None
+        if name in self.cache:
+            return self.cache[name]
+        task_name = self.derived_task(name) or self.index[name]
+        self.ensure(task_name)
+        return self.cache.get(name)
+
+    def ensure(self, task_name):
+        """确保任务已生成；正在生成时等待同一个结果而不是重复生成"""
+        with self.lock:
+            if task_name in self.pending:
+                future = self.pending[task_name]
+                owner = False
+            elif self.is_done(task_name):
+                return
+            else:
+                future = Future()
+                self.pending[task_name] = future
+                owner = True
+
+        if not owner:
+            future.result()
+            return
+
+        try:
+            if task_name == ATLAS_TASK:
+                files = self.build_atlas()
+            elif task_name == COLLISION_TASK:
+                files = self.build_collision_shapes()
+            elif task_name == BASE_SPRITES_TASK:
+                files = self.build_base_sprites()
+            else:
+                files = self.run(task_name)
+            with self.lock:
+                if task_name == BASE_SPRITES_TASK:
+                    self.base_files = files
+                else:
+                    self.cache.update(files)
+            future.set_result(None)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                del self.pending[task_name]
+
+    def is_done(self, task_name):
+        if task_name == ATLAS_TASK:
+            return ATLAS_JSON_NAME in self.cache
+        if task_name == COLLISION_TASK:
+            return COLLISION_JSON_NAME in self.cache
+        if task_name == BASE_SPRITES_TASK:
+            return self.base_files is not None
+        return all(name in self.cache for name in self.tasks[task_name][2])
+
+    def run(self, task_name):
+        """用独立的生成器执行单个任务（生成器本身不是线程安全的）"""
+        method_name, args, outputs = self.tasks[task_name]
+        sink = MemorySink()
+        generator = self.new_generator(sink)
+        generator.run_task(task_name, method_name, args, outputs)
+        return sink.files
+
+    def build_base_sprites(self):
+        """用 1x 生成器只执行输出图集精灵的任务
+
+        完整任务还要光栅化 @2x/@4x、预旋转帧和换色变体，耗时约为这里的30倍；
+        图集和碰撞形状只需要 1x 精灵，不必让首次请求等待全部变体生成。
+        """
+        sink = MemorySink()
+        generator = SuperGameAssetGenerator(seed=self.seed, sink=sink)
+        for _, task_name, method_name, args, outputs in generator.build_tasks():
+            if any(SuperGameAssetGenerator.is_atlas_sprite(name) for name in outputs):
+                generator.run_task(task_name, method_name, args, outputs)
+        return {name: data for name, data in sink.files.items() if SuperGameAssetGenerator.is_atlas_sprite(name)}
+
+    def sprite_sink(self, predicate):
+        """满足 predicate 的基础精灵（按任务顺序）放入一个内存 Sink，返回 (Sink, 文件名列表)"""
+        self.ensure(BASE_SPRITES_TASK)
+        sink = MemorySink()
+        with self.lock:
+            sprites = [name for name in self.base_files if predicate(name)]
+            for name in sprites:
+                sink.write(name, self.base_files[name])
+        return sink, sprites
+
+    def build_atlas(self):
+        """生成基础精灵后打包纹理图集"""
+        sink, sprites = self.sprite_sink(SuperGameAssetGenerator.is_atlas_sprite)
+        TextureAtlasPacker(sink).pack(sprites)
+        return {name: data for name, data in sink.files.items() if self.is_atlas_file(name)}
+
+    def build_collision_shapes(self):
+        """生成基础精灵后计算碰撞形状"""
+        sink, sprites = self.sprite_sink(SuperGameAssetGenerator.is_collision_sprite)
+        written = CollisionShapeBuilder(sink).build(sprites)
+        return {name: sink.files[name] for name in written}
+
+
+class LazySoundGenerator:
+    """音效在首次请求时一次性合成到内存（全部合成不到一秒，无需按文件拆分）"""
+
+    def __init__(self, seed=DEFAULT_SEED):
+        self.seed = seed
+        self.files = None
+        self.lock = threading.Lock()
+        entries = SuperGameAudioGenerator.SOUND_EFFECTS + SuperGameAudioGenerator.BOSS_THEMES
+        self.sound_names = {entry[1] for entry in entries} | {SOUNDS_JSON_NAME}
+
+    def knows(self, name):
+        return name in self.sound_names
+
+    def names(self):
+        return set(self.sound_names)
+
+    def version(self, name):
+        """音效版本为内容哈希（首次调用时合成全部音效）"""
+        data = self.get(name)
+        return content_digest(data) if data is not None else None
+
+    def get(self, name):
+        """返回音效字节，首次调用时合成全部音效；未知文件返回 None"""
+        if not self.knows(name):
+            return None
+        with self.lock:
+            if self.files is None:
+                sink = MemorySink()
+                SuperGameAudioGenerator(seed=self.seed, sink=sink).generate_all_sounds(verbose=False)
+                self.files = sink.files
+        return self.files.get(name)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+多分辨率光栅化
+生成方法只执行一次几何计算，每个绘图调用同时分发到各个比例的画布上，
+一次得到 @1x/@2x/@4x 等多个分辨率的精灵。
+"""
+
+from PIL import Image
+
+from scaled_draw import ScaledDraw
+from vector_render import Canvas
+
+
+def variant_name(filename, scale):
+    """比例变体文件名: 1x 保持原名，其余为 name@2x.png"""
+    if scale == 1:
+        return filename
+    base, ext = filename.rsplit('.', 1)
+    return f'{base}@{scale}x.{ext}'
+
+
+class MultiScaleImage:
+    """同一精灵在多个比例下的图像集合 {比例: PIL图像}"""
+
+    def __init__(self, images):
+        self.images = images
+
+    @classmethod
+    def new(cls, mode, size, color, scales):
+        width, height = size
+        return cls({s: Image.new(mode, (round(width * s), round(height * s)), color) for s in scales})
+
+    def paste(self, other, box, mask=None):
+        """与 Image.paste 相同，box 以 1x 像素计"""
+        x, y = box
+        for s, img in self.images.items():
+            img.paste(other.images[s], (round(x * s), round(y * s)),
+                      mask.images[s] if mask is not None else None)
+
+    def alpha_composite(self, other):
+        """返回新的合成图像（与 Image.alpha_composite 一致）"""
+        return MultiScaleImage({s: Image.alpha_composite(img, other.images[s])
+                                for s, img in self.images.items()})
+
+
+class MultiScaleDraw:
+    """把每个绘图调用（1x 坐标）分发到各比例的 ScaledDraw"""
+
+    def __init__(self, image):
+        self.draws = [ScaledDraw(img, s) for s, img in image.images.items()]
+
+    def __getattr__(self, name):
+        methods = [getattr(draw, name) for draw in self.draws]
+
+        def dispatch(*args, **kwargs):
+            for method in methods:
+                method(*args, **kwargs)
+        return dispatch
+
+
+class MultiScaleCanvas:
+    """多个比例的矢量画布，图元按同一组 1x 参数在各比例下求值"""
+
+    def __init__(self, width, height, scales):
+        self.canvases = {s: Canvas(width, height, scale=s) for s in scales}
+
+    def __getattr__(self, name):
+        methods = [getattr(canvas, name) for canvas in self.canvases.values()]
+
+        def dispatch(*args, **kwargs):
+            for method in methods:
+                method(*args, **kwargs)
+            return self
+        return dispatch
+
+    def to_image(self):
+        return MultiScaleImage({s: canvas.to_image() for s, canvas in self.canvases.items()})
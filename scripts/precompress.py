@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+文本资源预压缩
+把 .js/.css/.html/.json 等文本文件预先压缩成同目录的 .br / .gz 文件，
+服务器根据请求的 Accept-Encoding 直接发送压缩好的版本，不在请求时压缩。
+brotli 模块不可用时只生成 gzip。
+"""
+
+import os
+import sys
+import gzip
+import argparse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.js', '.css', '.html', '.json', '.svg', '.map')
+# 编码 -> 文件后缀，按服务器的优先顺序排列
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+SKIP_DIRS = {'.git', '__pycache__', 'node_modules', '.venv', 'venv'}
+
+
+def available_encodings():
+    """当前环境可以生成的压缩编码（按优先顺序）"""
+    return tuple(encoding for encoding in ENCODING_SUFFIXES if encoding != 'br' or brotli is not None)
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    # mtime=0 使相同输入得到相同输出
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def is_compressible(path):
+    return path.lower().endswith(COMPRESSIBLE_EXTENSIONS)
+
+
+def compressed_path(path, encoding):
+    return path + ENCODING_SUFFIXES[encoding]
+
+
+def fresh_compressed_path(path, encoding):
+    """压缩文件存在且不比原文件旧时返回其路径，否则返回 None"""
+    sibling = compressed_path(path, encoding)
+    try:
+        if os.stat(sibling).st_mtime >= os.stat(path).st_mtime:
+            return sibling
+    except OSError:
+        pass
+    return None
+
+
+def precompress_file(path, encodings=None):
+    """为单个文件生成各编码的压缩文件，已是最新的跳过；返回新写出的压缩文件数
+
+    压缩后不比原文件小的编码不写出（并删除旧的压缩文件），服务器会直接发送原文件。
+    """
+    written = 0
+    data = None
+    for encoding in encodings or available_encodings():
+        if fresh_compressed_path(path, encoding):
+            continue
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+        sibling = compressed_path(path, encoding)
+        compressed = compress(data, encoding)
+        if len(compressed) >= len(data):
+            if os.path.exists(sibling):
+                os.remove(sibling)
+            continue
+        tmp_path = sibling + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(compressed)
+        os.replace(tmp_path, sibling)
+        written += 1
+    return written
+
+
+def find_compressible(root):
+    """递归列出 root 下的可压缩文本文件"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.'))
+        for filename in sorted(filenames):
+            if is_compressible(filename):
+                yield os.path.join(dirpath, filename)
+
+
+def precompress_tree(root, encodings=None):
+    """预压缩 root 下的所有文本文件，返回 (文件数, 新写出的压缩文件数)"""
+    files = written = 0
+    for path in find_compressible(root):
+        files += 1
+        written += precompress_file(path, encodings)
+    return files, written
+
+
+def remove_compressed(root):
+    """删除 root 下所有预压缩文件，返回删除的数量"""
+    removed = 0
+    for path in find_compressible(root):
+        for encoding in ENCODING_SUFFIXES:
+            sibling = compressed_path(path, encoding)
+            if os.path.exists(sibling):
+                os.remove(sibling)
+                removed += 1
+    return removed
+
+
+def negotiate_encoding(accept_encoding, available):
+    """按 Accept-Encoding 从 available（服务器优先顺序）中选择编码，都不可接受时返回 None
+
+    q=0 表示拒绝；未列出的编码由 * 的权重决定；权重相同时按服务器优先顺序。
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get('*', 0.0))
+        if encoding == 'gzip' and 'gzip' not in weights:
+            q = weights.get('x-gzip', q)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="文本资源预压缩（.br / .gz）")
+    parser.add_argument('root', nargs='?', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'),
+                        help="要预压缩的目录 (默认: 项目根目录)")
+    parser.add_argument('--clean', action='store_true', help="删除所有预压缩文件")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.clean:
+        print(f"🧹 已删除 {remove_compressed(args.root)} 个预压缩文件")
+        sys.exit(0)
+    if brotli is None:
+        print("⚠️  未安装 brotli 模块，只生成 gzip 压缩文件")
+    files, written = precompress_tree(args.root)
+    print(f"✅ 预压缩完成: {files} 个文本文件，新写出 {written} 个压缩文件 ({'/'.join(available_encodings())})")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+关键资源扫描
+静态扫描页面引用的脚本中对 assets/images/ 的引用，得到首屏需要的图片清单，
+服务器据此在页面响应（以及可选的 103 Early Hints）中发送 Link: rel=preload，
+使图片（及脚本随后请求的 JSON 清单）下载与脚本解析并行，而不必等脚本执行到加载代码时才被浏览器发现。
+
+识别三种写法：
+- 字符串字面量 'assets/images/player_ship.png'
+- 部分动态的模板 `assets/images/explosion_${i}.png`：动态部分按单个名称片段匹配已知资源
+- 完全动态的模板 `assets/images/${spriteName}`：取同一脚本中的图片文件名字面量（如 spriteNames 数组）
+"""
+
+import os
+import re
+import threading
+
+from bundler import find_page_resources
+
+IMAGE_URL_PREFIX = 'assets/images/'
+# 发送的预加载提示数量上限（响应头不宜过大，浏览器也会警告长时间未使用的预加载）
+MAX_PRELOAD_HINTS = 48
+
+LITERAL_REFERENCE = re.compile(r'([\'"])(assets/images/[^\'"\\]+)\1')
+TEMPLATE_REFERENCE = re.compile(r'`(assets/images/(?:[^`$\\]|\$\{[^}]*\})*)`')
+TEMPLATE_EXPRESSION = re.compile(r'\$\{[^}]*\}')
+FILENAME_LITERAL = re.compile(r'[\'"]([\w-]+\.(?:png|jpg))[\'"]')
+# 模板中动态部分匹配的名称片段（不含 @ 与 .，不会匹配 @2x 等派生文件）
+DYNAMIC_PART = r'[\w-]+'
+
+
+def scan_script(text):
+    """扫描单个脚本，返回按出现顺序排列的引用: ('literal', 路径) 或 ('pattern', 正则)"""
+    references = []
+    matches = [(m.start(), 'literal', m.group(2)) for m in LITERAL_REFERENCE.finditer(text)]
+    matches += [(m.start(), 'template', m.group(1)) for m in TEMPLATE_REFERENCE.finditer(text)]
+    filenames = None
+    for _, kind, value in sorted(matches):
+        if kind == 'literal':
+            references.append(('literal', value))
+            continue
+        pieces = TEMPLATE_EXPRESSION.split(value)
+        if len(pieces) == 1:
+            references.append(('literal', value))
+        elif pieces == [IMAGE_URL_PREFIX, '']:
+            if filenames is None:
+                filenames = [IMAGE_URL_PREFIX + name for name in FILENAME_LITERAL.findall(text)]
+            references.extend(('literal', name) for name in filenames)
+        else:
+            pattern = DYNAMIC_PART.join(re.escape(piece) for piece in pieces)
+            references.append(('pattern', re.compile(pattern + '$')))
+    return references
+
+
+def preload_link(url):
+    """Link 头中的一项；JSON 清单由 fetch() 以 CORS 模式请求，预加载也必须带 crossorigin 才能被复用"""
+    if url.endswith('.json'):
+        return f'<{url}>; rel=preload; as=fetch; crossorigin'
+    return f'<{url}>; rel=preload; as=image'
+
+
+class PreloadScanner:
+    """扫描结果以页面与脚本的 (修改时间, 大小) 为缓存签名，文件修改后重新扫描"""
+
+    def __init__(self, root='.', page='index.html'):
+        self.root = root
+        self.page = page
+        self.cache = None   # (签名, 引用列表)
+        self.lock = threading.Lock()
+
+    def path(self, name):
+        return os.path.join(self.root, *name.split('/'))
+
+    def read(self, name):
+        with open(self.path(name), encoding='utf-8-sig') as f:
+            return f.read()
+
+    def signature(self, names):
+        signature = []
+        for name in names:
+            st = os.stat(self.path(name))
+            signature.append((name, st.st_mtime_ns, st.st_size))
+        return tuple(signature)
+
+    def references(self):
+        scripts = find_page_resources(self.read(self.page))['js']
+        signature = self.signature([self.page, *scripts])
+        with self.lock:
+            if self.cache is not None and self.cache[0] == signature:
+                return self.cache[1]
+        references = []
+        for name in scripts:
+            references.extend(scan_script(self.read(name)))
+        with self.lock:
+            self.cache = (signature, references)
+        return references
+
+    def critical_assets(self, known):
+        """按脚本顺序排列的关键资源路径（去重，只保留 known 中存在的资源，最多 MAX_PRELOAD_HINTS 个）"""
+        known_sorted = sorted(known)
+        assets = []
+        seen = set()
+        for kind, value in self.references():
+            names = [value] if kind == 'literal' else [name for name in known_sorted if value.match(name)]
+            for name in names:
+                if name in known and name not in seen:
+                    seen.add(name)
+                    assets.append(name)
+        return assets[:MAX_PRELOAD_HINTS]
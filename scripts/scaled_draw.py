@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+按比例缩放的绘图包装
+生成方法始终使用 1x 像素坐标作图，ScaledDraw 把坐标、线宽和圆角半径映射到
+放大后的画布上；scale 为 1 时与直接使用 ImageDraw 完全一致。
+"""
+
+from PIL import ImageDraw, ImageFont
+
+
+class ScaledDraw:
+    def __init__(self, img, scale=1):
+        self.draw = ImageDraw.Draw(img)
+        self.scale = scale
+
+    def coord(self, value):
+        """像素坐标：保持像素中心对齐（x 号像素的中心映射到放大后对应区域的中心）"""
+        if self.scale == 1:
+            return value
+        return (value + 0.5) * self.scale - 0.5
+
+    def length(self, value):
+        if self.scale == 1:
+            return value
+        return max(1, round(value * self.scale))
+
+    @staticmethod
+    def pairs(xy):
+        """把 [(x, y), ...] 或 [x0, y0, x1, y1, ...] 统一为点列表"""
+        xy = list(xy)
+        if xy and isinstance(xy[0], (int, float)):
+            return list(zip(xy[0::2], xy[1::2]))
+        return [tuple(p) for p in xy]
+
+    def points(self, xy):
+        return [(self.coord(x), self.coord(y)) for x, y in self.pairs(xy)]
+
+    def box(self, xy):
+        """包含端点的像素框 [x0, y0, x1, y1]：放大后覆盖相同的区域"""
+        (x0, y0), (x1, y1) = self.pairs(xy)
+        if self.scale == 1:
+            return [x0, y0, x1, y1]
+        s = self.scale
+        return [x0 * s, y0 * s, (x1 + 1) * s - 1, (y1 + 1) * s - 1]
+
+    def options(self, kwargs):
+        if 'width' in kwargs:
+            kwargs['width'] = self.length(kwargs['width'])
+        return kwargs
+
+    def polygon(self, xy, **kwargs):
+        return self.draw.polygon(self.points(xy), **self.options(kwargs))
+
+    def line(self, xy, **kwargs):
+        return self.draw.line(self.points(xy), **self.options(kwargs))
+
+    def point(self, xy, fill=None):
+        if self.scale == 1:
+            return self.draw.point(xy, fill=fill)
+        for x, y in self.pairs(xy):
+            self.draw.rectangle(self.box([x, y, x, y]), fill=fill)
+
+    def ellipse(self, xy, **kwargs):
+        return self.draw.ellipse(self.box(xy), **self.options(kwargs))
+
+    def rectangle(self, xy, **kwargs):
+        return self.draw.rectangle(self.box(xy), **self.options(kwargs))
+
+    def rounded_rectangle(self, xy, radius=0, **kwargs):
+        return self.draw.rounded_rectangle(self.box(xy), radius=self.length(radius) if radius else 0,
+                                           **self.options(kwargs))
+
+    def arc(self, xy, start, end, **kwargs):
+        return self.draw.arc(self.box(xy), start, end, **self.options(kwargs))
+
+    def text(self, xy, text, font=None, **kwargs):
+        if self.scale != 1 and font is None:
+            # 默认位图字体约 11 像素高，放大时换用同比例的默认矢量字体
+            try:
+                font = ImageFont.load_default(size=11 * self.scale)
+            except TypeError:
+                font = None
+        x, y = xy
+        return self.draw.text((x * self.scale, y * self.scale), text, font=font, **kwargs)
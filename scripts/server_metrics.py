@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+服务器指标与访问日志
+按路径类别（html/js/css/image/audio/other）和状态码统计请求数、发送字节数与延迟直方图，
+以 Prometheus 文本格式输出；访问日志为每行一个 JSON 对象，先写入内存缓冲区，
+由后台线程定期或缓冲区满时一次性写出，请求线程不再同步写 stderr。
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+
+# 延迟直方图的桶上界（秒）
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PATH_CLASS_EXTENSIONS = {
+    'html': ('.html', '.htm'),
+    'js': ('.js', '.map'),
+    'css': ('.css',),
+    'image': ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.avif'),
+    'audio': ('.wav', '.mp3', '.ogg'),
+}
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+ACCESS_LOG_FLUSH_INTERVAL = 1.0
+ACCESS_LOG_MAX_BUFFER = 256
+
+
+def path_class(path):
+    """URL 路径的类别，目录（页面）归为 html"""
+    path = path.split('?', 1)[0].lower()
+    if path.endswith('/'):
+        return 'html'
+    for name, extensions in PATH_CLASS_EXTENSIONS.items():
+        if path.endswith(extensions):
+            return name
+    return 'other'
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{escape_label(value)}"' for key, value in labels.items()) + '}'
+
+
+def format_value(value):
+    if isinstance(value, float):
+        return repr(value) if value != int(value) else str(int(value))
+    return str(value)
+
+
+class RequestMetrics:
+    """线程安全的请求统计"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.series = {}    # (路径类别, 状态码) -> [请求数, 字节数, 延迟总和, 各桶计数]
+        self.lock = threading.Lock()
+
+    def observe(self, category, status, seconds, size):
+        with self.lock:
+            series = self.series.get((category, status))
+            if series is None:
+                series = self.series[(category, status)] = [0, 0, 0.0, [0] * len(self.buckets)]
+            series[0] += 1
+            series[1] += size
+            series[2] += seconds
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series[3][index] += 1
+                    break
+
+    def render(self, extra=()):
+        """Prometheus 文本格式；extra 为附加指标 [(名称, 类型, 说明, [(标签, 值), ...]), ...]"""
+        with self.lock:
+            snapshot = {key: (count, size, total, list(buckets))
+                        for key, (count, size, total, buckets) in sorted(self.series.items())}
+
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for sample_name, labels, value in samples:
+                lines.append(f'{sample_name}{format_labels(labels)} {format_value(value)}')
+
+        def labels_of(key):
+            return {'path_class': key[0], 'status': key[1]}
+
+        metric('game_http_requests_total', 'counter', 'HTTP requests by path class and status.',
+               [('game_http_requests_total', labels_of(key), values[0]) for key, values in snapshot.items()])
+        metric('game_http_response_bytes_total', 'counter', 'Response body bytes sent by path class and status.',
+               [('game_http_response_bytes_total', labels_of(key), values[1]) for key, values in snapshot.items()])
+
+        samples = []
+        for key, (count, _, total, buckets) in snapshot.items():
+            cumulative = 0
+            for bound, bucket in zip(self.buckets, buckets):
+                cumulative += bucket
+                samples.append(('game_http_request_duration_seconds_bucket',
+                                {**labels_of(key), 'le': format_value(float(bound))}, cumulative))
+            samples.append(('game_http_request_duration_seconds_bucket', {**labels_of(key), 'le': '+Inf'}, count))
+            samples.append(('game_http_request_duration_seconds_sum', labels_of(key), round(total, 6)))
+            samples.append(('game_http_request_duration_seconds_count', labels_of(key), count))
+        metric('game_http_request_duration_seconds', 'histogram',
+               'Time from parsing the request line to the end of the response.', samples)
+
+        for name, kind, help_text, values in extra:
+            metric(name, kind, help_text, [(name, labels, value) for labels, value in values])
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+class AccessLog:
+    """缓冲的结构化访问日志：每行一个 JSON 对象
+
+    后台写出线程在首次写入时启动；fork 出的工作进程各自启动自己的线程（线程不会随 fork 复制）。
+    """
+
+    def __init__(self, stream=None, flush_interval=ACCESS_LOG_FLUSH_INTERVAL, max_buffer=ACCESS_LOG_MAX_BUFFER):
+        self.stream = stream
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.flusher_pid = None
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+        with self.lock:
+            if self.flusher_pid != os.getpid():
+                self.flusher_pid = os.getpid()
+                self.buffer = []
+                threading.Thread(target=self.flush_periodically, name='access-log', daemon=True).start()
+            self.buffer.append(line)
+            full = len(self.buffer) >= self.max_buffer
+        if full:
+            self.flush()
+
+    def flush_periodically(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            lines, self.buffer = self.buffer, []
+        if not lines:
+            return
+        stream = self.stream or sys.stderr
+        try:
+            stream.write('\n'.join(lines) + '\n')
+            stream.flush()
+        except (OSError, ValueError):
+            pass
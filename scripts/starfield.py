@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+分块星空渲染器
+按固定大小的区块逐块生成星空：每个区块独立播种、矢量化放置星星，
+星云以加法混合叠加。浮点工作缓冲只与区块大小有关，与输出分辨率无关；
+逐块输出（tiles()）时峰值内存也只与区块大小有关。
+所有坐标按画布尺寸环绕，输出的图层可以无缝平铺滚动。
+"""
+
+import numpy as np
+from PIL import Image
+
+# 参考分辨率下每百万像素的星星/星云数量（原 1920x1080 背景为 200 颗星、10 片星云）
+DEFAULT_STAR_DENSITY = 200 / (1920 * 1080 / 1e6)
+DEFAULT_NEBULA_DENSITY = 10 / (1920 * 1080 / 1e6)
+
+
+class StarfieldRenderer:
+    def __init__(self, width, height, seed, chunk_size=256, scale=1.0,
+                 star_density=DEFAULT_STAR_DENSITY, nebula_density=DEFAULT_NEBULA_DENSITY,
+                 star_sizes=(1, 1, 1, 2, 2, 3), brightness=(100, 255),
+                 nebula_radius=(20, 80), nebula_strength=0.25,
+                 background=(5, 5, 20), transparent=False):
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.scale = scale
+        # 密度按参考分辨率定义，放大 scale 倍时同一视野内的星星数量不变
+        self.star_density = star_density / (scale * scale)
+        self.nebula_density = nebula_density / (scale * scale)
+        self.star_sizes = np.array(star_sizes, dtype=np.float32)
+        self.brightness = brightness
+        self.nebula_radius = nebula_radius
+        self.nebula_strength = nebula_strength
+        self.background = np.array(background, dtype=np.float32)
+        self.transparent = transparent
+
+        self.cols = -(-width // chunk_size)
+        self.rows = -(-height // chunk_size)
+        self._nebulae = None
+
+    def chunk_rect(self, col, row):
+        """区块的像素范围 (x0, y0, w, h)"""
+        x0 = col * self.chunk_size
+        y0 = row * self.chunk_size
+        return x0, y0, min(self.chunk_size, self.width - x0), min(self.chunk_size, self.height - y0)
+
+    def chunk_stars(self, col, row):
+        """区块内的星星 (x, y, 亮度, 半径)，只由种子和区块坐标决定"""
+        rng = np.random.default_rng([self.seed, 1, col, row])
+        x0, y0, w, h = self.chunk_rect(col, row)
+        count = rng.poisson(self.star_density * w * h / 1e6)
+        xs = x0 + rng.integers(0, w, count)
+        ys = y0 + rng.integers(0, h, count)
+        brightness = rng.integers(self.brightness[0], self.brightness[1] + 1, count).astype(np.float32)
+        radius = rng.choice(self.star_sizes, count) / 2.0 * self.scale
+        return xs, ys, brightness, radius
+
+    def nebulae(self):
+        """全图星云列表 (x, y, 半径, RGB颜色)，数量与画布面积成正比"""
+        if self._nebulae is None:
+            rng = np.random.default_rng([self.seed, 0])
+            count = rng.poisson(self.nebula_density * self.width * self.height / 1e6)
+            xs = rng.uniform(0, self.width, count)
+            ys = rng.uniform(0, self.height, count)
+            radius = rng.uniform(*self.nebula_radius, count) * self.scale
+            colors = np.stack([rng.integers(50, 151, count), rng.integers(20, 101, count),
+                               rng.integers(100, 201, count)], axis=-1).astype(np.float32)
+            self._nebulae = (xs, ys, radius, colors)
+        return self._nebulae
+
+    def splat_stars(self, buf, x0, y0, stars):
+        """把星星以高斯点的形式加到区块缓冲上（坐标按画布尺寸环绕）"""
+        xs, ys, brightness, radius = stars
+        if len(xs) == 0:
+            return
+        reach = int(np.ceil(max(radius.max(), 0.5) * 2))
+        offsets = np.arange(-reach, reach + 1)
+        dy, dx = np.meshgrid(offsets, offsets, indexing='ij')
+        dx = dx.ravel()[None, :]
+        dy = dy.ravel()[None, :]
+
+        # 半径 0.5 的星星只占一个像素，更大的星星按高斯衰减
+        sigma = np.maximum(radius, 0.5)[:, None]
+        weight = np.exp(-(dx * dx + dy * dy) / (2 * sigma * sigma))
+        weight[radius <= 0.5] = 0.0
+        weight[:, dx.shape[1] // 2] = 1.0
+        weight *= brightness[:, None]
+
+        gx = (xs[:, None] + dx) % self.width - x0
+        gy = (ys[:, None] + dy) % self.height - y0
+        h, w = buf.shape[:2]
+        inside = (gx >= 0) & (gx < w) & (gy >= 0) & (gy < h)
+        np.add.at(buf, (gy[inside], gx[inside]), weight[inside][:, None])
+
+    def add_nebulae(self, buf, x0, y0):
+        """星云以加法混合叠加到区块上（环形距离，保证无缝平铺）"""
+        h, w = buf.shape[:2]
+        xs = (x0 + np.arange(w, dtype=np.float32))[None, :]
+        ys = (y0 + np.arange(h, dtype=np.float32))[:, None]
+        for nx, ny, radius, color in zip(*self.nebulae()):
+            dx = np.abs(xs - nx)
+            dx = np.minimum(dx, self.width - dx)
+            dy = np.abs(ys - ny)
+            dy = np.minimum(dy, self.height - dy)
+            if dx.min() > radius * 2 or dy.min() > radius * 2:
+                continue
+            falloff = np.exp(-((dx * dx + dy * dy) / (radius * radius)) * 2.0)
+            buf += falloff[..., None] * color * self.nebula_strength
+
+    def render_chunk(self, col, row):
+        """渲染单个区块，返回 uint8 数组（RGB 或 RGBA）"""
+        x0, y0, w, h = self.chunk_rect(col, row)
+        stars = np.zeros((h, w, 1), dtype=np.float32)
+
+        # 邻近区块的星星可能跨越边界，一并考虑（环绕）
+        neighbours = {((col + dc) % self.cols, (row + dr) % self.rows)
+                      for dr in (-1, 0, 1) for dc in (-1, 0, 1)}
+        for c, r in sorted(neighbours):
+            self.splat_stars(stars, x0, y0, self.chunk_stars(c, r))
+
+        if self.transparent:
+            out = np.empty((h, w, 4), dtype=np.float32)
+            out[..., :3] = 255.0
+            out[..., 3:] = stars
+        else:
+            out = np.broadcast_to(self.background, (h, w, 3)).copy()
+            self.add_nebulae(out, x0, y0)
+            out += stars
+        return np.clip(out, 0, 255).astype(np.uint8)
+
+    def tiles(self):
+        """按行逐块渲染，依次产出 (列, 行, PIL 图像)；同一时刻只有一个区块在内存中"""
+        mode = 'RGBA' if self.transparent else 'RGB'
+        for row in range(self.rows):
+            for col in range(self.cols):
+                yield col, row, Image.fromarray(self.render_chunk(col, row), mode)
+
+    def render(self):
+        """逐块渲染整张星空，返回 PIL 图像
+
+        整张图常驻内存，只用于视差图层这类尺寸固定的小图；大尺寸背景用 tiles() 分块输出。
+        """
+        mode = 'RGBA' if self.transparent else 'RGB'
+        img = Image.new(mode, (self.width, self.height))
+        for col, row, tile in self.tiles():
+            x0, y0, _, _ = self.chunk_rect(col, row)
+            img.paste(tile, (x0, y0))
+        return img
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+纹理图集打包器
+把生成的精灵裁掉透明边后打包进一张或几张2的幂尺寸的图集，
+并输出 JSON 帧表（区域、裁剪偏移、动画序列），客户端只需加载少量图片。
+"""
+
+import os
+import re
+import json
+from io import BytesIO
+from PIL import Image
+
+from asset_encoding import encode_png
+
+# 图集输出文件
+ATLAS_IMAGE_PATTERN = 'atlas_{index}.png'
+ATLAS_JSON_NAME = 'atlas.json'
+ATLAS_VERSION = 1
+
+
+class TextureAtlasPacker:
+    def __init__(self, sink, max_size=2048, padding=2, min_size=64):
+        # sink: 资源输出目标，需提供 read(name) / write(name, data)
+        self.sink = sink
+        self.max_size = max_size
+        self.padding = padding
+        self.min_size = min_size
+
+    def load_sprite(self, filename):
+        """加载精灵并裁掉透明边，返回 (名称, 裁剪后图像, 裁剪框, 原始尺寸)"""
+        with Image.open(BytesIO(self.sink.read(filename))) as src:
+            img = src.convert('RGBA')
+
+        bbox = img.getchannel('A').getbbox()
+        if bbox is None:
+            # 全透明精灵保留 1x1 像素
+            bbox = (0, 0, 1, 1)
+
+        name = os.path.splitext(filename)[0]
+        return name, img.crop(bbox), bbox, img.size
+
+    def shelf_pack(self, sprites, width, height):
+        """货架算法打包，返回 (已放置列表, 剩余精灵)
+
+        sprites 需按高度降序排列；放置项为 (精灵, x, y)。
+        """
+        placed = []
+        x = y = 0
+        shelf_height = 0
+        for i, sprite in enumerate(sprites):
+            w = sprite[1].width + self.padding
+            h = sprite[1].height + self.padding
+            if x + w > width:
+                # 换到下一层货架
+                x = 0
+                y += shelf_height
+                shelf_height = 0
+            if y + h > height or w > width:
+                return placed, sprites[i:]
+            placed.append((sprite, x, y))
+            x += w
+            shelf_height = max(shelf_height, h)
+        return placed, []
+
+    def choose_sheet_size(self, sprites):
+        """找到能容纳全部精灵的最小2的幂尺寸，放不下时返回最大尺寸"""
+        sizes = []
+        size = self.min_size
+        while size <= self.max_size:
+            sizes.append(size)
+            size *= 2
+
+        candidates = sorted(((w, h) for w in sizes for h in sizes if h <= w),
+                            key=lambda wh: (wh[0] * wh[1], wh[0]))
+        for width, height in candidates:
+            _, remaining = self.shelf_pack(sprites, width, height)
+            if not remaining:
+                return width, height
+        return self.max_size, self.max_size
+
+    def pack(self, filenames):
+        """打包精灵文件，写出图集图片和帧表，返回写出的文件名列表"""
+        sprites = [self.load_sprite(name) for name in sorted(set(filenames))]
+        sprites.sort(key=lambda s: (-s[1].height, -s[1].width, s[0]))
+
+        for name, img, _, _ in sprites:
+            if img.width + self.padding > self.max_size or img.height + self.padding > self.max_size:
+                raise ValueError(f"精灵 {name} 尺寸 {img.size} 超过图集最大尺寸 {self.max_size}")
+
+        frames = {}
+        sheets = []
+        written = []
+        remaining = sprites
+        while remaining:
+            width, height = self.choose_sheet_size(remaining)
+            placed, remaining = self.shelf_pack(remaining, width, height)
+
+            # 收缩到实际使用高度对应的2的幂
+            used_height = max(y + s[1].height + self.padding for s, _, y in placed)
+            while height // 2 >= max(used_height, self.min_size):
+                height //= 2
+
+            index = len(sheets)
+            sheet = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+            for (name, img, bbox, source_size), x, y in placed:
+                sheet.paste(img, (x, y))
+                frames[name] = {
+                    'sheet': index,
+                    'frame': {'x': x, 'y': y, 'w': img.width, 'h': img.height},
+                    'trimmed': bbox != (0, 0, *source_size),
+                    'spriteSourceSize': {'x': bbox[0], 'y': bbox[1], 'w': img.width, 'h': img.height},
+                    'sourceSize': {'w': source_size[0], 'h': source_size[1]},
+                }
+
+            image_name = ATLAS_IMAGE_PATTERN.format(index=index)
+            self.sink.write(image_name, encode_png(sheet))
+            sheets.append({'image': image_name, 'size': {'w': width, 'h': height}})
+            written.append(image_name)
+
+        atlas = {
+            'meta': {'version': ATLAS_VERSION, 'padding': self.padding, 'sheets': sheets},
+            'frames': dict(sorted(frames.items())),
+            'animations': self.find_animations(frames),
+        }
+        self.sink.write(ATLAS_JSON_NAME, json.dumps(atlas, indent=2, ensure_ascii=False).encode('utf-8'))
+        written.append(ATLAS_JSON_NAME)
+
+        return written
+
+    @staticmethod
+    def find_animations(frames):
+        """把 name_0..name_N 形式的帧归为动画序列"""
+        groups = {}
+        for name in frames:
+            match = re.match(r'^(.*)_(\d+)$', name)
+            if match:
+                groups.setdefault(match.group(1), []).append((int(match.group(2)), name))
+
+        return {base: [name for _, name in sorted(items)]
+                for base, items in sorted(groups.items()) if len(items) > 1}
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+多进程工作者监督器
+fork 出 N 个工作进程各自运行同一个函数（例如绑定 SO_REUSEPORT 端口的 HTTP 服务器，由内核分配连接），
+工作进程异常退出时自动重启；监督进程收到 Ctrl+C 或 SIGTERM 时终止全部工作进程。
+"""
+
+import os
+import sys
+import time
+import signal
+import socket
+import traceback
+
+# 工作进程启动后不到 MIN_UPTIME 秒就退出时，等待 RESTART_DELAY 秒再重启，避免崩溃循环占满 CPU
+MIN_UPTIME = 1.0
+RESTART_DELAY = 1.0
+# 发送 SIGTERM 后等待工作进程退出的秒数，超时发送 SIGKILL
+STOP_TIMEOUT = 5.0
+
+
+def supports_workers():
+    """当前系统是否支持 fork 与 SO_REUSEPORT"""
+    return hasattr(os, 'fork') and hasattr(socket, 'SO_REUSEPORT')
+
+
+def describe_exit(status):
+    code = os.waitstatus_to_exitcode(status)
+    if code < 0:
+        return f"信号 {signal.Signals(-code).name}"
+    return f"退出码 {code}"
+
+
+class WorkerSupervisor:
+    def __init__(self, target, workers):
+        self.target = target        # target(index) 在工作进程中运行，返回即退出
+        self.workers = workers
+        self.children = {}          # pid -> (工作进程序号, 启动时间)
+        self.stopping = False
+
+    def spawn(self, index):
+        pid = os.fork()
+        if pid == 0:
+            # 工作进程由监督进程统一终止，忽略终端发给整个进程组的 Ctrl+C
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            code = 0
+            try:
+                self.target(index)
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        self.children[pid] = (index, time.monotonic())
+        return pid
+
+    def start(self):
+        for index in range(self.workers):
+            self.spawn(index)
+
+    def wait(self):
+        """等待工作进程退出并重启，直到 Ctrl+C / SIGTERM，然后终止全部工作进程"""
+        previous = signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        try:
+            while self.children:
+                pid, status = os.wait()
+                index, started = self.children.pop(pid, (None, 0.0))
+                if index is None or self.stopping:
+                    continue
+                print(f"⚠️  工作进程 {index} (pid {pid}) 意外退出（{describe_exit(status)}），正在重启")
+                if time.monotonic() - started < MIN_UPTIME:
+                    time.sleep(RESTART_DELAY)
+                self.spawn(index)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+            signal.signal(signal.SIGTERM, previous)
+
+    def run(self):
+        self.start()
+        self.wait()
+
+    def stop(self):
+        """向全部工作进程发送 SIGTERM，超时未退出的发送 SIGKILL"""
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.children.pop(pid, None)
+
+        deadline = time.monotonic() + STOP_TIMEOUT
+        while self.children and time.monotonic() < deadline:
+            for pid in list(self.children):
+                try:
+                    finished, _ = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    finished = pid
+                if finished:
+                    self.children.pop(pid, None)
+            if self.children:
+                time.sleep(0.05)
+
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+            self.children.pop(pid, None)
@@ -5,21 +5,637 @@
 """
 
 import http.server
-import socketserver
 import webbrowser
 import threading
+import argparse
+import urllib.parse
 import time
+import datetime
+import email.utils
 import os
 import sys
+import posixpath
+import socket
+import signal
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 
-def start_server(port=8000):
-    """启动HTTP服务器"""
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts')
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from precompress import (precompress_tree, available_encodings, negotiate_encoding, compress, is_compressible,
+                         compressed_path, fresh_compressed_path, ENCODING_SUFFIXES)
+from file_cache import FileCache, content_etag, DEFAULT_CACHE_BYTES
+from byte_ranges import ResponseBody, parse_range_header, content_range
+from worker_supervisor import WorkerSupervisor, supports_workers
+from bundler import Bundler
+from fingerprint import Fingerprinter, IMMUTABLE_CACHE_CONTROL
+from preload_scan import PreloadScanner, preload_link
+from server_metrics import RequestMetrics, AccessLog, path_class, PROMETHEUS_CONTENT_TYPE
+
+PAGE_NAME = 'index.html'
+ASSET_URL_PREFIX = '/assets/images/'
+SOUND_URL_PREFIX = '/assets/sounds/'
+METRICS_PATH = '/__metrics'
+
+# 并发处理连接的线程数上限；持久连接空闲超过 KEEPALIVE_TIMEOUT 秒后关闭，把线程让给其他连接
+DEFAULT_THREADS = 32
+KEEPALIVE_TIMEOUT = 5
+DEFAULT_CACHE_MB = DEFAULT_CACHE_BYTES // (1024 * 1024)
+
+
+def parse_http_date(value):
+    """HTTP 日期转换为时间戳，无法解析时返回 None"""
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=datetime.timezone.utc)
+    return date.timestamp()
+
+
+class GameRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """游戏服务器请求处理器：/assets/images/ 与 /assets/sounds/ 下的资源在首次请求时按需生成"""
+    
+    # HTTP/1.1 持久连接：浏览器在同一连接上连续请求脚本、样式和图片，无需每次重新握手
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEPALIVE_TIMEOUT
+    # 响应头与响应体分两次写出；不关闭 Nagle 时持久连接上的第二次写要等客户端的延迟确认（约40ms）
+    disable_nagle_algorithm = True
+    
+    # LazyAssetGenerator / LazySoundGenerator 实例，为 None 时直接读取磁盘文件
+    lazy_assets = None
+    lazy_sounds = None
+    # Bundler 实例（--bundle），页面与 JS/CSS bundle 由它生成，为 None 时按原样提供页面
+    bundler = None
+    # Fingerprinter 实例（--fingerprint），为 None 时不改写资源地址；它同时提供资源清单脚本 asset-manifest.js
+    fingerprinter = None
+    # PreloadScanner 实例（--preload-hints），页面响应带上关键资源的 Link: rel=preload；early_hints 时先发送 103
+    preload_scanner = None
+    early_hints = False
+    
+    # 静态文件内存缓存（start_server 按 --cache-mb 重新创建），缓存内容与校验器
+    file_cache = FileCache()
+    
+    # 按需生成资源的响应体与强 ETag {(文件名, 编码): (原始字节, 响应体, ETag)}，原始字节对象不变时一直有效
+    generated_entities = {}
+    generated_lock = threading.Lock()
+    generated_stats = {'hits': 0, 'misses': 0}
+    
+    # 请求指标（/__metrics）与缓冲的结构化访问日志（AccessLog 实例，为 None 时不记录访问日志）
+    metrics = RequestMetrics()
+    access_log = None
+    
+    # 当前请求的开始时间、原始路径、处理中记录的错误，以及最终响应的状态码与 Content-Length
+    request_start = None
+    request_path = None
+    request_errors = None
+    response_status = None
+    response_length = 0
+    
+    # 当前响应是否随 Accept-Encoding 变化（需要发送 Vary），以及要发送的 Cache-Control
+    vary_encoding = False
+    cache_control = None
+    preload_links = ()
+    
+    def send_head(self):
+        self.vary_encoding = False
+        self.cache_control = None
+        self.preload_links = ()
+        path = urllib.parse.unquote(urllib.parse.urlsplit(self.path).path)
+        if path == METRICS_PATH:
+            return self.send_metrics()
+        if self.preload_scanner is not None and path in ('/', '/' + PAGE_NAME):
+            self.preload_links = self.critical_preload_links()
+            if self.early_hints and self.preload_links and self.request_version >= 'HTTP/1.1':
+                self.send_early_hints()
+        if self.fingerprinter is not None:
+            original = self.fingerprinter.resolve(path.lstrip('/'))
+            if original is not None:
+                # 带指纹的地址内容永不改变，之后按原路径处理
+                path = '/' + original
+                self.path = urllib.parse.quote(path)
+                self.cache_control = IMMUTABLE_CACHE_CONTROL
+            elif path in ('/', '/' + PAGE_NAME):
+                return self.send_fingerprinted_page()
+        
+        found = self.find_source(path)
+        if found is not None:
+            return self.send_generated_asset(*found)
+        file_path = self.static_file_path()
+        if file_path is None:
+            return super().send_head()
+        return self.send_static_file(file_path)
+    
+    def handle_one_request(self):
+        self.request_start = None
+        self.request_path = None
+        self.request_errors = []
+        self.response_status = None
+        self.response_length = 0
+        try:
+            super().handle_one_request()
+        finally:
+            errors, self.request_errors = self.request_errors, None
+            if self.response_status is not None:
+                self.record_request(errors)
+            else:
+                for message in errors:
+                    self.log_message("%s", message)
+    
+    def parse_request(self):
+        # 从读到请求行开始计时，不包括持久连接上等待下一个请求的空闲时间
+        self.request_start = time.perf_counter()
+        ok = super().parse_request()
+        self.request_path = getattr(self, 'path', None)
+        return ok
+    
+    def send_response_only(self, code, message=None):
+        # 103 等临时响应不计入，记录最终响应的状态码
+        if code >= 200:
+            self.response_status = code
+        super().send_response_only(code, message)
+    
+    def send_header(self, keyword, value):
+        if keyword.lower() == 'content-length':
+            self.response_length = int(value)
+        super().send_header(keyword, value)
+    
+    def log_request(self, code='-', size='-'):
+        # 访问日志由 record_request 在响应结束后写入缓冲区，不再同步写 stderr
+        pass
+    
+    def log_error(self, format, *args):
+        # 请求处理中的错误（含 send_error）随该请求的访问日志记录一起写出
+        if self.request_errors is not None:
+            self.request_errors.append(format % args)
+        else:
+            self.log_message(format, *args)
+    
+    def log_message(self, format, *args):
+        # 其余日志消息同样写入访问日志的缓冲区；不记录访问日志时仍写 stderr
+        if self.access_log is None:
+            return super().log_message(format, *args)
+        self.access_log.write({
+            'time': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='milliseconds'),
+            'client': self.client_address[0],
+            'message': format % args,
+        })
+    
+    def record_request(self, errors=()):
+        """把一次请求计入指标并写入访问日志；请求行过长等未能解析的请求耗时计为 0"""
+        start = self.request_start
+        duration = time.perf_counter() - start if start is not None else 0.0
+        status = self.response_status
+        size = 0 if self.command == 'HEAD' or status in (204, 304) else self.response_length
+        path = urllib.parse.urlsplit(self.request_path or '').path
+        category = path_class(path)
+        self.metrics.observe(category, str(status), duration, size)
+        if self.access_log is not None:
+            record = {
+                'time': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='milliseconds'),
+                'client': self.client_address[0],
+                'method': self.command,
+                'path': self.request_path,
+                'status': status,
+                'bytes': size,
+                'ms': round(duration * 1000, 3),
+                'class': category,
+            }
+            if errors:
+                record['error'] = '; '.join(errors)
+            self.access_log.write(record)
+        else:
+            for message in errors:
+                super().log_message("%s", message)
+    
+    def send_metrics(self):
+        """Prometheus 文本格式的请求与缓存指标（多进程模式下为处理本次请求的工作进程的指标）"""
+        file_stats = self.file_cache.stats()
+        with self.generated_lock:
+            generated_stats = dict(self.generated_stats)
+        caches = (('file', file_stats['hits'], file_stats['misses']),
+                  ('generated', generated_stats['hits'], generated_stats['misses']))
+        extra = [
+            ('game_cache_requests_total', 'counter', 'Server-side cache lookups by cache and result.',
+             [({'cache': cache, 'result': result}, count)
+              for cache, hits, misses in caches for result, count in (('hit', hits), ('miss', misses))]),
+            ('game_cache_hit_ratio', 'gauge', 'Server-side cache hit ratio since start.',
+             [({'cache': cache}, hits / (hits + misses) if hits + misses else 0.0) for cache, hits, misses in caches]),
+            ('game_file_cache_bytes', 'gauge', 'Bytes held in the static file cache.',
+             [({}, file_stats['bytes'])]),
+            ('game_file_cache_entries', 'gauge', 'Files held in the static file cache.',
+             [({}, file_stats['entries'])]),
+        ]
+        data = self.metrics.render(extra)
+        self.send_response(200)
+        self.send_header("Content-type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        return ResponseBody.whole(data, len(data))
+    
+    def end_headers(self):
+        if self.vary_encoding:
+            self.send_header("Vary", "Accept-Encoding")
+        if self.preload_links:
+            self.send_header("Link", ", ".join(self.preload_links))
+        super().end_headers()
+    
+    def critical_preload_links(self):
+        """页面脚本引用的关键资源的预加载提示；启用指纹时使用带指纹的地址，与脚本随后的请求一致"""
+        try:
+            assets = self.preload_scanner.critical_assets(self.asset_names())
+        except OSError as e:
+            self.log_error("关键资源扫描失败: %s", e)
+            return ()
+        if self.fingerprinter is not None:
+            assets = [self.fingerprinter.url(name) for name in assets]
+        return tuple(preload_link('/' + urllib.parse.quote(name)) for name in assets)
+    
+    def send_early_hints(self):
+        """在最终响应之前发送 103 Early Hints，浏览器收到后即可开始下载关键资源"""
+        self.send_response_only(103)
+        self.send_header("Link", ", ".join(self.preload_links))
+        super().end_headers()
+    
+    @classmethod
+    def find_source(cls, path):
+        """URL 路径对应的按需资源 (生成器, 名称)，由磁盘文件提供时返回 None"""
+        for prefix, source in ((ASSET_URL_PREFIX, cls.lazy_assets), (SOUND_URL_PREFIX, cls.lazy_sounds),
+                               ('/', cls.bundler), ('/', cls.fingerprinter)):
+            if source is not None and path.startswith(prefix):
+                name = path[len(prefix):]
+                if not name or name.endswith('/'):
+                    name += PAGE_NAME
+                if source.knows(name):
+                    return source, name
+        return None
+    
+    @classmethod
+    def asset_version(cls, name):
+        """站点相对路径的版本摘要：按需资源由生成器提供，磁盘文件为内容哈希（过大只有弱校验器的文件返回 None）"""
+        name = posixpath.normpath(name)
+        if name.startswith(('..', '/')):
+            return None
+        found = cls.find_source('/' + name)
+        if found is not None:
+            source, source_name = found
+            return source.version(source_name)
+        try:
+            entry = cls.file_cache.get(os.path.join(os.getcwd(), *name.split('/')))
+        except OSError:
+            return None
+        return None if entry.etag.startswith('W/') else entry.etag.strip('"')
+    
+    @classmethod
+    def asset_names(cls):
+        """脚本可能动态请求的资源: 按需生成的图片与音效，以及资源目录中的磁盘文件"""
+        names = set()
+        for prefix, source in ((ASSET_URL_PREFIX, cls.lazy_assets), (SOUND_URL_PREFIX, cls.lazy_sounds)):
+            if source is not None:
+                names.update(prefix[1:] + name for name in source.names())
+            try:
+                entries = list(os.scandir(os.path.join(os.getcwd(), *prefix.strip('/').split('/'))))
+            except OSError:
+                continue
+            names.update(prefix[1:] + entry.name for entry in entries
+                         if entry.is_file() and not entry.name.startswith('.')
+                         and not entry.name.endswith(tuple(ENCODING_SUFFIXES.values())))
+        return names
+    
+    def send_fingerprinted_page(self):
+        """发送改写了资源地址并注入资源清单的页面；页面本身每次都需要重新验证"""
+        try:
+            if self.bundler is not None:
+                page = self.bundler.get(PAGE_NAME)
+            else:
+                page = self.file_cache.get(os.path.join(os.getcwd(), PAGE_NAME)).data
+            data = self.fingerprinter.rewrite_page(page)
+        except Exception as e:
+            self.send_error(500, f"页面生成失败: {e}")
+            return None
+        self.cache_control = 'no-cache'
+        return self.send_generated_data(PAGE_NAME, data)
+    
+    def static_file_path(self):
+        """请求对应的磁盘文件，目录请求取其中的 index.html；重定向、目录列表和 404 返回 None 交给父类处理"""
+        path = self.translate_path(self.path)
+        trailing_slash = urllib.parse.urlsplit(self.path).path.endswith('/')
+        if os.path.isdir(path):
+            if not trailing_slash:
+                return None
+            for index in ('index.html', 'index.htm'):
+                index_path = os.path.join(path, index)
+                if os.path.isfile(index_path):
+                    return index_path
+            return None
+        if trailing_slash or not os.path.isfile(path):
+            return None
+        return path
+    
+    def send_static_file(self, path):
+        """发送磁盘文件：文本文件在客户端接受且存在最新的 .br/.gz 时发送压缩文件；内容与校验器来自内存缓存"""
+        encoding = None
+        if is_compressible(path):
+            self.vary_encoding = True
+            available = [encoding for encoding in ENCODING_SUFFIXES if fresh_compressed_path(path, encoding)]
+            encoding = negotiate_encoding(self.headers.get('Accept-Encoding'), available)
+        try:
+            entry = self.file_cache.get(compressed_path(path, encoding) if encoding else path)
+        except OSError:
+            self.send_error(404, "File not found")
+            return None
+        
+        if self.is_not_modified(entry.etag, entry.mtime):
+            return self.send_not_modified(entry.etag, entry.mtime)
+        # 未缓存内容的大文件保持打开，由 copyfile 用 sendfile 发送
+        try:
+            source = entry.data if entry.data is not None else open(entry.path, 'rb')
+        except OSError:
+            self.send_error(404, "File not found")
+            return None
+        try:
+            return self.send_entity(self.guess_type(path), source, entry.size, entry.etag, entry.mtime, encoding)
+        except BaseException:
+            if entry.data is None:
+                source.close()
+            raise
+    
+    def send_generated_asset(self, source, name):
+        """发送按需生成的资源，返回供 copyfile 使用的文件对象；文本资源按 Accept-Encoding 压缩"""
+        try:
+            data = source.get(name)
+        except Exception as e:
+            self.send_error(500, f"资源生成失败: {e}")
+            return None
+        return self.send_generated_data(name, data)
+    
+    def send_generated_data(self, name, data):
+        if data is None:
+            self.send_error(404, "File not found")
+            return None
+        encoding = None
+        if is_compressible(name):
+            self.vary_encoding = True
+            encoding = negotiate_encoding(self.headers.get('Accept-Encoding'), available_encodings())
+        data, etag = self.generated_entity(name, data, encoding)
+        
+        if self.is_not_modified(etag):
+            return self.send_not_modified(etag)
+        return self.send_entity(self.guess_type(name), data, len(data), etag, encoding=encoding)
+    
+    def generated_entity(self, name, data, encoding):
+        """返回 (响应体, ETag)；生成器在内容变化（如 bundle 重新打包）时返回新的字节对象，缓存随之失效"""
+        key = (name, encoding)
+        with self.generated_lock:
+            cached = self.generated_entities.get(key)
+            hit = cached is not None and cached[0] is data
+            self.generated_stats['hits' if hit else 'misses'] += 1
+        if not hit:
+            body = compress(data, encoding) if encoding is not None else data
+            cached = (data, body, content_etag(body))
+            with self.generated_lock:
+                self.generated_entities[key] = cached
+        return cached[1:]
+    
+    def is_not_modified(self, etag, last_modified=None):
+        """条件请求：有 If-None-Match 时按 ETag 弱比较判断，否则比较 If-Modified-Since 与修改时间"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+            return '*' in tags or etag.removeprefix('W/') in tags
+        
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since is None or last_modified is None:
+            return False
+        since = parse_http_date(if_modified_since)
+        # HTTP 日期只精确到秒
+        return since is not None and int(last_modified) <= since
+    
+    def send_not_modified(self, etag, last_modified=None):
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        if self.cache_control is not None:
+            self.send_header("Cache-Control", self.cache_control)
+        if last_modified is not None:
+            self.send_header("Last-Modified", self.date_time_string(last_modified))
+        self.end_headers()
+        return None
+    
+    def send_entity(self, content_type, source, size, etag, last_modified=None, encoding=None):
+        """发送 200 或 206（Range 请求）响应头，返回响应体；source 为内存中的 bytes 或已打开的文件"""
+        ranges = None
+        if self.if_range_matches(etag, last_modified):
+            ranges = parse_range_header(self.headers.get('Range'), size)
+        if ranges == []:
+            if not isinstance(source, bytes):
+                source.close()
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+        
+        if ranges is None:
+            self.send_response(200)
+            body = ResponseBody.whole(source, size)
+            self.send_header("Content-type", content_type)
+        elif len(ranges) == 1:
+            self.send_response(206)
+            body = ResponseBody.single_range(source, *ranges[0])
+            self.send_header("Content-type", content_type)
+            self.send_header("Content-Range", content_range(*ranges[0], size))
+        else:
+            self.send_response(206)
+            body, boundary = ResponseBody.multipart(source, ranges, size, content_type)
+            self.send_header("Content-type", f"multipart/byteranges; boundary={boundary}")
+        
+        if encoding is not None:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        if self.cache_control is not None:
+            self.send_header("Cache-Control", self.cache_control)
+        if last_modified is not None:
+            self.send_header("Last-Modified", self.date_time_string(last_modified))
+        self.end_headers()
+        return body
+    
+    def if_range_matches(self, etag, last_modified=None):
+        """没有 If-Range 或其校验器仍然有效时才处理 Range；ETag 须强比较，日期须与修改时间一致"""
+        if_range = self.headers.get('If-Range')
+        if if_range is None:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith(('"', 'W/')):
+            return if_range == etag and not etag.startswith('W/')
+        if last_modified is None:
+            return False
+        return parse_http_date(if_range) == int(last_modified)
+    
+    def copyfile(self, source, outputfile):
+        if isinstance(source, ResponseBody):
+            source.write_to(self.connection, outputfile)
+        else:
+            super().copyfile(source, outputfile)
+
+
+class PooledHTTPServer(http.server.HTTPServer):
+    """并发 HTTP 服务器：每个连接交给有界线程池处理，线程数不超过 threads"""
+    
+    def __init__(self, server_address, handler_class, threads=DEFAULT_THREADS, reuse_port=False):
+        # reuse_port: 多个工作进程各自绑定同一端口
+        self.reuse_port = reuse_port
+        super().__init__(server_address, handler_class)
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='http')
+    
+    def server_bind(self):
+        if self.reuse_port:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+    
+    def process_request(self, request, client_address):
+        # 线程池已满时连接在队列中等待空闲线程
+        self.executor.submit(self.process_request_thread, request, client_address)
+    
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+    
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def load_lazy_assets():
+    """加载按需资源与音效生成器，依赖缺失时返回 (None, None)"""
+    try:
+        from lazy_assets import LazyAssetGenerator, LazySoundGenerator
+    except ImportError as e:
+        print(f"⚠️  无法启用按需资源生成（{e}），将直接提供磁盘上的资源文件")
+        return None, None
+    return LazyAssetGenerator(), LazySoundGenerator()
+
+
+def precompress_text_files():
+    """预压缩 JS/CSS/HTML/JSON 文本文件（只处理有变化的文件）"""
+    if 'br' not in available_encodings():
+        print("⚠️  未安装 brotli 模块，文本资源只预压缩为 gzip")
+    start = time.time()
+    files, written = precompress_tree(os.getcwd())
+    print(f"🗜️  预压缩文本资源: {files} 个文件，更新 {written} 个压缩文件 "
+          f"({'/'.join(available_encodings())}，{time.time() - start:.1f}s)")
+
+
+def serve_worker(port, handler, threads):
+    """工作进程：各自监听同一端口（SO_REUSEPORT），由内核在进程间分配新连接"""
+    # 监督进程用 SIGTERM 停止工作进程，转为 SystemExit 以便写出缓冲的访问日志
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        with PooledHTTPServer(("", port), handler, threads, reuse_port=True) as httpd:
+            httpd.serve_forever()
+    finally:
+        if handler.access_log is not None:
+            handler.access_log.flush()
+
+
+def open_access_log(target):
+    """访问日志输出：'-' 为标准错误，否则追加写入文件，None 表示不记录"""
+    if target is None:
+        return None
+    if target == '-':
+        return AccessLog()
+    return AccessLog(open(target, 'a', encoding='utf-8'))
+
+
+def print_server_banner(port, threads, cache_mb, workers, handler):
+    print(f"🚀 太空射击游戏服务器启动成功！")
+    print(f"📍 服务器地址: http://localhost:{port}")
+    print(f"🎮 游戏页面: http://localhost:{port}/index.html")
+    print(f"📁 当前目录: {os.getcwd()}")
+    if workers > 1:
+        print(f"🧩 工作进程: {workers} 个（SO_REUSEPORT 共享端口，崩溃后自动重启）")
+    print(f"🧵 并发连接: {'每个进程' if workers > 1 else ''}最多 {threads} 个线程，HTTP/1.1 持久连接")
+    print(f"💾 文件缓存: {cache_mb} MB（LRU），ETag / If-Modified-Since 条件请求返回 304")
+    if handler.lazy_assets is not None:
+        print("🎨 资源按需生成: 图片与音效在首次请求时于内存中生成并缓存")
+    if handler.bundler is not None:
+        mode = "拼接并压缩" if handler.bundler.minify else "拼接"
+        print(f"📦 打包模式: 页面中的脚本与样式{mode}为 js/__bundle__.js 与 css/__bundle__.css（含 Source Map）")
+    if handler.fingerprinter is not None:
+        print("🔖 资源指纹: 带内容指纹的地址以 Cache-Control: immutable 缓存一年")
+    if handler.preload_scanner is not None:
+        hints = "103 Early Hints 与 Link 响应头" if handler.early_hints else "Link 响应头"
+        print(f"⚡ 关键资源预加载: 扫描脚本中引用的图片，通过{hints}提前下载")
+    scope = "（每个工作进程单独统计）" if workers > 1 else ""
+    print(f"📊 请求指标: http://localhost:{port}{METRICS_PATH}（Prometheus 文本格式）{scope}")
+    if handler.access_log is not None:
+        target = getattr(handler.access_log.stream, 'name', '标准错误')
+        print(f"📝 访问日志: JSON 行格式，缓冲后批量写入 {target}")
+    print(f"⏰ 启动时间: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    print("="*60)
+    print("🎯 游戏控制说明:")
+    print("   WASD/方向键 - 移动")
+    print("   空格键 - 射击")
+    print("   X键 - 激活子弹时间")
+    print("   C键 - 切换武器")
+    print("   P键 - 暂停/继续")
+    print("   F键 - 全屏切换")
+    print("="*60)
+    print("🔧 服务器控制:")
+    print("   Ctrl+C - 停止服务器")
+    print("="*60)
+
+
+def open_browser_later(port):
+    """在新线程中打开浏览器"""
+    def open_browser():
+        time.sleep(1)  # 等待服务器完全启动
+        try:
+            webbrowser.open(f'http://localhost:{port}/index.html')
+            print(f"🌐 已在默认浏览器中打开游戏页面")
+        except Exception as e:
+            print(f"⚠️  无法自动打开浏览器: {e}")
+            print(f"请手动打开: http://localhost:{port}/index.html")
+    
+    browser_thread = threading.Thread(target=open_browser)
+    browser_thread.daemon = True
+    browser_thread.start()
+
+
+def start_server(port=8000, lazy=True, threads=DEFAULT_THREADS, precompress=True, cache_mb=DEFAULT_CACHE_MB,
+                 workers=1, bundle=False, minify=False, fingerprint=False, preload_hints=False,
+                 early_hints=False, access_log='-'):
+    """启动HTTP服务器
+
+    access_log: 访问日志文件路径，'-' 为标准错误，None 表示不记录
+    """
     try:
         # 确保在正确的目录中
         os.chdir(os.path.dirname(os.path.abspath(__file__)))
         
+        if precompress:
+            precompress_text_files()
+        
         # 创建HTTP服务器
-        handler = http.server.SimpleHTTPRequestHandler
+        handler = GameRequestHandler
+        handler.lazy_assets, handler.lazy_sounds = load_lazy_assets() if lazy else (None, None)
+        handler.file_cache = FileCache(cache_mb * 1024 * 1024)
+        handler.bundler = Bundler(os.getcwd(), page=PAGE_NAME, minify=minify) if bundle else None
+        handler.fingerprinter = Fingerprinter(handler.asset_version, handler.asset_names) if fingerprint else None
+        handler.preload_scanner = PreloadScanner(os.getcwd(), page=PAGE_NAME) if preload_hints or early_hints else None
+        handler.early_hints = early_hints
+        handler.metrics = RequestMetrics()
+        if handler.access_log is None:
+            handler.access_log = open_access_log(access_log)
         
         # 设置MIME类型以支持所有文件
         handler.extensions_map.update({
@@ -31,54 +647,46 @@ def start_server(port=8000):
             '.jpeg': 'image/jpeg',
             '.gif': 'image/gif',
             '.svg': 'image/svg+xml',
+            '.json': 'application/json',
+            '.map': 'application/json',
             '.mp3': 'audio/mpeg',
             '.wav': 'audio/wav',
             '.ogg': 'audio/ogg'
         })
         
-        with socketserver.TCPServer(("", port), handler) as httpd:
-            print(f"🚀 太空射击游戏服务器启动成功！")
-            print(f"📍 服务器地址: http://localhost:{port}")
-            print(f"🎮 游戏页面: http://localhost:{port}/index.html")
-            print(f"📁 当前目录: {os.getcwd()}")
-            print(f"⏰ 启动时间: {time.strftime('%Y-%m-%d %H:%M:%S')}")
-            print("="*60)
-            print("🎯 游戏控制说明:")
-            print("   WASD/方向键 - 移动")
-            print("   空格键 - 射击")
-            print("   X键 - 激活子弹时间")
-            print("   C键 - 切换武器")
-            print("   P键 - 暂停/继续")
-            print("   F键 - 全屏切换")
-            print("="*60)
-            print("🔧 服务器控制:")
-            print("   Ctrl+C - 停止服务器")
-            print("="*60)
-            
-            # 在新线程中打开浏览器
-            def open_browser():
-                time.sleep(1)  # 等待服务器完全启动
-                try:
-                    webbrowser.open(f'http://localhost:{port}/index.html')
-                    print(f"🌐 已在默认浏览器中打开游戏页面")
-                except Exception as e:
-                    print(f"⚠️  无法自动打开浏览器: {e}")
-                    print(f"请手动打开: http://localhost:{port}/index.html")
-            
-            browser_thread = threading.Thread(target=open_browser)
-            browser_thread.daemon = True
-            browser_thread.start()
+        if workers > 1 and not supports_workers():
+            print("⚠️  当前系统不支持 fork / SO_REUSEPORT，以单进程运行")
+            workers = 1
+        
+        if workers > 1:
+            # 先在监督进程中试绑定端口，端口被占用时在 fork 之前报错
+            socket.create_server(("", port), reuse_port=True).close()
+            supervisor = WorkerSupervisor(lambda index: serve_worker(port, handler, threads), workers)
+            supervisor.start()
+            print_server_banner(port, threads, cache_mb, workers, handler)
+            open_browser_later(port)
+            supervisor.wait()
+            print("\n👋 服务器已停止")
+            return
+        
+        with PooledHTTPServer(("", port), handler, threads) as httpd:
+            print_server_banner(port, threads, cache_mb, workers, handler)
+            open_browser_later(port)
             
             # 启动服务器
             httpd.serve_forever()
             
     except KeyboardInterrupt:
+        if GameRequestHandler.access_log is not None:
+            GameRequestHandler.access_log.flush()
         print("\n👋 服务器已停止")
         sys.exit(0)
     except OSError as e:
         if "Address already in use" in str(e):
             print(f"❌ 端口 {port} 已被占用，尝试使用端口 {port + 1}")
-            start_server(port + 1)
+            start_server(port + 1, lazy, threads, precompress=False, cache_mb=cache_mb, workers=workers,
+                         bundle=bundle, minify=minify, fingerprint=fingerprint, preload_hints=preload_hints,
+                         early_hints=early_hints, access_log=access_log)
         else:
             print(f"❌ 启动服务器失败: {e}")
             sys.exit(1)
@@ -86,8 +694,11 @@ def start_server(port=8000):
         print(f"❌ 未知错误: {e}")
         sys.exit(1)
 
-def check_game_files():
-    """检查游戏文件完整性"""
+def check_game_files(pregenerate=False):
+    """检查游戏文件完整性
+    
+    pregenerate=True 时在启动前运行增量资源生成，否则资源由服务器按需生成。
+    """
     required_files = [
         'index.html',
         'css/main.css',
@@ -107,18 +718,31 @@ def check_game_files():
         print("\n请确保所有游戏文件都已正确创建！")
         return False
     
+    if not pregenerate:
+        return True
+    
     # 检查资源目录
     if not os.path.exists('assets'):
         print("📁 资源目录不存在，正在创建...")
         os.makedirs('assets/images', exist_ok=True)
+    
+    # 运行资源生成脚本（增量构建，只重新生成清单中已过期的资源）
+    try:
+        print("🎨 正在检查游戏资源...")
+        result = subprocess.call([sys.executable, 'scripts/generate_assets.py',
+                                  '--output', 'assets/images'])
+        if result == 0:
+            print("✅ 游戏资源已是最新！")
+        else:
+            print(f"⚠️  资源生成失败，退出码: {result}")
         
-        # 运行资源生成脚本
-        try:
-            print("🎨 正在生成游戏资源...")
-            os.system('python scripts/generate_assets.py')
-            print("✅ 游戏资源生成完成！")
-        except Exception as e:
-            print(f"⚠️  资源生成失败: {e}")
+        print("🔊 正在合成游戏音效...")
+        result = subprocess.call([sys.executable, 'scripts/generate_audio.py',
+                                  '--output', 'assets/sounds'])
+        if result != 0:
+            print(f"⚠️  音效合成失败，退出码: {result}")
+    except Exception as e:
+        print(f"⚠️  资源生成失败: {e}")
     
     return True
 
@@ -146,22 +770,56 @@ def print_game_info():
     print("   📱 完全响应式设计")
     print()
 
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="超级太空射击游戏服务器")
+    parser.add_argument('port', nargs='?', type=int, default=8000, help="服务器端口 (默认: 8000)")
+    parser.add_argument('--pregenerate', action='store_true',
+                        help="启动前生成全部资源到磁盘，而不是在首次请求时按需生成")
+    parser.add_argument('--no-precompress', dest='precompress', action='store_false',
+                        help="启动时不预压缩文本资源")
+    parser.add_argument('--threads', type=int, default=DEFAULT_THREADS,
+                        help=f"并发处理连接的最大线程数 (默认: {DEFAULT_THREADS})")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="工作进程数，大于 1 时多个进程通过 SO_REUSEPORT 共享端口 (默认: 1)")
+    parser.add_argument('--bundle', action='store_true',
+                        help="打包模式：按 index.html 的顺序把脚本和样式各拼接为一个文件")
+    parser.add_argument('--minify', action='store_true',
+                        help="打包时去掉注释与多余空白（隐含 --bundle）")
+    parser.add_argument('--fingerprint', action='store_true',
+                        help="资源地址加上内容指纹并以 immutable 缓存一年，重复访问不再请求未变化的文件")
+    parser.add_argument('--preload-hints', action='store_true',
+                        help="页面响应带上脚本中引用的关键图片的 Link: rel=preload 头")
+    parser.add_argument('--early-hints', action='store_true',
+                        help="在页面响应之前先发送 103 Early Hints（隐含 --preload-hints）")
+    parser.add_argument('--access-log', default='-', metavar='PATH',
+                        help="结构化访问日志（JSON 行）的输出文件，'-' 为标准错误 (默认: -)")
+    parser.add_argument('--no-access-log', dest='access_log', action='store_const', const=None,
+                        help="不记录访问日志（/__metrics 指标照常统计）")
+    parser.add_argument('--cache-mb', type=int, default=DEFAULT_CACHE_MB,
+                        help=f"静态文件内存缓存上限，单位 MB，0 表示不缓存 (默认: {DEFAULT_CACHE_MB})")
+    args = parser.parse_args(argv)
+    if args.threads < 1:
+        parser.error("--threads 至少为 1")
+    if args.workers < 1:
+        parser.error("--workers 至少为 1")
+    if args.cache_mb < 0:
+        parser.error("--cache-mb 不能为负数")
+    return args
+
 if __name__ == "__main__":
+    args = parse_args()
+    
     # 显示游戏信息
     print_game_info()
     
     # 检查文件完整性
-    if not check_game_files():
+    if not check_game_files(args.pregenerate):
         input("按回车键退出...")
         sys.exit(1)
     
     # 启动服务器
-    try:
-        port = 8000
-        if len(sys.argv) > 1:
-            port = int(sys.argv[1])
-        
-        start_server(port)
-    except ValueError:
-        print("❌ 无效的端口号")
-        sys.exit(1)
+    start_server(args.port, lazy=not args.pregenerate, threads=args.threads, precompress=args.precompress,
+                 cache_mb=args.cache_mb, workers=args.workers, bundle=args.bundle or args.minify,
+                 minify=args.minify, fingerprint=args.fingerprint, preload_hints=args.preload_hints,
+                 early_hints=args.early_hints, access_log=args.access_log)
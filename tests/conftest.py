@@ -0,0 +1,8 @@
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.join(ROOT_DIR, 'scripts')
+for path in (ROOT_DIR, SCRIPTS_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
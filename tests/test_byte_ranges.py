@@ -0,0 +1,63 @@
+"""byte_ranges 的 Range 请求头解析与响应体"""
+
+from byte_ranges import MAX_RANGES, ResponseBody, parse_range_header
+
+SIZE = 1000
+
+
+def test_single_range():
+    assert parse_range_header('bytes=0-99', SIZE) == [(0, 99)]
+
+
+def test_open_ended_range_runs_to_end():
+    assert parse_range_header('bytes=900-', SIZE) == [(900, 999)]
+
+
+def test_end_is_clamped_to_size():
+    assert parse_range_header('bytes=990-2000', SIZE) == [(990, 999)]
+
+
+def test_suffix_range():
+    assert parse_range_header('bytes=-100', SIZE) == [(900, 999)]
+
+
+def test_suffix_longer_than_file_covers_whole_file():
+    assert parse_range_header('bytes=-5000', SIZE) == [(0, 999)]
+
+
+def test_multiple_ranges_keep_request_order():
+    assert parse_range_header('bytes=500-599, 0-99, -10', SIZE) == [(500, 599), (0, 99), (990, 999)]
+
+
+def test_overlapping_ranges_are_merged():
+    assert parse_range_header('bytes=0-199,100-299,300-399', SIZE) == [(0, 399)]
+
+
+def test_unsatisfiable_ranges_return_empty_list():
+    # 全部起点超出文件末尾或后缀长度为 0: 416
+    assert parse_range_header('bytes=1000-1099', SIZE) == []
+    assert parse_range_header('bytes=2000-,-0', SIZE) == []
+    assert parse_range_header('bytes=-10', 0) == []
+
+
+def test_unsatisfiable_ranges_are_dropped_from_multi_range():
+    assert parse_range_header('bytes=0-9,5000-5009', SIZE) == [(0, 9)]
+
+
+def test_invalid_headers_are_ignored():
+    for header in (None, '', 'items=0-10', 'bytes=abc', 'bytes=10-5', 'bytes=-', 'bytes=5'):
+        assert parse_range_header(header, SIZE) is None, header
+
+
+def test_too_many_ranges_are_ignored():
+    header = 'bytes=' + ','.join(f'{i * 10}-{i * 10 + 1}' for i in range(MAX_RANGES + 1))
+    assert parse_range_header(header, SIZE) is None
+
+
+def test_multipart_body_length_matches_segments():
+    source = bytes(range(256)) * 4
+    body, boundary = ResponseBody.multipart(source, [(0, 9), (100, 119)], len(source), 'text/plain')
+    assert len(body) == sum(len(s) if isinstance(s, bytes) else s[1] for s in body.segments)
+    assert body.segments[0].startswith(f'--{boundary}\r\n'.encode())
+    assert b'Content-Range: bytes 100-119/1024' in body.segments[3]
+    assert body.segments[-1] == f'--{boundary}--\r\n'.encode()
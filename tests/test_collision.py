@@ -0,0 +1,75 @@
+"""collision.js 的精灵形状检测（用 node 执行，没有 node 时跳过）"""
+
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from asset_sinks import MemorySink
+from collision_shapes import CollisionShapeBuilder, COLLISION_JSON_NAME
+from conftest import ROOT_DIR
+
+IMAGES_DIR = os.path.join(ROOT_DIR, 'assets', 'images')
+COLLISION_JS = os.path.join(ROOT_DIR, 'js', 'collision.js')
+SPRITES = ['enemy_basic.png', 'bullet_player.png']
+
+# 浏览器全局对象的最小替身：fetch 直接返回测试生成的 collision.json
+HARNESS = '''
+const collisionData = %s;
+const assetUrl = url => url;
+const fetch = () => Promise.resolve({ ok: true, json: () => Promise.resolve(collisionData) });
+%s
+setTimeout(() => {
+    const cases = %s;
+    console.log(JSON.stringify(cases.map(([a, b]) => collisionManager.checkCollision(a, b))));
+}, 0);
+'''
+
+node = shutil.which('node')
+
+
+def collision_data():
+    sink = MemorySink()
+    for name in SPRITES:
+        with open(os.path.join(IMAGES_DIR, name), 'rb') as f:
+            sink.write(name, f.read())
+    CollisionShapeBuilder(sink).build(SPRITES)
+    return sink.read(COLLISION_JSON_NAME).decode('utf-8')
+
+
+def run_cases(cases):
+    with open(COLLISION_JS, encoding='utf-8') as f:
+        source = f.read()
+    script = HARNESS % (collision_data(), source, json.dumps(cases))
+    result = subprocess.run([node, '-'], input=script, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def enemy(x=100, y=100):
+    return {'x': x, 'y': y, 'width': 40, 'height': 40, 'size': 40, 'rotation': 0,
+            'spriteName': 'enemy_basic.png'}
+
+
+def bullet(x, y):
+    return {'x': x, 'y': y, 'width': 8, 'height': 8, 'size': 4, 'drawWidth': 8, 'drawHeight': 4,
+            'rotation': 0, 'spriteName': 'bullet_player.png'}
+
+
+@pytest.mark.skipif(node is None, reason='需要 node')
+def test_bullet_in_transparent_corner_misses():
+    # 子弹完全位于敌人包围盒内，但只覆盖左上角的透明像素
+    assert run_cases([[bullet(86, 86), enemy()], [enemy(), bullet(86, 86)]]) == [False, False]
+
+
+@pytest.mark.skipif(node is None, reason='需要 node')
+def test_bullet_on_solid_pixels_hits():
+    assert run_cases([[bullet(100, 90), enemy()], [enemy(), bullet(100, 90)]]) == [True, True]
+
+
+@pytest.mark.skipif(node is None, reason='需要 node')
+def test_rotated_enemy_uses_rotated_mask():
+    # 敌人上方是透明区域，旋转 180° 后下方尖端转到上方
+    rotated = dict(enemy(), rotation=3.141592653589793)
+    assert run_cases([[bullet(100, 84), enemy()], [bullet(100, 84), rotated]]) == [False, True]
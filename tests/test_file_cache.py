@@ -0,0 +1,55 @@
+"""file_cache.FileCache 的 LRU 淘汰与校验器"""
+
+import os
+
+from file_cache import FileCache, content_etag
+
+
+def write(path, data):
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_hit_returns_same_entry(tmp_path):
+    cache = FileCache(max_bytes=100)
+    path = write(tmp_path / 'a.txt', b'hello')
+    first = cache.get(path)
+    assert cache.get(path) is first
+    assert first.data == b'hello'
+    assert first.etag == content_etag(b'hello')
+    assert cache.stats() == {'entries': 1, 'bytes': 5, 'hits': 1, 'misses': 1}
+
+
+def test_least_recently_used_file_is_evicted(tmp_path):
+    cache = FileCache(max_bytes=30)
+    a, b, c, d = (write(tmp_path / f'{name}.bin', name.encode() * 10) for name in 'abcd')
+    for path in (a, b, c):
+        cache.get(path)
+    # 访问 a 后 b 成为最久未使用
+    cache.get(a)
+    cache.get(d)
+    assert list(cache.entries) == [c, a, d]
+    assert cache.stats()['bytes'] == 30
+
+
+def test_changed_file_is_reloaded(tmp_path):
+    cache = FileCache(max_bytes=100)
+    path = write(tmp_path / 'a.txt', b'version 1')
+    old = cache.get(path)
+    write(tmp_path / 'a.txt', b'version 22')
+    new = cache.get(path)
+    assert new.data == b'version 22'
+    assert new.etag != old.etag
+    assert cache.stats()['bytes'] == len(b'version 22')
+
+
+def test_large_file_gets_weak_etag_without_content(tmp_path):
+    cache = FileCache(max_bytes=100, max_file_bytes=10)
+    path = write(tmp_path / 'big.bin', b'x' * 50)
+    entry = cache.get(path)
+    assert entry.data is None
+    assert entry.etag.startswith('W/"')
+    assert entry.size == 50
+    assert cache.stats()['entries'] == 0
+    os.utime(path, ns=(0, 0))
+    assert cache.get(path).etag != entry.etag
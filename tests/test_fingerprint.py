@@ -0,0 +1,78 @@
+"""fingerprint.Fingerprinter 的页面地址改写与指纹解析"""
+
+import json
+
+from fingerprint import Fingerprinter, MANIFEST_SCRIPT_NAME, fingerprint_name
+from file_cache import content_digest
+
+VERSIONS = {
+    'js/main.js': 'a' * 32,
+    'css/style.css': 'b' * 32,
+    'assets/images/player_ship.png': 'c' * 32,
+    'assets/images/enemy_basic.png': 'd' * 32,
+}
+
+PAGE = b'''<!DOCTYPE html>
+<html>
+<head lang="zh">
+    <link rel="stylesheet" href="css/style.css">
+    <link rel="preload" href="/assets/images/player_ship.png?v=2" as="image">
+    <script src="https://cdn.example.com/lib.js"></script>
+    <script src='js/main.js'></script>
+    <script src="js/unknown.js"></script>
+</head>
+<body>
+    <a href="js/main.js">source</a>
+    <img src="#top">
+</body>
+</html>
+'''
+
+
+def make_fingerprinter(versions):
+    return Fingerprinter(versions.get, lambda: list(versions))
+
+
+def test_rewrite_page_fingerprints_local_resources():
+    fingerprinter = make_fingerprinter(dict(VERSIONS))
+    page = fingerprinter.rewrite_page(PAGE).decode('utf-8')
+
+    assert 'href="css/style.' + 'b' * 10 + '.css"' in page
+    # 查询串被去掉，地址本身带有版本
+    assert 'href="assets/images/player_ship.' + 'c' * 10 + '.png"' in page
+    assert "src='js/main." + 'a' * 10 + ".js'" in page
+    # 外部地址、片段、未知文件和非资源标签保持原样
+    assert 'src="https://cdn.example.com/lib.js"' in page
+    assert 'src="js/unknown.js"' in page
+    assert '<img src="#top">' in page
+    assert '<a href="js/main.js">' in page
+
+
+def test_rewrite_page_injects_manifest_script_after_head():
+    fingerprinter = make_fingerprinter(dict(VERSIONS))
+    page = fingerprinter.rewrite_page(PAGE).decode('utf-8')
+
+    script = fingerprinter.get(MANIFEST_SCRIPT_NAME)
+    tag = f'<script src="/{fingerprint_name(MANIFEST_SCRIPT_NAME, content_digest(script))}"></script>'
+    assert '<head lang="zh">' + tag in page
+    manifest = json.loads(script.decode('utf-8').split(' = ', 1)[1].rstrip(';\n'))
+    assert manifest == {name: fingerprint_name(name, version) for name, version in VERSIONS.items()}
+
+
+def test_rewrite_page_is_cached_until_versions_change():
+    versions = dict(VERSIONS)
+    fingerprinter = make_fingerprinter(versions)
+    first = fingerprinter.rewrite_page(PAGE)
+    assert fingerprinter.rewrite_page(PAGE) is first
+
+    versions['js/main.js'] = 'e' * 32
+    second = fingerprinter.rewrite_page(PAGE)
+    assert second != first
+    assert b"js/main." + b'e' * 10 + b".js" in second
+
+
+def test_resolve_accepts_only_current_fingerprint():
+    fingerprinter = make_fingerprinter(dict(VERSIONS))
+    assert fingerprinter.resolve('js/main.' + 'a' * 10 + '.js') == 'js/main.js'
+    assert fingerprinter.resolve('js/main.' + 'f' * 10 + '.js') is None
+    assert fingerprinter.resolve('js/main.js') is None
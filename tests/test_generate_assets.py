@@ -0,0 +1,68 @@
+"""generate_assets 的并行确定性与增量构建清单"""
+
+import pytest
+
+from asset_sinks import DiskSink
+from generate_assets import MANIFEST_NAME, SuperGameAssetGenerator, generate_assets_to_memory
+
+# 覆盖多分辨率、发光、预旋转、换色、变体池和动画帧的任务子集，完整生成太慢
+TASKS = ('enemy_ships', 'bullets', 'explosion_0', 'explosion_1', 'environmental_hazards', 'pool_meteor')
+OPTIONS = dict(scales=(1, 2), rotations=16, pool_size=4, palettes=('ice',))
+
+
+@pytest.fixture
+def task_subset(monkeypatch):
+    build_tasks = SuperGameAssetGenerator.build_tasks
+    monkeypatch.setattr(SuperGameAssetGenerator, 'build_tasks',
+                        lambda self: [task for task in build_tasks(self) if task[1] in TASKS])
+
+
+@pytest.fixture
+def task_log(monkeypatch):
+    """记录实际执行的任务名"""
+    ran = []
+    run_task = SuperGameAssetGenerator.run_task
+
+    def logged_run_task(self, task_name, *args, **kwargs):
+        ran.append(task_name)
+        return run_task(self, task_name, *args, **kwargs)
+
+    monkeypatch.setattr(SuperGameAssetGenerator, 'run_task', logged_run_task)
+    return ran
+
+
+def test_parallel_output_is_byte_identical(task_subset):
+    serial = generate_assets_to_memory(jobs=1, **OPTIONS)
+    parallel = generate_assets_to_memory(jobs=2, **OPTIONS)
+    assert sorted(serial) == sorted(parallel)
+    assert [name for name in serial if serial[name] != parallel[name]] == []
+    assert 'atlas.json' in serial and 'enemy_basic_ice@2x.png' in serial
+
+
+def test_manifest_rerun_skips_unchanged_tasks(tmp_path, task_subset, task_log):
+    SuperGameAssetGenerator(sink=DiskSink(str(tmp_path)), **OPTIONS).generate_all_assets()
+    assert sorted(task_log) == sorted(TASKS)
+    assert (tmp_path / MANIFEST_NAME).exists()
+    before = {path.name: path.read_bytes() for path in tmp_path.iterdir()}
+
+    task_log.clear()
+    SuperGameAssetGenerator(sink=DiskSink(str(tmp_path)), **OPTIONS).generate_all_assets()
+    assert task_log == []
+    assert {path.name: path.read_bytes() for path in tmp_path.iterdir()} == before
+
+    # 缺少输出文件的任务重新生成，其余仍然跳过
+    (tmp_path / 'bullet_player@2x.png').unlink()
+    SuperGameAssetGenerator(sink=DiskSink(str(tmp_path)), **OPTIONS).generate_all_assets()
+    assert task_log == ['bullets']
+    assert (tmp_path / 'bullet_player@2x.png').read_bytes() == before['bullet_player@2x.png']
+
+
+def test_changed_options_invalidate_manifest(tmp_path, task_subset, task_log):
+    SuperGameAssetGenerator(sink=DiskSink(str(tmp_path)), **OPTIONS).generate_all_assets()
+    task_log.clear()
+    SuperGameAssetGenerator(sink=DiskSink(str(tmp_path)), seed=1, **OPTIONS).generate_all_assets()
+    assert sorted(task_log) == sorted(TASKS)
+
+    task_log.clear()
+    SuperGameAssetGenerator(sink=DiskSink(str(tmp_path)), seed=1, **OPTIONS).generate_all_assets(force=True)
+    assert sorted(task_log) == sorted(TASKS)
@@ -0,0 +1,43 @@
+"""precompress.negotiate_encoding 的 Accept-Encoding 协商"""
+
+from precompress import negotiate_encoding
+
+AVAILABLE = ('br', 'gzip')
+
+
+def test_missing_header_means_identity():
+    assert negotiate_encoding(None, AVAILABLE) is None
+    assert negotiate_encoding('', AVAILABLE) is None
+
+
+def test_server_order_breaks_ties():
+    assert negotiate_encoding('gzip, deflate, br', AVAILABLE) == 'br'
+
+
+def test_highest_q_value_wins():
+    assert negotiate_encoding('br;q=0.5, gzip;q=0.8', AVAILABLE) == 'gzip'
+    assert negotiate_encoding('br;q=1.0, gzip;q=0.999', AVAILABLE) == 'br'
+
+
+def test_q_zero_rejects_encoding():
+    assert negotiate_encoding('br;q=0, gzip', AVAILABLE) == 'gzip'
+    assert negotiate_encoding('br;q=0, gzip;q=0', AVAILABLE) is None
+
+
+def test_wildcard_weights_unlisted_encodings():
+    assert negotiate_encoding('*', AVAILABLE) == 'br'
+    assert negotiate_encoding('br;q=0, *;q=0.5', AVAILABLE) == 'gzip'
+    assert negotiate_encoding('gzip;q=0.2, *;q=0', AVAILABLE) == 'gzip'
+
+
+def test_unsupported_encodings_only():
+    assert negotiate_encoding('deflate, identity', AVAILABLE) is None
+
+
+def test_x_gzip_alias_and_case():
+    assert negotiate_encoding('x-gzip', AVAILABLE) == 'gzip'
+    assert negotiate_encoding('GZIP; Q=0.5', AVAILABLE) == 'gzip'
+
+
+def test_malformed_q_value_rejects_encoding():
+    assert negotiate_encoding('br;q=abc, gzip;q=0.1', AVAILABLE) == 'gzip'
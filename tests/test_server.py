@@ -0,0 +1,101 @@
+"""start_game 的静态文件响应：条件请求（ETag/304）与 Range 请求"""
+
+import functools
+import http.client
+import threading
+
+import pytest
+
+from file_cache import FileCache, content_etag
+from start_game import GameRequestHandler, PooledHTTPServer
+
+CONTENT = bytes(range(256)) * 8
+
+
+class StaticHandler(GameRequestHandler):
+    file_cache = FileCache()
+
+
+@pytest.fixture(scope='module')
+def server(tmp_path_factory):
+    root = tmp_path_factory.mktemp('static')
+    (root / 'data.bin').write_bytes(CONTENT)
+    handler = functools.partial(StaticHandler, directory=str(root))
+    httpd = PooledHTTPServer(('127.0.0.1', 0), handler, threads=2)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def request(port, headers=None, path='/data.bin'):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    try:
+        connection.request('GET', path, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, response.headers, response.read()
+    finally:
+        connection.close()
+
+
+def test_full_response_has_strong_etag(server):
+    status, headers, body = request(server)
+    assert status == 200
+    assert body == CONTENT
+    assert headers['ETag'] == content_etag(CONTENT)
+    assert headers['Accept-Ranges'] == 'bytes'
+
+
+def test_matching_etag_returns_304(server):
+    etag = request(server)[1]['ETag']
+    status, headers, body = request(server, {'If-None-Match': etag})
+    assert status == 304
+    assert body == b''
+    assert headers['ETag'] == etag
+    # 弱比较与列表中的任一标签
+    assert request(server, {'If-None-Match': f'"other", W/{etag}'})[0] == 304
+    assert request(server, {'If-None-Match': '*'})[0] == 304
+
+
+def test_stale_etag_returns_full_response(server):
+    status, _, body = request(server, {'If-None-Match': '"stale"'})
+    assert status == 200
+    assert body == CONTENT
+
+
+def test_if_modified_since(server):
+    last_modified = request(server)[1]['Last-Modified']
+    assert request(server, {'If-Modified-Since': last_modified})[0] == 304
+    assert request(server, {'If-Modified-Since': 'Thu, 01 Jan 1970 00:00:00 GMT'})[0] == 200
+
+
+def test_suffix_range(server):
+    status, headers, body = request(server, {'Range': 'bytes=-16'})
+    assert status == 206
+    assert body == CONTENT[-16:]
+    assert headers['Content-Range'] == f'bytes {len(CONTENT) - 16}-{len(CONTENT) - 1}/{len(CONTENT)}'
+
+
+def test_multi_range(server):
+    status, headers, body = request(server, {'Range': 'bytes=0-9,100-109'})
+    assert status == 206
+    content_type = headers['Content-Type']
+    assert content_type.startswith('multipart/byteranges; boundary=')
+    boundary = content_type.split('boundary=', 1)[1]
+    assert body.endswith(f'--{boundary}--\r\n'.encode())
+    parts = body.split(f'--{boundary}'.encode())[1:-1]
+    assert [part.split(b'\r\n\r\n', 1)[1][:-2] for part in parts] == [CONTENT[0:10], CONTENT[100:110]]
+    assert f'bytes 100-109/{len(CONTENT)}'.encode() in parts[1]
+
+
+def test_unsatisfiable_range_returns_416(server):
+    status, headers, _ = request(server, {'Range': f'bytes={len(CONTENT)}-'})
+    assert status == 416
+    assert headers['Content-Range'] == f'bytes */{len(CONTENT)}'
+
+
+def test_if_range_mismatch_ignores_range(server):
+    status, _, body = request(server, {'Range': 'bytes=0-9', 'If-Range': '"stale"'})
+    assert status == 200
+    assert body == CONTENT